@@ -1,10 +1,16 @@
 import streamlit as st
 from intent_agent import interpret, extract_email_and_message
-from email_agent import send_email
-from reminder_agent import set_reminder_with_email
-from file_agent import organize_files
-from chat_agent import chat_reply
+from reminder_agent import start_reminders, get_scheduler
+from email_agent import get_outbox
+from chat_agent import chat_reply_stream
+from chat_history import ChatHistory, PAGE_SIZE
+from dispatcher import submit
+import dispatcher
+import llm_client
 import os
+import threading
+import time
+import uuid
 
 # Streamlit Config
 st.set_page_config(page_title="Jarvis AI Assistant", page_icon="🤖", layout="centered")
@@ -18,66 +24,109 @@ organize files in C:\\Users\\Downloads
 what is software engineering?
 """)
 
-# Chat history initialization
-if "messages" not in st.session_state:
-    st.session_state.messages = []
+@st.cache_resource(show_spinner=False)
+def shared_services():
+    """
+    Long-lived clients for the whole server process, built on the first
+    run and reused by every rerun and every session after it.
+    """
+    start_reminders()  # reminder store + scheduler thread
+    if os.getenv("OPENAI_API_KEY"):
+        llm_client.warm_up()  # event loop + pooled HTTP client, built in the background
+    dispatcher.warm_up()
+    return {"scheduler": get_scheduler(), "outbox": get_outbox()}
+
+shared_services()
+
+# Chat history: the last RING_SIZE turns in memory, older ones paged to memory.db
+if "history" not in st.session_state:
+    st.session_state.history = ChatHistory(uuid.uuid4().hex)
+    st.session_state.older_count = 0  # paged-out turns the user asked to see
+history = st.session_state.history
 
 def add_to_chat(role, content):
-    st.session_state.messages.append({"role": role, "content": content})
+    history.append(role, content)
+
+def fill_slots(intent, slots):
+    """App defaults for missing slots (the CLI asks instead)"""
+    if intent == "send_email" and not slots.get("message"):
+        slots["message"] = "Happy Birthday!"  # default if not spoken
+    elif intent == "set_reminder" and not slots.get("email_to"):
+        slots["email_me"] = True  # reminders also go to your own inbox
+
+def wait_for(fut, progress):
+    """Block on one dispatcher Future, drawing a progress bar while it reports progress"""
+    bar = None
+    shown = None
+    while not fut.done():
+        ev = progress()
+        if ev is not None and ev is not shown:
+            if bar is None:
+                # Clicking Stop reruns the script; the finally below then
+                # cancels the moves still queued (the journal keeps the rest).
+                st.button("⏹ Stop")
+                bar = st.progress(0.0, text="Scanning…")
+            shown = ev
+            done = ev.moved + ev.skipped
+            eta = f", ~{ev.eta:.0f}s left" if ev.eta is not None else ""
+            bar.progress(done / ev.total if ev.total else 0.0,
+                         text=f"{done} file(s), {ev.bytes / 1e6:.1f} MB, {ev.rate:.0f}/s{eta}")
+        time.sleep(0.1)
+    if bar is not None:
+        bar.progress(1.0, text="Finished")
+    result = fut.result()
+    return f"{result.message}\n\n_{result.elapsed:.2f}s_"
 
-def dispatch(intent, slots):
-    """Mapping intents → actions"""
-
-    if intent == "send_email":
-        to = slots.get("to")
-        subject = slots.get("subject") or "Automated Email"
-        msg = slots.get("message")
-
-        # Slot filling (if missing message or email)
-        if not to:
-            return "❌ Missing email address."
-
-        if not msg:
-            msg = "Happy Birthday!"  # default if not spoken
-
-        send_email(to, subject, msg)
-        return f"✅ Email sent to **{to}**."
-
-    elif intent == "set_reminder":
-        time_str = slots.get("time")
-        message = slots.get("message") or "Reminder"
-
-        email_to = slots.get("email_to") or os.getenv("GMAIL_EMAIL")
-
-        set_reminder_with_email(time_str, message, email_to)
-        return f"⏰ Reminder set for **{time_str}**."
-
-    elif intent == "organize_files":
-        path = slots.get("path")
-        dry = bool(slots.get("dry_run"))
-
-        if not path:
-            return "⚠️ Missing folder path."
-
-        organize_files(path, dry_run=dry)
-        return "✅ Files organized." if not dry else "✅ Dry run completed."
-
-    else:
-        query = slots.get("query") or "Tell me something."
-        return chat_reply(query)
+# Display chat history
+recent = history.recent()
+first = recent[0][0] if recent else 0
+hidden = first - st.session_state.older_count
+if hidden > 0 and st.button(f"⬆️ Load older messages ({hidden} more)", key="load_older"):
+    st.session_state.older_count += PAGE_SIZE
+    st.rerun()
+older = history.older(first, st.session_state.older_count) if st.session_state.older_count else []
+for _, role, content in older + recent:
+    with st.chat_message(role):
+        st.write(content)
 
 # Chat input
 prompt = st.chat_input("Ask Jarvis anything...")
 
 if prompt:
     add_to_chat("user", prompt)
-    actions = interpret(prompt)
+    with st.chat_message("user"):
+        st.write(prompt)
 
+    actions = interpret(prompt)
     for action in actions:
-        response = dispatch(action["intent"], action["slots"])
-        add_to_chat("assistant", response)
-
-# Display chat history
-for msg in st.session_state.messages:
-    with st.chat_message(msg["role"]):
-        st.write(msg["content"])
+        fill_slots(action["intent"], action["slots"])
+
+    # Everything except chat starts at once; results are shown in order
+    # and chat replies stream in their place.
+    background = [i for i, a in enumerate(actions) if a["intent"] != "chat"]
+    latest = {}
+    cancel = threading.Event()
+    futures = dict(zip(background, submit(
+        [actions[i] for i in background], cancel=cancel,
+        progress=lambda n, ev: latest.__setitem__(background[n], ev),
+    )))
+
+    try:
+        for i, action in enumerate(actions):
+            with st.chat_message("assistant"):
+                if i in futures:
+                    response = wait_for(futures[i], lambda: latest.get(i))
+                    st.write(response)
+                else:
+                    # chat: render tokens as they stream in
+                    query = action["slots"].get("query") or "Tell me something."
+                    turns = [(role, content) for _, role, content in recent]  # before this prompt
+                    stream = chat_reply_stream(query, turns)
+                    response = st.write_stream(stream)
+                    ctx = stream.context
+                    if ctx:
+                        st.caption(f"🧩 {ctx.tokens} context tokens ({ctx.memories} memories, "
+                                   f"{ctx.turns} turns), saved {ctx.saved}, +{ctx.build_ms:.1f} ms")
+            add_to_chat("assistant", response)
+    finally:
+        cancel.set()  # rerun / Stop: don't leave the organizer running
@@ -0,0 +1,244 @@
+# audio_stream.py
+"""
+Streaming audio capture and speech segmentation for voice_agent.
+
+The microphone callback only copies samples into a RingBuffer; the
+listening thread reads fixed-size blocks from it and feeds them to a
+Segmenter. The segmenter measures the energy of every 20 ms frame with
+NumPy, tracks the background noise level, and emits one int16 array per
+utterance once SILENCE_MS of real silence follows the speech. Silence
+and background noise never reach the recognizer.
+
+wav_blocks() yields the same blocks from a recorded WAV file, so the
+whole path runs offline with no microphone.
+"""
+import threading
+import time
+import wave
+from collections import deque
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+BLOCK_MS = 100          # samples handed from the ring buffer per read
+FRAME_MS = 20           # VAD resolution
+SILENCE_MS = 600        # quiet after speech that ends an utterance
+PREROLL_MS = 200        # audio kept from before speech was detected
+START_FRAMES = 3        # consecutive loud frames that start speech
+MAX_SEGMENT_S = 15.0    # longer speech is cut (and the noise floor re-learned)
+START_DB = 9.0          # speech threshold above the noise floor
+MIN_DB = -45.0          # never treat anything quieter (dBFS) as speech
+HYSTERESIS_DB = 3.0     # speech continues down to threshold - HYSTERESIS_DB
+
+
+class RingBuffer:
+    """
+    Fixed-size int16 buffer between an audio callback (writer) and one
+    reader. The writer never blocks: if the reader falls behind, the
+    oldest samples are overwritten and counted in `overruns`.
+    """
+
+    def __init__(self, capacity: int):
+        self._buf = np.zeros(capacity, dtype=np.int16)
+        self._written = 0   # total samples ever written
+        self._read = 0      # total samples ever read
+        self._closed = False
+        self._cond = threading.Condition()
+        self.overruns = 0
+
+    def write(self, samples: np.ndarray):
+        cap = len(self._buf)
+        samples = samples[-cap:]
+        n = len(samples)
+        with self._cond:
+            start = self._written % cap
+            first = min(n, cap - start)
+            self._buf[start:start + first] = samples[:first]
+            self._buf[:n - first] = samples[first:]
+            self._written += n
+            behind = self._written - self._read - cap
+            if behind > 0:
+                self.overruns += behind
+                self._read += behind
+            self._cond.notify()
+
+    def read(self, n: int, timeout: float = None) -> np.ndarray:
+        """Next n samples; fewer (possibly none) after close() or timeout"""
+        cap = len(self._buf)
+        with self._cond:
+            self._cond.wait_for(lambda: self._written - self._read >= n or self._closed, timeout)
+            n = min(n, self._written - self._read)
+            start = self._read % cap
+            first = min(n, cap - start)
+            out = np.concatenate((self._buf[start:start + first], self._buf[:n - first]))
+            self._read += n
+            return out
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+def frame_levels(frames: np.ndarray) -> np.ndarray:
+    """Energy of each row of int16 samples, in dBFS"""
+    x = frames.astype(np.float32) / 32768.0
+    return 10.0 * np.log10(np.einsum("ij,ij->i", x, x) / frames.shape[1] + 1e-10)
+
+
+class Segmenter:
+    """
+    Energy-based voice activity detection with silence endpointing.
+    feed() takes any number of samples and returns the utterances that
+    ended within them; flush() returns one still in progress.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, silence_ms: int = SILENCE_MS):
+        self.sample_rate = sample_rate
+        self.frame = sample_rate * FRAME_MS // 1000
+        self.silence_frames = silence_ms // FRAME_MS
+        self.max_frames = int(MAX_SEGMENT_S * 1000 / FRAME_MS)
+        self.noise_db = MIN_DB - START_DB
+        self.idle_frames = 0          # frames since speech was last heard
+        self.frames_seen = 0
+        self._pending = np.zeros(0, dtype=np.int16)   # partial frame
+        self._preroll = deque(maxlen=PREROLL_MS // FRAME_MS)
+        self._voiced = 0              # consecutive loud frames before speech starts
+        self._speech = []             # frames of the utterance in progress
+        self._levels = []
+        self._quiet = 0               # consecutive quiet frames inside it
+
+    @property
+    def idle_seconds(self) -> float:
+        return self.idle_frames * FRAME_MS / 1000
+
+    @property
+    def in_speech(self) -> bool:
+        return bool(self._speech)
+
+    def feed(self, samples: np.ndarray) -> list:
+        data = np.concatenate((self._pending, samples)) if len(self._pending) else samples
+        n = len(data) // self.frame
+        self._pending = data[n * self.frame:].copy()
+        if not n:
+            return []
+        frames = data[:n * self.frame].reshape(n, self.frame)
+
+        out = []
+        for frame, level in zip(frames, frame_levels(frames).tolist()):
+            self.frames_seen += 1
+            threshold = max(self.noise_db + START_DB, MIN_DB)
+            if not self._speech:
+                self.idle_frames += 1
+                self._preroll.append(frame)
+                if level > threshold:
+                    self._voiced += 1
+                    if self._voiced >= START_FRAMES:
+                        self._speech = list(self._preroll)
+                        self._levels = [level] * len(self._speech)
+                        self._preroll.clear()
+                        self._quiet = 0
+                else:
+                    self._voiced = 0
+                    # follow the room: drop fast, rise slowly
+                    rate = 0.5 if level < self.noise_db else 0.05
+                    self.noise_db += rate * (level - self.noise_db)
+                continue
+
+            self._speech.append(frame)
+            self._levels.append(level)
+            self.idle_frames = 0
+            self._quiet = self._quiet + 1 if level < threshold - HYSTERESIS_DB else 0
+            if self._quiet >= self.silence_frames:
+                out.append(self._end(self._quiet - 2))   # keep ~40 ms of the tail
+                self.idle_frames = self.silence_frames
+            elif len(self._speech) >= self.max_frames:
+                # that long without a pause is more likely noise than speech
+                self.noise_db = float(np.percentile(self._levels, 10))
+                out.append(self._end(0))
+        return out
+
+    def _end(self, trim: int) -> np.ndarray:
+        frames = self._speech[:len(self._speech) - trim] if trim > 0 else self._speech
+        segment = np.concatenate(frames)
+        self._speech, self._levels = [], []
+        self._voiced = self._quiet = 0
+        return segment
+
+    def flush(self):
+        """The utterance in progress (None if there is none)"""
+        return self._end(self._quiet) if self._speech else None
+
+
+def mic_blocks(sample_rate: int = SAMPLE_RATE, block_ms: int = BLOCK_MS, seconds: float = 10.0):
+    """
+    Blocks of int16 samples from the default microphone. The stream
+    callback writes into a ring buffer of `seconds`; this generator reads
+    from it, so slow consumers lose the oldest audio rather than stalling
+    the audio driver.
+    """
+    import sounddevice as sd  # only when a microphone is actually used
+
+    block = sample_rate * block_ms // 1000
+    ring = RingBuffer(int(sample_rate * seconds))
+
+    def callback(indata, frames, time_info, status):
+        ring.write(indata[:, 0])
+
+    with sd.InputStream(samplerate=sample_rate, channels=1, dtype="int16",
+                        blocksize=block, callback=callback):
+        try:
+            while True:
+                yield ring.read(block)
+        finally:
+            ring.close()
+
+
+def wav_blocks(path: str, block_ms: int = BLOCK_MS, sample_rate: int = SAMPLE_RATE):
+    """Blocks of int16 samples from a 16-bit WAV file (first channel, resampled if needed)"""
+    with wave.open(path, "rb") as w:
+        if w.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit WAV files are supported")
+        rate, channels = w.getframerate(), w.getnchannels()
+        samples = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)[::channels]
+    if rate != sample_rate:
+        positions = np.arange(0, len(samples), rate / sample_rate)
+        samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+    block = sample_rate * block_ms // 1000
+    for start in range(0, len(samples), block):
+        yield samples[start:start + block]
+
+
+def speech_segments(blocks, sample_rate: int = SAMPLE_RATE, idle_timeout: float = None,
+                    timings: dict = None):
+    """
+    Utterances (int16 arrays) found in an iterable of sample blocks.
+    Stops after `idle_timeout` seconds of audio without speech, or when
+    the blocks run out. If `timings` is given, it holds the seconds spent
+    waiting for audio ("capture") and in the VAD ("vad") for each
+    utterance when it is yielded.
+    """
+    seg = Segmenter(sample_rate)
+    capture = vad = 0.0
+    blocks = iter(blocks)
+    while True:
+        start = time.perf_counter()
+        block = next(blocks, None)
+        mid = time.perf_counter()
+        capture += mid - start
+        if block is None:
+            break
+        found = seg.feed(block)
+        vad += time.perf_counter() - mid
+        for segment in found:
+            if timings is not None:
+                timings.update(capture=capture, vad=vad)
+                capture = vad = 0.0
+            yield segment
+        if idle_timeout and not seg.in_speech and seg.idle_seconds >= idle_timeout:
+            return
+    tail = seg.flush()
+    if tail is not None:
+        if timings is not None:
+            timings.update(capture=capture, vad=vad)
+        yield tail
@@ -0,0 +1,76 @@
+# benchmarks/bench_context.py
+"""
+Latency added and tokens saved by chat_context.build_messages(), the
+context-assembly stage in front of every chat request: memory recall,
+budget packing and the cached system prefix.
+
+Usage:
+    python benchmarks/bench_context.py                   # 10k memories, 200-turn history
+    python benchmarks/bench_context.py 100000 1000 800   # memories, turns, budget
+
+Runs in a temporary directory with its own memory.db. "full" is what
+sending the whole history plus every recalled memory would cost.
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+QUERIES = 500
+WORDS = ("water plants bank pin birthday mom dentist appointment car service gym "
+         "password wifi flight hotel booking meeting project deadline coffee order").split()
+
+
+def main(n: int, turns: int, budget: int):
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        import chat_context
+        import memory_agent
+        from memory_store import MemoryStore
+
+        store = MemoryStore()
+        store.put_many((f"{' '.join(rng.sample(WORDS, 2))} {i}", " ".join(rng.sample(WORDS, 5)))
+                       for i in range(n))
+        store.close()
+
+        history = []
+        for i in range(turns):
+            history.append(("user", " ".join(rng.choices(WORDS, k=rng.randint(5, 30)))))
+            history.append(("assistant", " ".join(rng.choices(WORDS, k=rng.randint(20, 120)))))
+        prompts = [f"what was my {' '.join(rng.sample(WORDS, 2))}" for _ in range(QUERIES)]
+
+        start = time.perf_counter()
+        memory_agent.recall_memory("warm up")
+        print(f"{n:,} memories, {turns * 2:,} turns, budget {budget} tokens "
+              f"(recall index built in {time.perf_counter() - start:.2f}s)")
+
+        for label, recall in (("recall + turns", True), ("turns only", False)):
+            stats = [chat_context.build_messages(p, history, budget, recall)[1] for p in prompts]
+            ms = sorted(s.build_ms for s in stats)
+            sent = statistics.mean(s.tokens for s in stats)
+            full = statistics.mean(s.full_tokens for s in stats)
+            print(f"  {label:<15} +{statistics.median(ms):6.2f} ms p50  +{ms[int(len(ms) * 0.99)]:6.2f} ms p99   "
+                  f"sent {sent:6.0f} / full {full:8.0f} tokens (saved {1 - sent / full:.1%}), "
+                  f"{statistics.mean(s.memories for s in stats):.1f} memories, "
+                  f"{statistics.mean(s.turns for s in stats):.1f} turns")
+
+        hits, misses = chat_context.prefix_hits, chat_context.prefix_misses
+        print(f"  system prefix cache: {hits / (hits + misses):.0%} hits ({misses} distinct prefixes)")
+
+        start = time.perf_counter()
+        for _ in range(100_000):
+            chat_context.estimate_tokens(history[0][1])
+        print(f"  estimate_tokens (cached): {(time.perf_counter() - start) * 10:.2f} µs/call")
+        os.chdir("/")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(args[0] if args else 10_000,
+         args[1] if len(args) > 1 else 200,
+         args[2] if len(args) > 2 else 1500)
@@ -0,0 +1,80 @@
+# benchmarks/bench_dispatcher.py
+"""
+"email A, email B and organize a folder": the three actions run one after
+another (the old dispatch_one loop) vs concurrently through
+dispatcher.dispatch(). Mail goes to the local SMTP sink with a simulated
+handshake; the folder is a generated flat tree.
+
+Usage:
+    python benchmarks/bench_dispatcher.py              # 20k files, 200 ms handshake
+    python benchmarks/bench_dispatcher.py 100000 0.5
+
+Each run starts from a fresh outbox, so both pay the SMTP handshake.
+Run it from a scratch directory: the organizer journal goes to ./memory.db.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smtp_sink import start_smtp_sink  # noqa: E402
+
+
+def make_flat(root: str, n: int):
+    os.makedirs(root)
+    exts = (".txt", ".png", ".pdf", ".zip", ".mp3", ".py")
+    for i in range(n):
+        open(os.path.join(root, f"file{i}{exts[i % len(exts)]}"), "w").close()
+
+
+def actions(root: str) -> list:
+    return [
+        {"intent": "send_email", "slots": {"to": "a@example.com", "message": "hello A"}},
+        {"intent": "send_email", "slots": {"to": "b@example.com", "message": "hello B"}},
+        {"intent": "organize_files", "slots": {"path": root}},
+    ]
+
+
+def sequential(acts: list) -> list:
+    import dispatcher
+    out = []
+    for a in acts:
+        start = time.perf_counter()
+        handler = dispatcher._resolve(a["intent"])
+        handler(a["slots"], dispatcher.Context(dispatcher.threading.Event()))
+        out.append(time.perf_counter() - start)
+    return out
+
+
+def concurrent(acts: list) -> list:
+    import dispatcher
+    return [r.elapsed for r in dispatcher.dispatch(acts)]
+
+
+def main(n: int, handshake: float):
+    sink, port = start_smtp_sink(handshake_delay=handshake)
+    os.environ.update(SMTP_HOST="127.0.0.1", SMTP_PORT=str(port), SMTP_STARTTLS="0",
+                      GMAIL_EMAIL="me@example.com", GMAIL_APP_PASSWORD="x")
+    import email_agent
+
+    print(f"2 emails ({handshake * 1000:.0f} ms handshake) + organize {n:,} files")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, fn in (("one after another", sequential), ("dispatcher", concurrent)):
+            root = os.path.join(tmp, label.replace(" ", "_"))
+            make_flat(root, n)
+            email_agent._outbox = None
+            start = time.perf_counter()
+            per_action = fn(actions(root))
+            total = time.perf_counter() - start
+            detail = ", ".join(f"{t:.2f}" for t in per_action)
+            print(f"  {label:<18} {total:6.2f}s   per action: {detail}")
+            shutil.rmtree(root)
+    sink.shutdown()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 20_000, float(args[1]) if len(args) > 1 else 0.2)
@@ -0,0 +1,108 @@
+# benchmarks/bench_file_agent.py
+"""
+file_agent.organize_files on generated flat folders: the current scandir
++ thread-pool engine vs the original iterdir / per-file stat / linear
+category scan / one-at-a-time shutil.move loop.
+
+Usage:
+    python benchmarks/bench_file_agent.py                 # 10k and 100k files
+    python benchmarks/bench_file_agent.py 10000 100000 1000000
+
+Trees are created under a temporary directory (on the same filesystem as
+TMPDIR) and removed afterwards.
+"""
+import contextlib
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import file_agent  # noqa: E402
+from file_agent import CATEGORIES  # noqa: E402
+
+EXTENSIONS = sorted({e for exts in CATEGORIES.values() for e in exts}) + [".bin", ".xyz", ""]
+
+
+# ================================================================
+# Original engine (pre-scandir implementation, renamed)
+# ================================================================
+
+def legacy_category_for(ext: str) -> str:
+    ext = ext.lower()
+    for cat, exts in CATEGORIES.items():
+        if ext in exts:
+            return cat
+    return "Others"
+
+
+def legacy_unique_destination(dst_dir: Path, filename: str) -> Path:
+    base = Path(filename).stem
+    ext = Path(filename).suffix
+    candidate = dst_dir / (base + ext)
+    counter = 1
+    while candidate.exists():
+        candidate = dst_dir / f"{base} ({counter}){ext}"
+        counter += 1
+    return candidate
+
+
+def legacy_organize_files(root: str) -> None:
+    root_path = Path(root).expanduser().resolve()
+    for item in root_path.iterdir():
+        if item.is_dir():
+            if item.name in set(CATEGORIES.keys()) | {"Others"}:
+                continue
+            continue
+        if item.is_file():
+            cat = legacy_category_for(item.suffix)
+            target_dir = root_path / cat
+            target_dir.mkdir(exist_ok=True)
+            dst = legacy_unique_destination(target_dir, item.name)
+            shutil.move(str(item), str(dst))
+            print(f"➡️  {item.name}  →  {cat}/{dst.name}")
+
+
+# ================================================================
+# Tree generation + timing
+# ================================================================
+
+def make_tree(root: str, n: int, seed: int = 0):
+    rng = random.Random(seed)
+    os.makedirs(root)
+    for i in range(n):
+        ext = EXTENSIONS[rng.randrange(len(EXTENSIONS))]
+        # every 50th name repeats so the collision path is exercised too
+        name = f"dup{i % 7}{ext}" if i % 50 == 0 else f"file_{i}{ext}"
+        if not os.path.exists(os.path.join(root, name)):
+            open(os.path.join(root, name), "wb").close()
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    return time.perf_counter() - start
+
+
+def main(sizes):
+    print(f"{'files':>10} {'original (s)':>13} {'scandir (s)':>12} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            old_root, new_root = os.path.join(tmp, f"old_{n}"), os.path.join(tmp, f"new_{n}")
+            make_tree(old_root, n)
+            make_tree(new_root, n)
+            old = timed(lambda: legacy_organize_files(old_root))
+            new = timed(lambda: file_agent.organize_files(new_root, verbose=False))
+            print(f"{n:>10,} {old:>13.2f} {new:>12.2f} {old / new:>7.2f}x")
+            shutil.rmtree(old_root)
+            shutil.rmtree(new_root)
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000])
@@ -0,0 +1,193 @@
+# benchmarks/bench_intent.py
+"""
+Micro-benchmark: precompiled single-pass intent grammar vs the original
+sequential regex cascade in intent_agent._rule_based_parse.
+
+Usage:
+    python benchmarks/bench_intent.py                # 10k, 100k, 1M commands
+    python benchmarks/bench_intent.py 10000 50000    # custom sizes
+
+Every run first checks that both parsers give identical results on the
+whole corpus, so the numbers are only printed for an equivalent parser.
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import intent_agent  # noqa: E402
+
+
+# ================================================================
+# Original cascade (pre-grammar implementation, renamed)
+# ================================================================
+
+def legacy_normalize_spoken_email(text: str) -> str | None:
+    if not text:
+        return None
+    t = text.lower().strip()
+    replacements = {
+        " at the rate ": "@",
+        " at ": "@",
+        " underscore ": "_",
+        " under score ": "_",
+        " dot ": ".",
+        " dash ": "-",
+        " hyphen ": "-",
+        " space ": "",
+    }
+    for spoken, symbol in replacements.items():
+        t = t.replace(spoken, symbol)
+    t = re.sub(r"\s*@\s*", "@", t)
+    t = re.sub(r"\s*\.\s*", ".", t)
+    return t
+
+
+def legacy_parse_time_from_text(text: str) -> str | None:
+    """
+    Supports:
+      23:19
+      9 am / 9am
+      9:05 pm / 9:05pm
+      23:20am (messy but seen in speech)
+    Returns HH:MM (24h) or None
+    """
+    t = text.lower().strip().replace(" ", "")
+    # 1) H:MM(am|pm)? or HH:MM(am|pm)?
+    m = re.search(r"\b(\d{1,2}):(\d{2})(am|pm)?\b", t)
+    if m:
+        hh = int(m.group(1)); mm = int(m.group(2)); ap = m.group(3)
+        return intent_agent._to_hhmm(hh, mm, ap)
+    # 2) H(am|pm)
+    m = re.search(r"\b(\d{1,2})(am|pm)\b", t)
+    if m:
+        hh = int(m.group(1)); ap = m.group(2)
+        return intent_agent._to_hhmm(hh, 0, ap)
+    # 3) Bare HH:MM 24h
+    m = re.search(r"\b(\d{1,2}):(\d{2})\b", t)
+    if m:
+        hh = int(m.group(1)); mm = int(m.group(2))
+        return intent_agent._to_hhmm(hh, mm, None)
+    return None
+
+
+def legacy_rule_based_parse(text: str):
+    original = text
+    t = text.lower().strip()
+    # strip wake words just in case
+    t = t.replace("hey jarvis", "").replace("jarvis", "").strip()
+
+    # ----- CHAT -----
+    if any(q in t for q in ["what is", "who are you", "explain", "tell me", "define "]):
+        return [{"intent": "chat", "slots": {"query": original}}]
+
+    # ----- EMAIL: "send happy birthday to someone@example.com"
+    m = re.match(r"send (?:a )?(?:happy birthday|birthday wish|birthday message) to (.+)", t)
+    if m:
+        email_or_name = m.group(1).strip()
+        email = legacy_normalize_spoken_email(email_or_name)
+        return [{
+            "intent": "send_email",
+            "slots": {
+                "to": email if (email and "@" in email) else None,
+                "subject": "Happy Birthday!",
+                "message": "Happy Birthday! 🎉"
+            }
+        }]
+
+    # ----- EMAIL: "send email to someone@example.com <message>"
+    m = re.match(r"send email to (\S+)\s+(.+)", t)
+    if m:
+        email = legacy_normalize_spoken_email(m.group(1))
+        msg = m.group(2)
+        return [{"intent": "send_email", "slots": {"to": email, "subject": "Automated Email", "message": msg}}]
+
+    # ----- REMINDER patterns -----
+
+    # A) "remind me to <message> at <time> [email me|to my mail <email>]"
+    m = re.match(
+        r"(?:remind me|set reminder)\s+(?:to\s+)?(.+?)\s+(?:at|@)\s+([^\s]+(?:\s?(?:am|pm))?)\s*(?:.*?(email me)|.*?(?:to|at)\s*(?:my\s*)?mail\s*(\S+))?$",
+        t
+    )
+    if m:
+        message = m.group(1).strip()
+        timestr_raw = m.group(2).strip()
+        email_me_flag = bool(m.group(3))
+        email_raw = m.group(4)
+        hhmm = legacy_parse_time_from_text(timestr_raw)
+        email_to = legacy_normalize_spoken_email(email_raw) if email_raw else None
+        return [{
+            "intent": "set_reminder",
+            "slots": {"time": hhmm, "message": message, "email_me": email_me_flag, "email_to": email_to}
+        }]
+
+    # B) "remind me at <time> to <message> [email me|to my mail <email>]"
+    m = re.match(
+        r"(?:remind me|set reminder)\s+(?:at|@)\s+([^\s]+(?:\s?(?:am|pm))?)\s+(?:to\s+)?(.+?)(?:\s*(email me)|\s*(?:to|at)\s*(?:my\s*)?mail\s*(\S+))?$",
+        t
+    )
+    if m:
+        timestr_raw = m.group(1).strip()
+        message = m.group(2).strip()
+        email_me_flag = bool(m.group(3))
+        email_raw = m.group(4)
+        hhmm = legacy_parse_time_from_text(timestr_raw)
+        email_to = legacy_normalize_spoken_email(email_raw) if email_raw else None
+        return [{
+            "intent": "set_reminder",
+            "slots": {"time": hhmm, "message": message, "email_me": email_me_flag, "email_to": email_to}
+        }]
+
+    return None
+
+
+# ================================================================
+# Corpus + timing
+# ================================================================
+
+SAMPLES = [
+    "what is software engineering",
+    "hey jarvis tell me about AI",
+    "send happy birthday to someone@example.com",
+    "send a birthday wish to john dot doe at gmail dot com",
+    "send email to someone@example.com hello how are you",
+    "remind me to drink water at 9am",
+    "remind me to pray at 7 pm email me",
+    "remind me to send report at 9am to my mail boss@example.com",
+    "remind me at 23:20 to stretch",
+    "set reminder at 10:30 to call mom email me",
+    "organize files in downloads",
+    "play some music",
+    "",
+]
+
+
+def build_corpus(n: int) -> list[str]:
+    reps = n // len(SAMPLES) + 1
+    return (SAMPLES * reps)[:n]
+
+
+def bench(fn, corpus) -> float:
+    start = time.perf_counter()
+    for text in corpus:
+        fn(text)
+    return time.perf_counter() - start
+
+
+def main(sizes):
+    corpus = build_corpus(max(sizes))
+    for text in set(corpus):
+        assert intent_agent._rule_based_parse(text) == legacy_rule_based_parse(text), text
+
+    print(f"{'commands':>10} {'cascade (s)':>12} {'grammar (s)':>12} {'speedup':>8}")
+    for n in sizes:
+        sample = corpus[:n]
+        old = bench(legacy_rule_based_parse, sample)
+        new = bench(intent_agent._rule_based_parse, sample)
+        print(f"{n:>10} {old:>12.3f} {new:>12.3f} {old / new:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,38 @@
+# benchmarks/bench_interpret_many.py
+"""
+Throughput of intent_agent.interpret_many() for 1, 4 and 16 workers.
+
+Usage:
+    python benchmarks/bench_interpret_many.py               # 200k commands
+    python benchmarks/bench_interpret_many.py 1000000 1 4 16
+
+Only the rule-based path is measured: OPENAI_API_KEY is cleared so the few
+unmatched commands in the corpus fall straight through to chat. Speedup
+is capped by the number of CPU cores on the machine (printed below).
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.pop("OPENAI_API_KEY", None)
+
+import intent_agent  # noqa: E402
+from bench_intent import build_corpus  # noqa: E402
+
+
+def main(n: int, worker_counts):
+    corpus = build_corpus(n)
+    print(f"{n} commands, {os.cpu_count()} CPU cores")
+    print(f"{'workers':>8} {'seconds':>9} {'cmds/s':>12}")
+    for workers in worker_counts:
+        start = time.perf_counter()
+        count = sum(1 for _ in intent_agent.interpret_many(corpus, workers=workers, chunksize=2048))
+        elapsed = time.perf_counter() - start
+        assert count == n
+        print(f"{workers:>8} {elapsed:>9.3f} {n / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(args[0] if args else 200_000, args[1:] or [1, 4, 16])
@@ -0,0 +1,144 @@
+# benchmarks/bench_llm_cache.py
+"""
+LLM parse cache (intent_agent._llm_parse + llm_cache.LLMCache): behaviour
+checks, then the cost of a hit next to a (free, fake) miss.
+
+llm_client is replaced by a fake whose complete() answers like the
+intent extractor and records every request, so neither the network nor
+the openai package is needed. The cache lives in a scratch database.
+
+Checked first (the run stops on the first failure):
+  - a miss sends one request; the same command again is a hit, no request
+  - the same phrasing with another address / clock time is a hit, and the
+    "to" / reminder "time" slots are refilled from the new command
+  - a parse with the time or address in free text (email message, chat
+    query) is not cached: "... saying meet at 9am" then "... at 10am"
+    asks again instead of sending "meet at 9am"
+  - L2: a new LLMCache on the same file answers from SQLite
+  - TTL: expired entries miss, from L1 and from L2
+  - eviction: the L1 LRU keeps max_size entries
+
+Usage:
+    python benchmarks/bench_llm_cache.py            # 10k lookups
+    python benchmarks/bench_llm_cache.py 100000
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import intent_agent  # noqa: E402
+from llm_cache import LLMCache  # noqa: E402
+
+REQUESTS = []
+
+
+def fake_complete(messages, **kwargs) -> str:
+    """Intent-extractor replies for the three phrasings used below"""
+    text = messages[-1]["content"]
+    REQUESTS.append(text)
+    email, _ = intent_agent.extract_email_and_message(text)
+    if text.startswith("please ping"):
+        return json.dumps([{"intent": "send_email", "slots": {
+            "to": email, "subject": "Ping", "message": "about the budget"}}])
+    if text.startswith("email"):
+        return json.dumps([{"intent": "send_email", "slots": {
+            "to": email, "subject": "Note", "message": text.split(" saying ", 1)[1]}}])
+    if text.startswith("nudge me"):
+        return json.dumps([{"intent": "set_reminder", "slots": {
+            "time": intent_agent.parse_time_from_text(text), "message": "rent"}}])
+    return json.dumps([{"intent": "chat", "slots": {"query": text}}])
+
+
+def parse(text: str) -> tuple[list, bool]:
+    """(parse, whether it needed a request)"""
+    before = len(REQUESTS)
+    parsed = intent_agent._llm_parse(text)
+    return parsed, len(REQUESTS) > before
+
+
+def check(db_path: str):
+    cache = intent_agent._llm_cache = LLMCache(db_path)
+
+    # miss, then hit
+    parsed, asked = parse("please ping alice@example.com about the budget")
+    assert asked and parsed[0]["slots"]["to"] == "alice@example.com", parsed
+    parsed, asked = parse("please  ping alice@example.com about the budget")
+    assert not asked and parsed[0]["slots"]["to"] == "alice@example.com", parsed
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1, cache.stats()
+
+    # refill: other address / other time, same phrasing
+    parsed, asked = parse("please ping bob@example.com about the budget")
+    assert not asked and parsed[0]["slots"]["to"] == "bob@example.com", parsed
+    parsed, asked = parse("nudge me about rent at 9am")
+    assert asked and parsed[0]["slots"]["time"] == "09:00", parsed
+    parsed, asked = parse("nudge me about rent at 10:30pm")
+    assert not asked and parsed[0]["slots"]["time"] == "22:30", parsed
+
+    # masked spans in free text: not cached
+    parsed, asked = parse("email bob@example.com saying meet at 9am")
+    assert asked and parsed[0]["slots"]["message"] == "meet at 9am", parsed
+    parsed, asked = parse("email bob@example.com saying meet at 10am")
+    assert asked and parsed[0]["slots"]["message"] == "meet at 10am", parsed
+    parse("email carol@example.com saying hi")    # address only in "to": cached
+    parsed, asked = parse("email dave@example.com saying hi")
+    assert not asked and parsed[0]["slots"]["to"] == "dave@example.com", parsed
+    for text in ("what is on at 9pm", "what is on at 11pm"):
+        parsed, asked = parse(text)
+        assert asked and parsed[0]["slots"]["query"] == text, parsed
+
+    # L2: a fresh cache on the same file
+    fresh = LLMCache(db_path)
+    key = intent_agent._llm_cache_key("please ping x@example.com about the budget")
+    assert fresh.get(key) is not None and fresh.stats()["size"] == 1, fresh.stats()
+
+    # TTL, in L1 and then L2
+    short = LLMCache(db_path, ttl=0.05)
+    short.put("k", [1])
+    fresh = LLMCache(db_path, ttl=0.05)
+    time.sleep(0.1)
+    assert fresh.get("k") is None     # L2 row expired (and deleted)
+    assert short.get("k") is None     # L1 entry expired
+    assert short.stats()["evictions"] == 1 and fresh.stats()["evictions"] == 1
+
+    # LRU eviction
+    small = LLMCache(None, max_size=2)
+    for key in "abc":
+        small.put(key, [key])
+    small.get("b")
+    small.put("d", ["d"])
+    assert small.get("a") is None and small.get("c") is None
+    assert small.get("b") == ["b"] and small.get("d") == ["d"]
+    assert small.stats()["evictions"] == 2 and small.stats()["size"] == 2, small.stats()
+
+
+def main(n: int):
+    os.environ.setdefault("OPENAI_API_KEY", "fake")
+    sys.modules["llm_client"] = types.SimpleNamespace(complete=fake_complete)
+    with tempfile.TemporaryDirectory() as tmp:
+        check(os.path.join(tmp, "cache.db"))
+        print("cache checks passed")
+
+        intent_agent._llm_cache = LLMCache(os.path.join(tmp, "bench.db"))
+        misses = [f"please ping user{i}@example.com about item {i}" for i in range(n)]
+        start = time.perf_counter()
+        for text in misses:
+            intent_agent._llm_parse(text)
+        miss = time.perf_counter() - start
+        hits = [f"please ping other{i}@example.com about item {i}" for i in range(n)]
+        start = time.perf_counter()
+        for text in hits:
+            intent_agent._llm_parse(text)
+        hit = time.perf_counter() - start
+
+    print(f"{n:,} lookups")
+    print(f"  miss (fake LLM, SQLite write) : {miss / n * 1e6:8.1f} µs")
+    print(f"  hit (L1, slots refilled)      : {hit / n * 1e6:8.1f} µs")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,56 @@
+# benchmarks/bench_llm_client.py
+"""
+Shared pooled LLM client vs a fresh OpenAI client per call, against the
+local stub endpoint (benchmarks/stub_openai.py).
+
+Usage:
+    python benchmarks/bench_llm_client.py            # 200 requests
+    python benchmarks/bench_llm_client.py 1000 0.02  # requests, stub latency (s)
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_openai import start_stub_server  # noqa: E402
+
+
+def main(n: int, latency: float):
+    server, url = start_stub_server(latency=latency)
+    os.environ["OPENAI_BASE_URL"] = url
+    os.environ["OPENAI_API_KEY"] = "stub"
+
+    from openai import OpenAI
+    import chat_agent
+
+    messages = [{"role": "user", "content": "hi"}]
+
+    start = time.perf_counter()
+    for _ in range(n):
+        OpenAI(api_key="stub").chat.completions.create(model="gpt-4o-mini", messages=messages)
+    fresh = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(n):
+        chat_agent.chat_reply("hi")
+    pooled = time.perf_counter() - start
+
+    async def burst():
+        await asyncio.gather(*(chat_agent.achat_reply("hi") for _ in range(n)))
+
+    start = time.perf_counter()
+    asyncio.run(burst())
+    concurrent = time.perf_counter() - start
+
+    print(f"{n} requests, stub latency {latency * 1000:.0f} ms")
+    print(f"  fresh client per call : {fresh:7.3f}s  ({n / fresh:8.1f} req/s)")
+    print(f"  shared pooled client  : {pooled:7.3f}s  ({n / pooled:8.1f} req/s)")
+    print(f"  achat_reply x{n} gather: {concurrent:7.3f}s  ({n / concurrent:8.1f} req/s)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 200, float(args[1]) if len(args) > 1 else 0.01)
@@ -0,0 +1,98 @@
+# benchmarks/bench_memory.py
+"""
+memory_agent get/put latency: the original memory.json store (whole file
+re-read on every get, re-read + rewritten on every put) vs MemoryStore
+(SQLite with a unique key index, LRU read cache, batched write-back).
+
+Usage:
+    python benchmarks/bench_memory.py                 # 1M keys (JSON baseline at 10k)
+    python benchmarks/bench_memory.py 100000 2000
+
+The JSON store is O(total size) per call, so it is measured at a smaller
+size. Files are created in a temporary directory.
+"""
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory_store import MemoryStore  # noqa: E402
+
+SAMPLES = 2000
+
+
+def legacy_save(path: str, key: str, value: str):
+    with open(path) as f:
+        data = json.load(f)
+    data[key.lower()] = value
+    with open(path, "w") as f:
+        json.dump(data, f, indent=4)
+
+
+def legacy_get(path: str, key: str):
+    with open(path) as f:
+        return json.load(f).get(key.lower())
+
+
+def latencies(fn, keys) -> tuple[float, float]:
+    """(p50, p99) in microseconds"""
+    times = []
+    for k in keys:
+        start = time.perf_counter()
+        fn(k)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return statistics.median(times) * 1e6, times[int(len(times) * 0.99)] * 1e6
+
+
+def report(label: str, p50: float, p99: float):
+    print(f"  {label:<40} p50 {p50:10.1f} µs   p99 {p99:10.1f} µs")
+
+
+def bench_legacy(tmp: str, n: int):
+    path = os.path.join(tmp, "memory.json")
+    with open(path, "w") as f:
+        json.dump({f"key{i}": f"value {i}" for i in range(n)}, f, indent=4)
+    keys = [f"key{random.randrange(n)}" for _ in range(min(SAMPLES, 200))]
+    print(f"memory.json, {n:,} keys")
+    report("get", *latencies(lambda k: legacy_get(path, k), keys))
+    report("put", *latencies(lambda k: legacy_save(path, k, "new value"), keys))
+
+
+def bench_store(tmp: str, n: int):
+    store = MemoryStore(os.path.join(tmp, "memory.db"))
+    start = time.perf_counter()
+    store.put_many((f"key{i}", f"value {i}") for i in range(n))
+    load = time.perf_counter() - start
+    print(f"\nMemoryStore, {n:,} keys (bulk load {load:.1f}s)")
+
+    keys = [f"key{random.randrange(n)}" for _ in range(SAMPLES)]
+    report("get, cold (index lookup)", *latencies(store.get, keys))
+    report("get, warm (LRU hit)", *latencies(store.get, keys))
+    report("get, missing key", *latencies(store.get, [f"nope{i}" for i in range(SAMPLES)]))
+    report("put (write-back)", *latencies(lambda k: store.put(k, "new value"), keys))
+
+    start = time.perf_counter()
+    for i in range(SAMPLES * 10):
+        store.put(f"new{i}", "v")
+    store.flush()
+    elapsed = time.perf_counter() - start
+    print(f"  {SAMPLES * 10:,} puts incl. flush: {SAMPLES * 10 / elapsed:,.0f} puts/s")
+    store.close()
+
+
+def main(n: int, legacy_n: int):
+    random.seed(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_legacy(tmp, legacy_n)
+        bench_store(tmp, n)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 1_000_000, int(args[1]) if len(args) > 1 else 10_000)
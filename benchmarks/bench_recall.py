@@ -0,0 +1,100 @@
+# benchmarks/bench_recall.py
+"""
+memory_index.RecallIndex at scale: build time, incremental add/delete
+cost, query latency and top-k hit rate on generated memories, against
+a plain Python loop that scores every memory by shared words (what a
+non-vectorised recall would do).
+
+Usage:
+    python benchmarks/bench_recall.py              # 100k memories
+    python benchmarks/bench_recall.py 10000 100000 300000
+
+Memories are "<topic> <thing>: <four random words>"; each query asks for
+one of them in different words ("what is my <thing> for <topic>").
+"""
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory_index import RecallIndex  # noqa: E402
+
+QUERIES = 500
+_WORD_RE = re.compile(r"\w+")
+
+
+def make_vocab(n: int, rng: random.Random) -> list:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(n)]
+
+
+def make_memories(n: int, rng: random.Random) -> tuple[list, list]:
+    vocab = make_vocab(max(2000, n // 20), rng)
+    memories, queries = [], []
+    for i in range(n):
+        topic, thing = rng.sample(vocab, 2)
+        key = f"{topic} {thing} {i}"
+        memories.append((key, f"{key} " + " ".join(rng.sample(vocab, 4))))
+        queries.append((key, f"what is my {thing} for {topic}"))
+    return memories, queries
+
+
+def loop_search(memories: list, query: str, k: int) -> list:
+    q = set(_WORD_RE.findall(query.lower()))
+    scored = [(len(q & set(_WORD_RE.findall(text))), key) for key, text in memories]
+    scored.sort(reverse=True)
+    return [key for _, key in scored[:k]]
+
+
+def timed(fn, args_list) -> tuple[list, float, float]:
+    out, times = [], []
+    for args in args_list:
+        start = time.perf_counter()
+        out.append(fn(*args))
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return out, statistics.median(times) * 1000, times[int(len(times) * 0.99)] * 1000
+
+
+def hit_rate(expected: list, results: list) -> float:
+    return sum(key in found for key, found in zip(expected, results)) / len(expected)
+
+
+def main(sizes: list):
+    for n in sizes:
+        rng = random.Random(n)
+        memories, queries = make_memories(n, rng)
+        sample = rng.sample(queries, QUERIES)
+        expected = [key for key, _ in sample]
+
+        index = RecallIndex()
+        start = time.perf_counter()
+        index.add_many(memories)
+        build = time.perf_counter() - start
+
+        results, p50, p99 = timed(lambda q: [k for k, _ in index.search(q, k=5)], [(q,) for _, q in sample])
+        top1 = hit_rate(expected, [r[:1] for r in results])
+        top5 = hit_rate(expected, results)
+
+        start = time.perf_counter()
+        for key, text in memories[:1000]:
+            index.delete(key)
+            index.add(key, text)
+        churn = (time.perf_counter() - start) / 2000 * 1e6
+
+        print(f"{n:,} memories: build {build:.1f}s, add/delete {churn:.0f} µs each, "
+              f"matrix {index._matrix.nbytes / 1e6:.0f} MB")
+        print(f"  RecallIndex.search   p50 {p50:7.2f} ms   p99 {p99:7.2f} ms   hit@1 {top1:.0%}   hit@5 {top5:.0%}")
+
+        loop_n = min(QUERIES, 20)
+        loop_results, p50, p99 = timed(lambda q: loop_search(memories, q, 5), [(q,) for _, q in sample[:loop_n]])
+        print(f"  python loop          p50 {p50:7.2f} ms   p99 {p99:7.2f} ms   "
+              f"hit@5 {hit_rate(expected[:loop_n], loop_results):.0%}  ({loop_n} queries)")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [100_000])
@@ -0,0 +1,111 @@
+# benchmarks/bench_recognizers.py
+"""
+speech_recognizers.PooledRecognizer: command latency and burst throughput
+with and without batching, plus the per-stage timings of the whole voice
+path (capture -> VAD -> decode) run offline from a synthetic recording.
+
+Usage:
+    python benchmarks/bench_recognizers.py                  # stub backend
+    VOSK_MODEL=/path/to/model python benchmarks/bench_recognizers.py vosk
+
+The stub backend (stub_recognizer.py) sleeps like a small local model:
+40 ms per call + 50 ms per second of audio, 0.5 s model load per worker.
+With "vosk" the real offline model decodes the same clips.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import voice_agent  # noqa: E402
+from audio_stream import speech_segments, wav_blocks  # noqa: E402
+from bench_voice import synth_recording  # noqa: E402
+from speech_recognizers import PooledRecognizer, RecognitionError  # noqa: E402
+
+BURST = 24
+
+
+def make_pool(backend: str, workers: int, batch_size: int) -> PooledRecognizer:
+    if backend == "vosk":
+        pool = PooledRecognizer("speech_recognizers:vosk_backend", workers, batch_size)
+    else:
+        pool = PooledRecognizer("stub_recognizer:stub_backend", workers, batch_size)
+    pool.warm_up().result()   # model load is not part of per-command latency
+    return pool
+
+
+def burst(pool: PooledRecognizer, clips: list) -> tuple[float, list]:
+    """All clips at once (e.g. a backlog after a stall); per-clip latencies"""
+    start = time.perf_counter()
+    futures = [pool.submit(c) for c in clips]
+    done = []
+    for fut in futures:
+        fut.result()
+        done.append(time.perf_counter() - start)
+    return time.perf_counter() - start, done
+
+
+def main(backend: str):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "speech.wav")
+        synth_recording(path, 180, np.random.default_rng(2))
+        clips = list(speech_segments(wav_blocks(path)))
+        mean_s = statistics.mean(len(c) for c in clips) / 16000
+        print(f"backend {backend}: {len(clips)} utterances, {mean_s:.1f}s each on average\n")
+
+        single = []
+        pool = make_pool(backend, 1, 1)
+        for clip in clips[:20]:
+            start = time.perf_counter()
+            pool.recognize(clip)
+            single.append(time.perf_counter() - start)
+        print(f"one command at a time     p50 {statistics.median(single) * 1000:6.0f} ms   "
+              f"max {max(single) * 1000:6.0f} ms")
+        pool.close()
+
+        for workers, batch in ((1, 1), (1, 8), (2, 8)):
+            pool = make_pool(backend, workers, batch)
+            total, done = burst(pool, clips[:BURST])
+            print(f"burst of {BURST}, {workers} worker(s), batch {batch}: {total:5.2f}s   "
+                  f"{pool.calls:3d} worker calls   p50 {statistics.median(done) * 1000:6.0f} ms   "
+                  f"p99 {max(done) * 1000:6.0f} ms")
+            pool.close()
+
+        # whole voice path from the recording, through the pooled recognizer
+        pool = make_pool(backend, 1, 8)
+        voice_agent.recognizer = pool
+        commands = list(voice_agent.listen_continuous(wav_blocks(path), idle_timeout=60))
+        print(f"\nlisten_continuous: {len(commands)} commands")
+        for stage, (p50, worst) in voice_agent.stage_summary().items():
+            print(f"  {stage:<8} p50 {p50:7.1f} ms   max {worst:7.1f} ms")
+        pool.close()
+
+        if backend != "vosk":
+            broken = PooledRecognizer("stub_recognizer:stub_backend", 1, 8, load_s=0, fail=True)
+            try:
+                broken.recognize(clips[0])
+            except RecognitionError as e:
+                print(f"\nfailing backend raises RecognitionError: {e}")
+            broken.close()
+
+            # backend that can't load: every clip fails, none waits forever
+            broken = PooledRecognizer("stub_recognizer:stub_backend", 1, 8, load_s=0, fail_load=True)
+            futures = [broken.submit(c) for c in clips[:3]]
+            failed = sum(isinstance(f.exception(timeout=30), RecognitionError) for f in futures)
+            try:
+                broken.recognize(clips[0])
+            except RecognitionError:
+                failed += 1
+            print(f"backend that fails to load: {failed}/4 clips raise RecognitionError")
+            broken.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "stub")
@@ -0,0 +1,58 @@
+# benchmarks/bench_reminder_store.py
+"""
+Startup reload cost of reminder_store.ReminderStore as the backlog grows:
+loading only the next hour (what reminder_agent does) vs loading every
+pending reminder, plus batched status-update throughput.
+
+Usage:
+    python benchmarks/bench_reminder_store.py              # 10k, 100k, 1M reminders
+    python benchmarks/bench_reminder_store.py 50000
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reminder_store import ReminderStore  # noqa: E402
+
+YEAR = 365 * 24 * 3600
+WINDOW = 3600
+
+
+def bench(n: int, tmp: str):
+    store = ReminderStore(os.path.join(tmp, f"reminders_{n}.db"), batch_size=1000)
+    now = time.time()
+    # spread evenly over the next year; bulk-load in one transaction
+    with store._db:
+        store._db.executemany(
+            "INSERT INTO reminders (due_at, message, status) VALUES (?, ?, 'pending')",
+            ((now + i * YEAR / n, f"reminder {i}") for i in range(n)),
+        )
+
+    start = time.perf_counter()
+    window = store.pending_before(now + WINDOW, start=now)
+    t_window = time.perf_counter() - start
+
+    start = time.perf_counter()
+    everything = store.pending_before(now + 2 * YEAR)
+    t_all = time.perf_counter() - start
+
+    updates = min(n, 100_000)
+    start = time.perf_counter()
+    for rid in range(1, updates + 1):
+        store.set_status(rid, "done")
+    store.flush()
+    t_updates = time.perf_counter() - start
+
+    print(f"{n:>10,} {len(window):>8,} {t_window * 1000:>10.2f} "
+          f"{len(everything):>10,} {t_all * 1000:>10.1f} {updates / t_updates:>12,.0f}")
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print(f"{'stored':>10} {'in window':>8} {'window ms':>10} {'all':>10} {'all ms':>10} {'updates/s':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            bench(n, tmp)
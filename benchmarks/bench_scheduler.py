@@ -0,0 +1,91 @@
+# benchmarks/bench_scheduler.py
+"""
+Idle CPU and dispatch latency of scheduler.Scheduler with many pending
+reminders, next to the old `schedule` + 1-second polling loop (if the
+`schedule` package is installed).
+
+Usage:
+    python benchmarks/bench_scheduler.py            # 100k pending, 3 s idle window
+    python benchmarks/bench_scheduler.py 1000000 5
+"""
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import Scheduler  # noqa: E402
+
+
+def idle_cpu(seconds: float) -> float:
+    """Process CPU time used while the main thread just sleeps, as % of one core."""
+    cpu, wall = time.process_time(), time.perf_counter()
+    time.sleep(seconds)
+    return 100 * (time.process_time() - cpu) / (time.perf_counter() - wall)
+
+
+def bench_heap(pending: int, idle: float):
+    s = Scheduler()
+    now = time.time()
+    start = time.perf_counter()
+    ids = [s.schedule(now + 3600 + i * 0.01, lambda: None) for i in range(pending)]
+    insert = time.perf_counter() - start
+    print(f"heap scheduler, {pending:,} pending")
+    print(f"  insert      : {insert / pending * 1e6:7.2f} µs/job")
+
+    start = time.perf_counter()
+    for job_id in ids[: pending // 10]:
+        s.cancel(job_id)
+    cancel = time.perf_counter() - start
+    print(f"  cancel      : {cancel / (pending // 10) * 1e6:7.2f} µs/job")
+    print(f"  idle CPU    : {idle_cpu(idle):7.3f} % of a core")
+
+    lateness, done = [], threading.Event()
+    probes = 200
+
+    def probe(due):
+        def fn():
+            lateness.append(time.time() - due)
+            if len(lateness) == probes:
+                done.set()
+        return fn
+
+    base = time.time() + 0.2
+    for i in range(probes):
+        due = base + i * 0.005
+        s.schedule(due, probe(due))
+    done.wait(10)
+    lateness.sort()
+    print(f"  dispatch lag: p50 {statistics.median(lateness) * 1000:6.2f} ms,"
+          f" p99 {lateness[int(len(lateness) * 0.99) - 1] * 1000:6.2f} ms")
+
+
+def bench_schedule_lib(pending: int, idle: float):
+    try:
+        import schedule
+    except ImportError:
+        print("`schedule` not installed: skipping polling baseline")
+        return
+
+    for i in range(pending):
+        schedule.every().day.at(f"{i % 24:02d}:{i % 60:02d}").do(lambda: None)
+
+    def poll():
+        while True:
+            schedule.run_pending()
+            time.sleep(1)
+
+    threading.Thread(target=poll, daemon=True).start()
+    print(f"schedule + 1 s polling, {pending:,} pending")
+    print(f"  idle CPU    : {idle_cpu(idle):7.3f} % of a core")
+    print("  dispatch lag: up to 1000 ms (poll interval)")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    pending = int(args[0]) if args else 100_000
+    idle = float(args[1]) if len(args) > 1 else 3.0
+    bench_heap(pending, idle)
+    bench_schedule_lib(pending, idle)
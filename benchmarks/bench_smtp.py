@@ -0,0 +1,65 @@
+# benchmarks/bench_smtp.py
+"""
+Mail throughput against the local SMTP sink: one connection + login per
+message (the old send_email) vs smtp_pool.Outbox with persistent
+sessions, including a sink that drops every session after 25 messages.
+
+Usage:
+    python benchmarks/bench_smtp.py              # 500 messages, 20 ms handshake
+    python benchmarks/bench_smtp.py 2000 0.05
+"""
+import os
+import smtplib
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smtp_pool import Outbox  # noqa: E402
+from smtp_sink import start_smtp_sink  # noqa: E402
+
+MSG = "Subject: Reminder from AI Agent\r\n\r\ndrink water\r\n"
+
+
+def per_message(port: int, n: int):
+    for _ in range(n):
+        server = smtplib.SMTP("127.0.0.1", port)
+        server.ehlo()
+        server.login("me@example.com", "x")
+        server.sendmail("me@example.com", "you@example.com", MSG)
+        server.quit()
+
+
+def pooled(port: int, n: int, workers: int):
+    outbox = Outbox("127.0.0.1", port, "me@example.com", "x", workers=workers, maxsize=256,
+                    starttls=False)
+    futures = [outbox.submit("me@example.com", "you@example.com", MSG) for _ in range(n)]
+    for f in futures:
+        f.result()
+    outbox.close()
+
+
+def run(label: str, fn, n: int, sink):
+    before = sink.RequestHandlerClass.state.messages
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    assert sink.RequestHandlerClass.state.messages - before == n
+    print(f"  {label:<34} {elapsed:7.2f}s  {n / elapsed:8.1f} msg/s")
+
+
+def main(n: int, handshake: float):
+    sink, port = start_smtp_sink(handshake_delay=handshake)
+    flaky, flaky_port = start_smtp_sink(handshake_delay=handshake, drop_after=25)
+    print(f"{n} messages, {handshake * 1000:.0f} ms handshake per EHLO/AUTH")
+    run("connect + login per message", lambda: per_message(port, n), n, sink)
+    for workers in (1, 4):
+        run(f"Outbox, {workers} worker(s)", lambda: pooled(port, n, workers), n, sink)
+    run("Outbox, 4 workers, drop every 25", lambda: pooled(flaky_port, n, 4), n, flaky)
+    sink.shutdown()
+    flaky.shutdown()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 500, float(args[1]) if len(args) > 1 else 0.02)
@@ -0,0 +1,68 @@
+# benchmarks/bench_speak.py
+"""
+speak.py with the null audio backend: how long a new command waits
+behind a long reply, time to first speech, and what a flood of speech
+does to the queue.
+
+Usage:
+    python benchmarks/bench_speak.py
+
+Speech runs at 175 words per minute, as pyttsx3 is configured, so the
+numbers are real-time. "whole reply" is the old behaviour: one
+say()/runAndWait() for the full text, which nothing can cut short.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("TTS_BACKEND", "null")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import speak  # noqa: E402
+
+REPLY = " ".join(f"This is sentence number {i} of a long chat answer." for i in range(1, 31))
+
+
+def wait_for(text: str, timeout: float = 60.0) -> float:
+    start = time.perf_counter()
+    while text not in speak.engine.spoken:
+        if time.perf_counter() - start > timeout:
+            raise TimeoutError(text)
+        time.sleep(0.001)
+    return time.perf_counter() - start
+
+
+def main():
+    speak.engine = speak.NullAudio()
+    words = len(REPLY.split())
+    print(f"reply: {words} words in {len(speak.split_sentences(REPLY))} sentences "
+          f"(~{words * 60 / speak.RATE:.0f}s of speech)\n")
+
+    # old behaviour: the whole reply is one utterance, so the next one waits all of it
+    print(f"whole reply      : next command speaks after {words * 60 / speak.RATE:6.2f}s")
+
+    start = time.perf_counter()
+    speak.jarvis_say(REPLY)
+    queued = time.perf_counter() - start
+    first = wait_for("This is sentence number 1 of a long chat answer.")
+    time.sleep(1.0)
+    start = time.perf_counter()
+    speak.jarvis_say("Reminder set.", interrupt_current=True)
+    cut_in = wait_for("Reminder set.")
+    speak.speech_queue.join()
+    print(f"sentence queue   : next command speaks after {cut_in:6.2f}s "
+          f"(jarvis_say returned in {queued * 1000:.2f} ms, first sentence after {first * 1000:.1f} ms)")
+
+    # a flood of speech: the queue stays bounded and stale sentences go
+    speak.engine.rate = 6000
+    start = time.perf_counter()
+    for i in range(5000):
+        speak.jarvis_say(f"Status update {i}.")
+    flood = time.perf_counter() - start
+    speak.speech_queue.join()
+    print(f"\n5000 sentences queued in {flood * 1000:.0f} ms (queue bounded at {speak.MAX_QUEUE})")
+    print(f"speech_stats(): {speak.speech_stats()}")
+
+
+if __name__ == "__main__":
+    main()
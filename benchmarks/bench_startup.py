@@ -0,0 +1,92 @@
+# benchmarks/bench_startup.py
+"""
+Cold start of the text assistant: a fresh interpreter imports main.py,
+restores reminders and interprets one rule-based command, the same work
+`python main.py` does before it can answer. Each run is a new process,
+timed from launch to the parsed command, plus a `python -X importtime`
+breakdown of the slowest imports.
+
+Usage:
+    python benchmarks/bench_startup.py              # 20 runs, 100 ms budget
+    python benchmarks/bench_startup.py 50 --check   # exit 1 if the median is over budget
+    python benchmarks/bench_startup.py --budget 80
+
+Runs in a temporary working directory, so memory.db starts empty.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPET = """
+import main
+main.start_reminders()
+actions = main.interpret("remind me to drink water at 10:30")
+assert actions[0]["intent"] == "set_reminder", actions
+"""
+
+
+def run_once(cwd: str, env: dict) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", SNIPPET], cwd=cwd, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def run_once_bare(cwd: str, env: dict) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], cwd=cwd, env=env, check=True)
+    return time.perf_counter() - start
+
+
+def import_breakdown(cwd: str, env: dict, top: int = 10) -> list:
+    """(cumulative µs, module) for the slowest top-level imports"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", SNIPPET], cwd=cwd, env=env,
+                          check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth <= 1:  # the snippet's own imports and what they pull in directly
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main(runs: int, budget_ms: float, check: bool) -> int:
+    env = dict(os.environ, PYTHONPATH=REPO, OPENAI_API_KEY="")
+    with tempfile.TemporaryDirectory() as cwd:
+        run_once(cwd, env)  # warm the OS page cache and .pyc files
+        times = sorted(run_once(cwd, env) for _ in range(runs))
+        bare = statistics.median(
+            run_once_bare(cwd, env) for _ in range(max(3, runs // 4))
+        )
+        breakdown = import_breakdown(cwd, env)
+
+    median = statistics.median(times) * 1000
+    print(f"{runs} cold starts (import main + restore reminders + one rule-based command)")
+    print(f"  median {median:6.1f} ms   min {times[0] * 1000:6.1f} ms   max {times[-1] * 1000:6.1f} ms")
+    print(f"  bare interpreter start: {bare * 1000:.1f} ms   budget: {budget_ms:.0f} ms")
+    print("\n  slowest imports (cumulative):")
+    for us, name in breakdown:
+        print(f"    {us / 1000:7.1f} ms  {name}")
+
+    if median > budget_ms:
+        print(f"\n⚠️ median cold start {median:.1f} ms is over the {budget_ms:.0f} ms budget")
+        return 1 if check else 0
+    return 0
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("runs", nargs="?", type=int, default=20)
+    ap.add_argument("--budget", type=float, default=100.0, help="median cold start budget in ms")
+    ap.add_argument("--check", action="store_true", help="exit 1 when over budget")
+    args = ap.parse_args()
+    sys.exit(main(args.runs, args.budget, args.check))
@@ -0,0 +1,98 @@
+# benchmarks/bench_streamlit_rerun.py
+"""
+Streamlit rerun time with a long chat history, using Streamlit's
+AppTest harness (no browser). app.py with its ring-buffer history is
+compared against the original pattern of keeping every message in
+st.session_state.messages and rendering all of them on each rerun.
+
+Usage:
+    python benchmarks/bench_streamlit_rerun.py                 # 10k messages
+    python benchmarks/bench_streamlit_rerun.py 1000 10000 50000
+
+Runs in a temporary working directory (the paged history goes to its
+memory.db). Needs streamlit installed.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.runtime.scriptrunner_utils import script_run_context  # noqa: E402
+
+# setting session_state from outside a script run logs a harmless warning
+script_run_context._LOGGER.addFilter(lambda record: "ScriptRunContext" not in record.getMessage())
+
+LEGACY_APP = '''
+import streamlit as st
+if "messages" not in st.session_state:
+    st.session_state.messages = []
+for msg in st.session_state.messages:
+    with st.chat_message(msg["role"]):
+        st.write(msg["content"])
+st.chat_input("Ask Jarvis anything...")
+'''
+
+RUNS = 5
+
+
+def turn(i: int) -> tuple:
+    return ("user" if i % 2 == 0 else "assistant",
+            f"message {i}: remind me to drink water at 10:30 and email me the report")
+
+
+def timed_reruns(at: AppTest) -> float:
+    at.run(timeout=600)  # first run builds cached resources
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        at.run(timeout=600)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def legacy(n: int) -> tuple[float, int]:
+    at = AppTest.from_string(LEGACY_APP, default_timeout=600)
+    tracemalloc.start()
+    at.session_state["messages"] = [dict(zip(("role", "content"), turn(i))) for i in range(n)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return timed_reruns(at), size
+
+
+def current(n: int, older_pages: int = 0) -> tuple[float, int]:
+    from chat_history import ChatHistory, PAGE_SIZE
+
+    at = AppTest.from_file(os.path.join(REPO, "app.py"), default_timeout=600)
+    tracemalloc.start()
+    history = ChatHistory(f"bench-{n}-{older_pages}")
+    for i in range(n):
+        history.append(*turn(i))
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    at.session_state["history"] = history
+    at.session_state["older_count"] = older_pages * PAGE_SIZE
+    return timed_reruns(at), size
+
+
+def main(sizes: list):
+    os.environ.pop("OPENAI_API_KEY", None)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        print(f"median of {RUNS} reruns; memory = history held by the session")
+        print(f"{'messages':>9}  {'all in session_state':>22}  {'ring buffer':>16}  {'+2 older pages':>16}")
+        for n in sizes:
+            old_t, old_mem = legacy(n)
+            new_t, new_mem = current(n)
+            paged_t, _ = current(n, older_pages=2)
+            print(f"{n:>9,}  {old_t * 1000:9.1f} ms {old_mem / 1e6:6.2f} MB  "
+                  f"{new_t * 1000:6.1f} ms {new_mem / 1e6:5.2f} MB  {paged_t * 1000:13.1f} ms")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000])
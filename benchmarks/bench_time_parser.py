@@ -0,0 +1,176 @@
+# benchmarks/bench_time_parser.py
+"""
+Throughput of time_parser.parse() on a corpus of reminder time phrases,
+next to the old clock-only regex parser (intent_agent.parse_time_from_text
+before time_parser, which understood only "9am" / "23:20").
+
+Usage:
+    python benchmarks/bench_time_parser.py            # 1M expressions
+    python benchmarks/bench_time_parser.py 200000
+
+Every corpus entry is checked first: each one must parse, and the ones
+with a known answer must resolve to it against a fixed `now`. Words that
+only look like times must not parse, and reminder commands must split
+into the expected time slot and message. Recurring reminders must keep
+their clock time (daily, weekly) or their interval (hourly, "<n>s")
+across a DST change. The run exits non-zero if
+throughput (best of three passes) is below TARGET expressions/s.
+"""
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# the corpus is in local time; a zone with DST lets check() cover the
+# clocks going back on 25 Oct 2026
+if hasattr(time, "tzset"):
+    os.environ["TZ"] = "Europe/London"
+    time.tzset()
+
+import intent_agent  # noqa: E402
+import reminder_agent  # noqa: E402
+import time_parser  # noqa: E402
+
+TARGET = 200_000    # expressions per second, one core
+
+# Sunday 18 Oct 2026, 10:30 local
+NOW = datetime(2026, 10, 18, 10, 30).timestamp()
+
+# phrase -> (local due time, recurrence); None where only "it parses" is checked
+CORPUS = {
+    "in 20 minutes":            ("2026-10-18 10:50", None),
+    "in an hour":               ("2026-10-18 11:30", None),
+    "in half an hour":          ("2026-10-18 11:00", None),
+    "in twenty five minutes":   ("2026-10-18 10:55", None),
+    "in 2 hours and 15 minutes": ("2026-10-18 12:45", None),
+    "tomorrow at 9":            ("2026-10-19 09:00", None),
+    "tomorrow morning":         ("2026-10-19 09:00", None),
+    "day after tomorrow at 6pm": ("2026-10-20 18:00", None),
+    "tonight at 8":             ("2026-10-18 20:00", None),
+    "at 7 in the evening":      ("2026-10-18 19:00", None),
+    "at nine thirty pm":        ("2026-10-18 21:30", None),
+    "every monday 7pm":         ("2026-10-19 19:00", "weekly"),
+    "every day at 9am":         ("2026-10-19 09:00", "daily"),
+    "every 20 minutes":         ("2026-10-18 10:50", "1200s"),
+    "on fridays at noon":       ("2026-10-23 12:00", "weekly"),
+    "on the 5th":               ("2026-11-05 09:00", None),
+    "on the 31st at 3pm":       ("2026-10-31 15:00", None),
+    "march 5th at 3pm":         ("2027-03-05 15:00", None),
+    "next wednesday at 10:15":  ("2026-10-21 10:15", None),
+    "in 3 days at 9am":         ("2026-10-21 09:00", None),
+    "23:20":                    ("2026-10-18 23:20", None),
+    "9:05 pm":                  ("2026-10-18 21:05", None),
+    "at 9am":                   ("2026-10-19 09:00", None),
+    "at 7 pm email me":         ("2026-10-18 19:00", None),
+    "in a second":              ("2026-10-18 10:30", None),
+    "at 5 tomorrow":            ("2026-10-19 05:00", None),
+}
+
+# (rule, local due time, local time of the next firing after it): across 25 Oct
+# daily and weekly keep the clock time, fixed-second rules keep the interval
+RECURRING = [
+    ("daily",  "2026-10-24 09:00", "2026-10-25 09:00"),
+    ("weekly", "2026-10-19 19:00", "2026-10-26 19:00"),
+    ("daily",  "2026-10-20 09:00", "2026-10-27 09:00"),    # a week of missed firings
+    ("hourly", "2026-10-25 01:30", "2026-10-25 01:30"),    # 01:30 BST, then 01:30 GMT
+    ("7200s",  "2026-10-25 00:30", "2026-10-25 01:30"),
+]
+
+# no time expression in these
+NOT_TIMES = [
+    "the second invoice",
+    "a day pass",
+    "stop by 3 shops",
+    "read chapter 2",
+]
+
+# command -> (time slot, message) from intent_agent's rule grammar
+REMINDERS = {
+    "remind me to call about the second invoice at 9pm": ("21:00", "call about the second invoice"),
+    "remind me to pick up a day pass at 6pm":            ("18:00", "pick up a day pass"),
+    "remind me to stop by 3 shops tomorrow":             ("tomorrow", "stop by 3 shops"),
+    "remind me to call mom at 5":                        ("at 5", "call mom"),
+    "remind me to read chapter 2 at 9pm":                ("21:00", "read chapter 2"),
+    "remind me to call mom tomorrow at 9":               ("tomorrow at 9", "call mom"),
+    "remind me to stretch every day at 9am":             ("every day at 9am", "stretch"),
+    "remind me to pay rent on the 5th at 3pm":           ("on the 5th at 3pm", "pay rent"),
+    "remind me at 9am tomorrow to stretch":              ("at 9am tomorrow", "stretch"),
+    "remind me to pick up a day pass tomorrow":          ("tomorrow", "pick up a day pass"),
+}
+
+
+# ================================================================
+# Original clock-only parser (pre-time_parser, renamed)
+# ================================================================
+
+_CLOCK_RE = re.compile(r"\b(\d{1,2}):(\d{2})(am|pm)?\b")
+_HOUR_AMPM_RE = re.compile(r"\b(\d{1,2})(am|pm)\b")
+
+
+def legacy_parse_time_from_text(text: str) -> str | None:
+    t = text.lower().strip().replace(" ", "")
+    m = _CLOCK_RE.search(t)
+    if m:
+        return f"{int(m.group(1)):02d}:{m.group(2)}"
+    m = _HOUR_AMPM_RE.search(t)
+    if m:
+        return f"{int(m.group(1)):02d}:00"
+    return None
+
+
+def check():
+    for phrase, expected in CORPUS.items():
+        when = time_parser.parse(phrase, NOW)
+        assert when is not None, phrase
+        got = (f"{datetime.fromtimestamp(when.due_at):%Y-%m-%d %H:%M}", when.recurrence)
+        assert got == expected, f"{phrase!r}: expected {expected}, got {got}"
+    for phrase in NOT_TIMES:
+        assert time_parser.parse(phrase, NOW) is None, phrase
+    if hasattr(time, "tzset"):
+        for rule, due, expected in RECURRING:
+            due_at = datetime.strptime(due, "%Y-%m-%d %H:%M").timestamp()
+            now = max(due_at, datetime.strptime(expected, "%Y-%m-%d %H:%M").timestamp() - 60)
+            got = f"{datetime.fromtimestamp(reminder_agent._advance(due_at, rule, now)):%Y-%m-%d %H:%M}"
+            assert got == expected, f"{rule} after {due}: expected {expected}, got {got}"
+    for command, expected in REMINDERS.items():
+        slots = intent_agent._rule_based_parse(command)[0]["slots"]
+        got = (slots["time"], slots["message"])
+        assert got == expected, f"{command!r}: expected {expected}, got {got}"
+
+
+def bench(fn, corpus, rounds: int = 3) -> float:
+    """Best of `rounds` passes, so one slow pass on a busy box isn't the figure"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(n: int) -> int:
+    check()
+    phrases = list(CORPUS)
+    corpus = (phrases * (n // len(phrases) + 1))[:n]
+
+    understood = sum(legacy_parse_time_from_text(p) is not None for p in phrases)
+    old = bench(legacy_parse_time_from_text, corpus)
+    new = bench(lambda text: time_parser.parse(text, NOW), corpus)
+
+    print(f"{n:,} expressions ({len(phrases)} distinct)")
+    print(f"  clock regexes : {n / old:>10,.0f} /s   understands {understood}/{len(phrases)} (clock part only)")
+    print(f"  time_parser   : {n / new:>10,.0f} /s   understands {len(phrases)}/{len(phrases)}")
+    print(f"  per parse     : {new / n * 1e6:>10.2f} µs")
+    if n / new < TARGET:
+        print(f"❌ below target of {TARGET:,} /s")
+        return 1
+    print(f"✅ above target of {TARGET:,} /s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
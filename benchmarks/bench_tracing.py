@@ -0,0 +1,73 @@
+# benchmarks/bench_tracing.py
+"""
+Cost of the tracing layer on the interpret() hot path.
+
+Times intent_agent._rule_based_parse (the innermost traced call) three
+ways: the undecorated function, the traced wrapper with tracing off, and
+with tracing on (histograms only, no file). Then prints the span table
+for a short interpret() run.
+
+Usage:
+    python benchmarks/bench_tracing.py           # 100k calls, best of 5
+    python benchmarks/bench_tracing.py 1000000
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import intent_agent  # noqa: E402
+import tracing  # noqa: E402
+
+COMMANDS = [
+    "what is software engineering",
+    "send email to someone@example.com hello how are you",
+    "remind me to drink water at 9am",
+    "remind me at 23:20 to stretch",
+]
+
+
+def per_call(fn, n: int, repeat: int = 5) -> float:
+    """Best of `repeat` runs, in µs per call"""
+    corpus = (COMMANDS * (n // len(COMMANDS) + 1))[:n]
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best / n * 1e6
+
+
+def main(n: int):
+    raw = intent_agent._rule_based_parse.__wrapped__
+    wrapped = intent_agent._rule_based_parse
+
+    tracing.disable()
+    base = per_call(raw, n)
+    off = per_call(wrapped, n)
+    tracing.enable()
+    on = per_call(wrapped, n)
+    tracing.disable()
+
+    print(f"_rule_based_parse, {n:,} calls")
+    print(f"  undecorated : {base:6.2f} µs/call")
+    print(f"  tracing off : {off:6.2f} µs/call  (+{(off - base) * 1000:5.0f} ns)")
+    print(f"  tracing on  : {on:6.2f} µs/call  (+{(on - base) * 1000:5.0f} ns)")
+
+    tracing.reset()
+    tracing.enable()
+    with contextlib.redirect_stdout(io.StringIO()):   # interpret() prints its path
+        for _ in range(1000):
+            for text in COMMANDS:
+                intent_agent.interpret(text)
+    tracing.disable()
+    print()
+    print(tracing.summary())
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
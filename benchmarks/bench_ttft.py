@@ -0,0 +1,54 @@
+# benchmarks/bench_ttft.py
+"""
+Time-to-first-token of chat_reply_stream() vs the blocking chat_reply(),
+against the local stub endpoint streaming one word every --token-delay.
+
+Usage:
+    python benchmarks/bench_ttft.py              # 10 runs, 200-word reply, 10 ms/word
+    python benchmarks/bench_ttft.py 20 400 0.005
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_openai import start_stub_server  # noqa: E402
+
+
+def main(runs: int, words: int, token_delay: float):
+    reply = " ".join(f"word{i}." if i % 12 == 11 else f"word{i}" for i in range(words))
+    server, url = start_stub_server(token_delay=token_delay, reply=reply)
+    os.environ["OPENAI_BASE_URL"] = url
+    os.environ["OPENAI_API_KEY"] = "stub"
+
+    import chat_agent
+
+    blocking, first, full = [], [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        chat_agent.chat_reply("hi")
+        blocking.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        stream = chat_agent.chat_reply_stream("hi")
+        next(stream)
+        first.append(time.perf_counter() - start)
+        for _ in stream:
+            pass
+        full.append(time.perf_counter() - start)
+
+    ms = lambda xs: f"{statistics.median(xs) * 1000:8.1f} ms"  # noqa: E731
+    print(f"{runs} runs, {words}-word reply, {token_delay * 1000:.0f} ms/word (median)")
+    print(f"  chat_reply (first visible text) : {ms(blocking)}")
+    print(f"  chat_reply_stream first token   : {ms(first)}")
+    print(f"  chat_reply_stream full reply    : {ms(full)}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 10,
+         int(args[1]) if len(args) > 1 else 200,
+         float(args[2]) if len(args) > 2 else 0.01)
@@ -0,0 +1,67 @@
+# benchmarks/bench_unique_names.py
+"""
+Naming N files that all share one name in the same target folder:
+file_agent._NameIndex (O(1) amortized, create-or-fail) vs the original
+exists()-probing loop, which costs O(N^2) stat calls in total.
+
+Usage:
+    python benchmarks/bench_unique_names.py              # 50k names, probing loop up to 5k
+    python benchmarks/bench_unique_names.py 50000 10000
+
+The probing loop is quadratic, so it only runs up to the second size
+given; its 50k figure is extrapolated from that.
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_agent import _NameIndex  # noqa: E402
+from bench_file_agent import legacy_unique_destination  # noqa: E402
+
+
+def make_sources(folder: str, n: int) -> list[str]:
+    os.makedirs(folder)
+    paths = [os.path.join(folder, f"src_{i}") for i in range(n)]
+    for p in paths:
+        open(p, "wb").close()
+    return paths
+
+
+def probing(target: str, sources: list[str]) -> float:
+    start = time.perf_counter()
+    for src in sources:
+        os.rename(src, legacy_unique_destination(Path(target), "photo.jpg"))
+    return time.perf_counter() - start
+
+
+def indexed(target: str, sources: list[str]) -> float:
+    start = time.perf_counter()
+    index = _NameIndex(target)
+    for src in sources:
+        index.place(src, "photo.jpg")
+    return time.perf_counter() - start
+
+
+def main(n: int, probe_max: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        a, b = os.path.join(tmp, "probe"), os.path.join(tmp, "index")
+        os.makedirs(a)
+        os.makedirs(b)
+        m = min(n, probe_max)
+        t_probe = probing(a, make_sources(os.path.join(tmp, "src_probe"), m))
+        t_index = indexed(b, make_sources(os.path.join(tmp, "src_index"), n))
+        assert len(os.listdir(b)) == n
+    est = t_probe * (n / m) ** 2
+    print(f"{n:,} files named photo.jpg into one folder")
+    print(f"  exists() probing : {t_probe:8.2f}s for {m:,}"
+          + (f"  (~{est:,.0f}s extrapolated to {n:,})" if m < n else ""))
+    print(f"  _NameIndex       : {t_index:8.2f}s for {n:,}  ({t_index / n * 1e6:.1f} µs/name)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(args[0] if args else 50_000, args[1] if len(args) > 1 else 5_000)
@@ -0,0 +1,187 @@
+# benchmarks/bench_voice.py
+"""
+The streaming voice path (ring buffer -> VAD -> recognizer) against the
+old fixed 4-second recording windows, run offline from WAV files with a
+stub recognizer that records what it is sent.
+
+Usage:
+    python benchmarks/bench_voice.py               # synthetic 10-minute recording
+    python benchmarks/bench_voice.py a.wav b.wav   # your own 16-bit WAVs
+
+The synthetic recording has voiced "utterances" (harmonics of a 120-220 Hz
+pitch in 150-400 ms syllables with short pauses) separated by 1.2-6 s of
+room noise and short clicks; the true utterance boundaries are known, so
+detection and endpoint delay can be scored. For your own files only the
+segments and costs are reported.
+"""
+import math
+import os
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import voice_agent  # noqa: E402
+from audio_stream import SAMPLE_RATE, SILENCE_MS, RingBuffer, speech_segments, wav_blocks  # noqa: E402
+
+OLD_WINDOW_S = 4.0
+
+
+def synth_recording(path: str, seconds: float, rng: np.random.Generator) -> list:
+    """Write a WAV and return the (start, end) seconds of each utterance"""
+    n = int(seconds * SAMPLE_RATE)
+    audio = rng.normal(0, 32768 * 10 ** (-55 / 20), n)   # room noise at -55 dBFS
+    truth, t = [], 1.0
+    while True:
+        length = rng.uniform(0.8, 3.0)
+        if t + length > seconds - 1:
+            break
+        start = t
+        while t < start + length:
+            syl = rng.uniform(0.15, 0.4)
+            i, j = int(t * SAMPLE_RATE), int((t + syl) * SAMPLE_RATE)
+            tt = np.arange(j - i) / SAMPLE_RATE
+            pitch = rng.uniform(120, 220)
+            voice = sum(np.sin(2 * math.pi * pitch * h * tt) / h for h in range(1, 6))
+            audio[i:j] += voice * np.hanning(j - i) * 32768 * 10 ** (rng.uniform(-26, -14) / 20)
+            t += syl + rng.uniform(0.03, 0.2)
+        truth.append((start, t))
+        t += rng.uniform(1.2, 6.0)
+        if rng.random() < 0.3:   # a click in the gap
+            c = int((t - 0.6) * SAMPLE_RATE)
+            audio[c:c + 400] += rng.normal(0, 8000, 400)
+
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(np.clip(audio, -32768, 32767).astype(np.int16).tobytes())
+    return truth
+
+
+class StubRecognizer:
+    """Stands in for transcribe(): counts calls and audio seconds"""
+
+    def __init__(self, replies=None):
+        self.calls = 0
+        self.audio_s = 0.0
+        self.replies = replies or {}
+
+    def __call__(self, audio) -> str:
+        self.calls += 1
+        self.audio_s += len(audio) / SAMPLE_RATE
+        return self.replies.get(self.calls, f"command {self.calls}")
+
+
+def segment_file(path: str):
+    """[(segment, emitted_at_s)], wall seconds taken, audio seconds"""
+    position = 0
+    segments = []
+
+    def counted():
+        nonlocal position
+        for block in wav_blocks(path):
+            position += len(block)
+            yield block
+
+    start = time.perf_counter()
+    for seg in speech_segments(counted()):
+        emitted = position / SAMPLE_RATE
+        segments.append((seg, emitted))
+    return segments, time.perf_counter() - start, position / SAMPLE_RATE
+
+
+def score(truth: list, found: list) -> tuple[int, int, list]:
+    """(hits, false segments, endpoint delays) matching segments to utterances by overlap"""
+    hits, delays, false = 0, [], 0
+    for start, end, emitted in found:
+        match = [(s, e) for s, e in truth if s < end and e > start]
+        if not match:
+            false += 1
+            continue
+        hits += 1
+        delays.append(emitted - match[-1][1])
+    return hits, false, delays
+
+
+def report(path: str, truth=None):
+    segments, wall, duration = segment_file(path)
+    found = []
+    for seg, emitted in segments:
+        # roughly: the speech ended SILENCE_MS before the segment was emitted
+        end = emitted - SILENCE_MS / 1000
+        found.append((end - len(seg) / SAMPLE_RATE, end, emitted))
+
+    stub = StubRecognizer()
+    for seg, _ in segments:
+        stub(seg)
+    old_calls = math.ceil(duration / OLD_WINDOW_S)
+
+    print(f"{os.path.basename(path)}: {duration:.0f}s of audio, segmented in {wall * 1000:.0f} ms "
+          f"({duration / wall:,.0f}x realtime)")
+    print(f"  fixed {OLD_WINDOW_S:.0f}s windows : {old_calls:4d} recognizer calls, {duration:7.1f}s of audio sent, "
+          f"up to {OLD_WINDOW_S:.1f}s before a command is even recorded")
+    print(f"  VAD segments     : {stub.calls:4d} recognizer calls, {stub.audio_s:7.1f}s of audio sent "
+          f"({stub.audio_s / duration:.0%})")
+    if truth:
+        hits, false, delays = score(truth, found)
+        utterances_hit = len({e for s, e in truth for fs, fe, _ in found if s < fe and e > fs})
+        print(f"  utterances {len(truth)}: {utterances_hit} detected, {false} false segments, "
+              f"{hits - utterances_hit} extra splits")
+        print(f"  endpoint delay after speech ends: mean {np.mean(delays) * 1000:.0f} ms, "
+              f"max {np.max(delays) * 1000:.0f} ms")
+
+
+def bench_ring():
+    """Cost of the audio callback's work (one ring write) and of a block read"""
+    ring = RingBuffer(SAMPLE_RATE * 10)
+    chunk = np.zeros(160, dtype=np.int16)   # 10 ms callbacks
+    writes = 60_000
+
+    start = time.perf_counter()
+    for i in range(writes):
+        ring.write(chunk)
+        if i % 10 == 9:
+            ring.read(SAMPLE_RATE // 10)
+    elapsed = time.perf_counter() - start
+    per_write = elapsed / writes * 1e6
+    print(f"ring buffer: {per_write:.1f} µs per 10 ms callback incl. reads "
+          f"({per_write / 10_000:.3%} of the callback period), {ring.overruns} samples overrun")
+
+
+def bench_wake(path: str, truth: list):
+    """Wake word on the 3rd utterance: how far into the audio it fires"""
+    stub = StubRecognizer({3: "hey jarvis"})
+    blocks = list(wav_blocks(path))
+    consumed = 0
+
+    def counted():
+        nonlocal consumed
+        for block in blocks:
+            consumed += len(block)
+            yield block
+
+    voice_agent.listen_for_wake_word(counted(), stub)
+    print(f"  wake word at {truth[2][1]:.1f}s recognised at {consumed / SAMPLE_RATE:.1f}s "
+          f"after {stub.calls} recognizer calls")
+
+
+def main(paths: list):
+    bench_ring()
+    if paths:
+        for path in paths:
+            report(path)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic.wav")
+        truth = synth_recording(path, 600, np.random.default_rng(1))
+        report(path, truth)
+        bench_wake(path, truth)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
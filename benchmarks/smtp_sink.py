@@ -0,0 +1,105 @@
+# benchmarks/smtp_sink.py
+"""
+Minimal local SMTP server that accepts and discards mail (an
+aiosmtpd-style stand-in that only needs the standard library).
+
+Run standalone:
+    python benchmarks/smtp_sink.py --port 2525 --handshake-delay 0.05
+
+then point the agents at it:
+    SMTP_HOST=127.0.0.1 SMTP_PORT=2525 SMTP_STARTTLS=0 \
+        GMAIL_EMAIL=me@example.com GMAIL_APP_PASSWORD=x python main.py
+
+or start it in-process with start_smtp_sink() from another benchmark.
+--handshake-delay is added to EHLO and AUTH to mimic the TLS + login
+cost of a real provider. No STARTTLS is advertised, so clients have to
+opt out of TLS (SMTP_STARTTLS=0 / Outbox(..., starttls=False)).
+"""
+import argparse
+import socketserver
+import sys
+import threading
+import time
+
+
+class SinkState:
+    def __init__(self, handshake_delay: float = 0.0, drop_after: int = 0):
+        self.handshake_delay = handshake_delay
+        self.drop_after = drop_after  # close each session after N messages (0 = never)
+        self.messages = 0
+        self.sessions = 0
+        self.lock = threading.Lock()
+
+
+class SinkHandler(socketserver.StreamRequestHandler):
+    disable_nagle_algorithm = True
+    state: SinkState = None
+
+    def _reply(self, line: str):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        state = self.state
+        with state.lock:
+            state.sessions += 1
+        in_session = 0
+        self._reply("220 sink ESMTP ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            cmd = line.decode(errors="replace").strip().upper()
+            if cmd.startswith(("EHLO", "HELO")):
+                time.sleep(state.handshake_delay)
+                self._reply("250-sink")
+                self._reply("250-AUTH PLAIN LOGIN")
+                self._reply("250 8BITMIME")
+            elif cmd.startswith("AUTH"):
+                time.sleep(state.handshake_delay)
+                self._reply("235 2.7.0 Authentication successful")
+            elif cmd.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                self._reply("250 OK")
+            elif cmd == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                with state.lock:
+                    state.messages += 1
+                in_session += 1
+                self._reply("250 OK queued")
+                if state.drop_after and in_session >= state.drop_after:
+                    return  # simulate the server dropping the connection
+            elif cmd == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def start_smtp_sink(port: int = 0, **state_kwargs):
+    """Start the sink on a daemon thread; returns (server, port)."""
+    handler = type("BoundSinkHandler", (SinkHandler,), {"state": SinkState(**state_kwargs)})
+    server = _Server(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.server_address[1]
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--port", type=int, default=2525)
+    ap.add_argument("--handshake-delay", type=float, default=0.0)
+    ap.add_argument("--drop-after", type=int, default=0)
+    args = ap.parse_args()
+
+    server, port = start_smtp_sink(args.port, handshake_delay=args.handshake_delay, drop_after=args.drop_after)
+    print(f"SMTP sink on 127.0.0.1:{port}  (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
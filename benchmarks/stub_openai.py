@@ -0,0 +1,163 @@
+# benchmarks/stub_openai.py
+"""
+Local stand-in for the OpenAI chat-completions endpoint.
+
+Run standalone:
+    python benchmarks/stub_openai.py --port 8765 --latency 0.05 --fail-first 2
+
+then point the agents at it:
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub python main.py
+
+or start it in-process with start_stub_server() from another benchmark.
+
+Replies:
+  - intent-extractor requests get a JSON array with a chat intent
+    (or one such array per command for batched requests)
+  - anything else gets "stub reply: <user prompt>", or the fixed `reply`
+    passed to start_stub_server()
+  - "stream": true requests get the reply as SSE chunks, one word each,
+    --token-delay seconds apart
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubState:
+    def __init__(self, latency: float = 0.0, fail_first: int = 0, fail_status: int = 429,
+                 token_delay: float = 0.0, reply: str | None = None):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.reply = reply
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.requests = 0
+        self.lock = threading.Lock()
+
+
+def _reply_for(messages: list, fixed: str | None = None) -> str:
+    system = next((m["content"] for m in messages if m["role"] == "system"), "")
+    user = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+    if "intent extractor" not in system:
+        return fixed or f"stub reply: {user}"
+    if "one entry per command" in system:
+        return json.dumps([[{"intent": "chat", "slots": {"query": q}}] for q in json.loads(user)])
+    return json.dumps([{"intent": "chat", "slots": {"query": user}}])
+
+
+def _completion(content: str, model: str) -> dict:
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+def _chunk(delta: dict, model: str, finish_reason=None) -> dict:
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection pooling is visible
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    state: StubState = None
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        state = self.state
+        with state.lock:
+            state.requests += 1
+            failing = state.requests <= state.fail_first
+        if state.latency:
+            time.sleep(state.latency)
+        if failing:
+            self._send_json(state.fail_status, {"error": {"message": "stub failure", "type": "stub"}})
+            return
+
+        content = _reply_for(body.get("messages", []), state.reply)
+        model = body.get("model", "stub")
+        if body.get("stream"):
+            self._send_stream(content, model)
+        else:
+            # same generation time as streaming, just delivered all at once
+            time.sleep(state.token_delay * len(content.split(" ")))
+            self._send_json(200, _completion(content, model))
+
+    def _send_event(self, payload: str):
+        # one SSE event per HTTP chunk (chunked transfer encoding)
+        data = f"data: {payload}\n\n".encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_stream(self, content: str, model: str):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._send_event(json.dumps(_chunk({"role": "assistant", "content": ""}, model)))
+        for i, word in enumerate(content.split(" ")):
+            if self.state.token_delay:
+                time.sleep(self.state.token_delay)
+            self._send_event(json.dumps(_chunk({"content": word if i == 0 else " " + word}, model)))
+        self._send_event(json.dumps(_chunk({}, model, "stop")))
+        self._send_event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def start_stub_server(port: int = 0, **state_kwargs):
+    """Start the stub on a daemon thread; returns (server, base_url)."""
+    handler = type("BoundStubHandler", (StubHandler,), {"state": StubState(**state_kwargs)})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds added to each response")
+    ap.add_argument("--fail-first", type=int, default=0, help="answer the first N requests with an error")
+    ap.add_argument("--fail-status", type=int, default=429)
+    ap.add_argument("--token-delay", type=float, default=0.0, help="seconds between streamed words")
+    args = ap.parse_args()
+
+    server, url = start_stub_server(args.port, latency=args.latency, fail_first=args.fail_first,
+                                    fail_status=args.fail_status, token_delay=args.token_delay)
+    print(f"stub OpenAI endpoint on {url}  (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,30 @@
+# benchmarks/stub_recognizer.py
+"""
+A speech_recognizers backend that needs no model and no network, for
+benchmarks:
+
+    PooledRecognizer("stub_recognizer:stub_backend", load_s=1.0)
+
+Decoding sleeps like a local model would: a fixed cost per worker call
+plus a cost per second of audio, after a one-off model load when the
+worker starts. Each clip comes back as "clip <n samples>".
+"""
+import time
+
+SAMPLE_RATE = 16000
+
+
+def stub_backend(load_s: float = 0.5, call_ms: float = 40.0, per_second_ms: float = 50.0,
+                 fail: bool = False, fail_load: bool = False):
+    time.sleep(load_s)
+    if fail_load:
+        raise OSError("model directory not found")   # kills the worker: the pool breaks
+
+    def decode(clips: list, sample_rate: int) -> list:
+        if fail:
+            raise OSError("model files missing")
+        audio_s = sum(len(c) for c in clips) / 2 / sample_rate
+        time.sleep((call_ms + per_second_ms * audio_s) / 1000)
+        return [f"clip {len(c) // 2}" for c in clips]
+
+    return decode
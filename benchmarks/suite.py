@@ -0,0 +1,406 @@
+# benchmarks/suite.py
+"""
+End-to-end benchmark suite with stored baselines.
+
+Each workload runs in its own subprocess, in a scratch directory (so
+memory.db and friends are fresh), against local stand-ins:
+  - benchmarks/smtp_sink.py for SMTP (SMTP_HOST / SMTP_PORT point at it)
+  - benchmarks/stub_openai.py for the LLM (OPENAI_BASE_URL points at it)
+  - generated directory trees for the file organizer
+
+Workloads (→ metrics):
+  interpret       → interpret_rule   intent_agent.interpret on rule-matched commands
+  interpret_llm   → interpret_llm    intent_agent.interpret falling back to the stub LLM
+  chat_reply      → chat_reply       chat_agent.chat_reply through the stub LLM
+  dispatch        → dispatch         dispatcher.submit with mixed reminder / email actions at once
+  send_email      → send_email       email_agent.handle_send_email against the SMTP sink
+  organize        → organize_run     file_agent.organize_files on fresh flat trees (ops = trees)
+  reminders       → reminder_add     reminder_agent.set_reminder_with_email, natural-language times
+                    reminder_cancel  reminder_agent.cancel_reminder
+  memory          → memory_put       memory_agent.save_memory
+                    memory_get       memory_agent.get_memory
+                    memory_recall    memory_agent.recall_memory (needs numpy)
+
+Reported per metric: throughput, p50 / p99 latency and the workload's peak
+RSS. An op is one call, except organize_run where it is one whole tree
+of files (organize_files has no per-file timing). Workloads whose
+optional dependency (openai, numpy) isn't installed are skipped.
+
+Usage:
+    python benchmarks/suite.py --save            # run and store the results as the new baseline
+    python benchmarks/suite.py                   # run and compare with the baseline
+    python benchmarks/suite.py --quick           # ~10x smaller workloads
+    python benchmarks/suite.py --only dispatch,organize
+    python benchmarks/suite.py --tolerance 0.3   # allowed slowdown before a run fails
+
+Baselines are machine-specific: keep one per machine (--baseline PATH,
+default benchmarks/baseline.json). A comparison run exits 1 if any metric
+lost more than --tolerance of its throughput, its p99 grew by more than
+that, or peak RSS grew by more than --rss-tolerance. p99 is only compared
+for metrics with at least P99_MIN_OPS ops (not organize_run's 10 trees,
+nor most --quick metrics): below that it is the single slowest sample. It also exits 1
+when there is no baseline for its scale yet (or a metric is missing from
+it): nothing was compared, so nothing passed.
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+P99_FLOOR_MS = 0.05     # p99 changes smaller than this are noise, not regressions
+P99_MIN_OPS = 100       # with fewer samples p99 is just the slowest one: throughput only
+
+WORKLOADS = {}          # name -> (fn(scale) -> {metric: (latencies, ops, wall)}, required module)
+
+
+def workload(name: str, requires: str | None = None):
+    def register(fn):
+        WORKLOADS[name] = (fn, requires)
+        return fn
+    return register
+
+
+def _available(module: str | None) -> bool:
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def _timed(fn, items) -> tuple[list, float]:
+    """Call fn(item) for each item; (per-call latencies, total wall seconds)"""
+    latencies = []
+    start = time.perf_counter()
+    for item in items:
+        t = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - t)
+    return latencies, time.perf_counter() - start
+
+
+# ================================================================
+# Stand-ins (started inside the worker process)
+# ================================================================
+
+def _start_smtp():
+    from smtp_sink import start_smtp_sink
+    server, port = start_smtp_sink()
+    os.environ.update(SMTP_HOST="127.0.0.1", SMTP_PORT=str(port), SMTP_STARTTLS="0",
+                      GMAIL_EMAIL="bench@example.com", GMAIL_APP_PASSWORD="x")
+    return server
+
+
+def _start_llm():
+    from stub_openai import start_stub_server
+    server, url = start_stub_server()
+    os.environ.update(OPENAI_BASE_URL=url, OPENAI_API_KEY="stub")
+    return server
+
+
+# ================================================================
+# Workloads
+# ================================================================
+
+RULE_COMMANDS = [
+    "what is software engineering",
+    "send email to someone@example.com hello how are you",
+    "send happy birthday to someone@example.com",
+    "remind me to drink water at 9am",
+    "remind me at 23:20 to stretch",
+    "remind me to call mom tomorrow at 9",
+    "remind me every monday 7pm to take out the trash email me",
+]
+
+REMINDER_TIMES = ["09:00", "in 20 minutes", "tomorrow at 9", "every monday 7pm",
+                  "on the 5th", "every day at 6:30pm", "tonight at 8"]
+
+
+@workload("interpret")
+def bench_interpret(scale: float) -> dict:
+    import intent_agent
+    n = int(20_000 * scale)
+    commands = (RULE_COMMANDS * (n // len(RULE_COMMANDS) + 1))[:n]
+    lat, wall = _timed(intent_agent.interpret, commands)
+    return {"interpret_rule": (lat, n, wall)}
+
+
+@workload("interpret_llm", requires="openai")
+def bench_interpret_llm(scale: float) -> dict:
+    _start_llm()
+    import intent_agent
+    n = int(300 * scale)
+    # distinct words, so the LLM parse cache can't answer them
+    commands = [f"please do the thing number {i} {random.random():.6f}" for i in range(n)]
+    lat, wall = _timed(intent_agent.interpret, commands)
+    return {"interpret_llm": (lat, n, wall)}
+
+
+@workload("chat_reply", requires="openai")
+def bench_chat(scale: float) -> dict:
+    _start_llm()
+    import chat_agent
+    n = int(300 * scale)
+    lat, wall = _timed(lambda i: chat_agent.chat_reply(f"tell me fact {i}"), range(n))
+    return {"chat_reply": (lat, n, wall)}
+
+
+@workload("dispatch")
+def bench_dispatch(scale: float) -> dict:
+    _start_smtp()
+    import dispatcher
+    n = int(400 * scale)
+    actions = []
+    for i in range(n):
+        if i % 2:
+            actions.append({"intent": "send_email",
+                            "slots": {"to": f"user{i}@example.com", "message": f"hello {i}"}})
+        else:
+            actions.append({"intent": "set_reminder",
+                            "slots": {"time": REMINDER_TIMES[i % len(REMINDER_TIMES)], "message": f"r{i}"}})
+    dispatcher.warm_up()
+    start = time.perf_counter()
+    results = [f.result() for f in dispatcher.submit(actions)]
+    wall = time.perf_counter() - start
+    failed = [r.message for r in results if not r.ok]
+    if failed:
+        raise RuntimeError(f"{len(failed)} dispatched actions failed, e.g. {failed[0]}")
+    return {"dispatch": ([r.queued + r.elapsed for r in results], n, wall)}
+
+
+@workload("send_email")
+def bench_send_email(scale: float) -> dict:
+    _start_smtp()
+    import email_agent
+    n = int(300 * scale)
+    lat, wall = _timed(
+        lambda i: email_agent.handle_send_email({"to": f"user{i}@example.com", "message": f"hello {i}"}),
+        range(n))
+    return {"send_email": (lat, n, wall)}
+
+
+@workload("organize")
+def bench_organize(scale: float) -> dict:
+    import file_agent
+    from file_agent import CATEGORIES
+    extensions = sorted({e for exts in CATEGORIES.values() for e in exts}) + [".bin", ""]
+    files, runs = int(1_000 * scale) or 1, 10
+    rng = random.Random(0)
+    lat, wall = [], 0.0
+    for run in range(runs):
+        root = os.path.abspath(f"tree_{run}")
+        os.makedirs(root)
+        for i in range(files):
+            with open(os.path.join(root, f"file_{i}{rng.choice(extensions)}"), "wb") as f:
+                f.write(b"x" * rng.randint(0, 512))
+        start = time.perf_counter()
+        file_agent.organize_files(root, verbose=False)
+        elapsed = time.perf_counter() - start
+        lat.append(elapsed)
+        wall += elapsed
+    return {"organize_run": (lat, runs, wall)}
+
+
+@workload("reminders")
+def bench_reminders(scale: float) -> dict:
+    import reminder_agent
+    n = int(500 * scale)
+    ids = []
+
+    def add(i):
+        ids.append(reminder_agent.set_reminder_with_email(REMINDER_TIMES[i % len(REMINDER_TIMES)], f"r{i}"))
+
+    add_lat, add_wall = _timed(add, range(n))
+    cancel_lat, cancel_wall = _timed(reminder_agent.cancel_reminder, ids)
+    return {"reminder_add": (add_lat, n, add_wall), "reminder_cancel": (cancel_lat, n, cancel_wall)}
+
+
+@workload("memory")
+def bench_memory(scale: float) -> dict:
+    import memory_agent
+    n = int(5_000 * scale)
+    keys = [f"key {i}" for i in range(n)]
+    put_lat, put_wall = _timed(lambda k: memory_agent.save_memory(k, f"value for {k}"), keys)
+    memory_agent._get_store().flush()
+    rng = random.Random(0)
+    lookups = [rng.choice(keys) for _ in range(n)]
+    get_lat, get_wall = _timed(memory_agent.get_memory, lookups)
+    out = {"memory_put": (put_lat, n, put_wall), "memory_get": (get_lat, n, get_wall)}
+    if _available("numpy"):
+        queries = [f"value {rng.randrange(n)}" for _ in range(max(n // 10, 1))]
+        rec_lat, rec_wall = _timed(memory_agent.recall_memory, queries)
+        out["memory_recall"] = (rec_lat, len(queries), rec_wall)
+    return out
+
+
+# ================================================================
+# Worker
+# ================================================================
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:     # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _summarize(latencies: list, ops: int, wall: float, rss: float | None) -> dict:
+    lat = sorted(latencies)
+    return {
+        "ops": ops,
+        "ops_per_s": ops / wall if wall else 0.0,
+        "p50_ms": statistics.median(lat) * 1000,
+        "p99_ms": lat[min(len(lat) - 1, int(len(lat) * 0.99))] * 1000,
+        "peak_rss_mb": rss,
+    }
+
+
+def run_worker(name: str, scale: float, out: str, workdir: str):
+    fn, _ = WORKLOADS[name]
+    os.chdir(workdir)
+    os.environ.pop("OPENAI_API_KEY", None)     # only the stub LLM, never the real API
+    with contextlib.redirect_stdout(io.StringIO()):     # agents print per action
+        raw = fn(scale)
+    rss = _peak_rss_mb()
+    with open(out, "w") as f:
+        json.dump({metric: _summarize(lat, ops, wall, rss) for metric, (lat, ops, wall) in raw.items()}, f)
+    os._exit(0)     # don't wait for daemon threads / atexit flushes of the scratch DBs
+
+
+def run_workload(name: str, scale: float) -> dict:
+    with tempfile.TemporaryDirectory(prefix=f"bench_{name}_") as workdir:
+        out = os.path.join(workdir, "result.json")
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", name,
+                               "--scale", str(scale), "--out", out, "--dir", workdir],
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}")
+        with open(out) as f:
+            return json.load(f)
+
+
+# ================================================================
+# Baselines
+# ================================================================
+
+def compare(results: dict, baseline: dict, tolerance: float, rss_tolerance: float) -> list[str]:
+    regressions = []
+    for metric, cur in sorted(results.items()):
+        base = baseline.get(metric)
+        if base is None:
+            continue
+        if cur["ops_per_s"] < base["ops_per_s"] * (1 - tolerance):
+            regressions.append(f"{metric}: throughput {base['ops_per_s']:,.0f} → {cur['ops_per_s']:,.0f} /s")
+        if (cur["ops"] >= P99_MIN_OPS and base["ops"] >= P99_MIN_OPS
+                and cur["p99_ms"] > base["p99_ms"] * (1 + tolerance)
+                and cur["p99_ms"] - base["p99_ms"] > P99_FLOOR_MS):
+            regressions.append(f"{metric}: p99 {base['p99_ms']:.3f} → {cur['p99_ms']:.3f} ms")
+        if (cur["peak_rss_mb"] and base.get("peak_rss_mb")
+                and cur["peak_rss_mb"] > base["peak_rss_mb"] * (1 + rss_tolerance)):
+            regressions.append(f"{metric}: peak RSS {base['peak_rss_mb']:.1f} → {cur['peak_rss_mb']:.1f} MB")
+    return regressions
+
+
+def _delta(cur: float, base: float | None) -> str:
+    if not base:
+        return ""
+    return f"{(cur / base - 1) * 100:+.0f}%"
+
+
+def report(results: dict, baseline: dict):
+    print(f"{'metric':<17} {'ops':>8} {'ops/s':>11} {'Δ':>6} {'p50 ms':>9} {'p99 ms':>9} {'Δ':>6} {'RSS MB':>8}")
+    for metric, r in sorted(results.items()):
+        base = baseline.get(metric, {})
+        rss = f"{r['peak_rss_mb']:.1f}" if r["peak_rss_mb"] else "-"
+        print(f"{metric:<17} {r['ops']:>8} {r['ops_per_s']:>11,.1f} {_delta(r['ops_per_s'], base.get('ops_per_s')):>6}"
+              f" {r['p50_ms']:>9.3f} {r['p99_ms']:>9.3f} {_delta(r['p99_ms'], base.get('p99_ms')):>6} {rss:>8}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="End-to-end benchmark suite")
+    ap.add_argument("--only", help="comma-separated workloads: " + ",".join(WORKLOADS))
+    ap.add_argument("--quick", action="store_true", help="run ~10x smaller workloads")
+    ap.add_argument("--scale", type=float, default=None, help="workload size multiplier")
+    ap.add_argument("--baseline", default=DEFAULT_BASELINE)
+    ap.add_argument("--save", action="store_true", help="store this run as the baseline")
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    ap.add_argument("--rss-tolerance", type=float, default=0.15)
+    ap.add_argument("--worker", help=argparse.SUPPRESS)
+    ap.add_argument("--out", help=argparse.SUPPRESS)
+    ap.add_argument("--dir", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+    scale = args.scale or (0.1 if args.quick else 1.0)
+
+    if args.worker:
+        run_worker(args.worker, scale, args.out, args.dir)
+        return 0
+
+    names = args.only.split(",") if args.only else list(WORKLOADS)
+    unknown = [n for n in names if n not in WORKLOADS]
+    if unknown:
+        ap.error(f"unknown workload(s): {', '.join(unknown)}")
+
+    results = {}
+    for name in names:
+        requires = WORKLOADS[name][1]
+        if not _available(requires):
+            print(f"⏭️  {name}: `{requires}` not installed, skipping", file=sys.stderr)
+            continue
+        print(f"▶️  {name} …", file=sys.stderr)
+        try:
+            results.update(run_workload(name, scale))
+        except RuntimeError as e:
+            print(f"❌ {name} failed: {e}", file=sys.stderr)
+            return 2
+
+    stored = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+    # sizes change latencies, so a --quick run is compared with a --quick baseline
+    key = f"scale={scale:g}"
+    baseline = stored.get(key, {}).get("results", {})
+
+    print()
+    report(results, baseline)
+
+    if args.save:
+        stored[key] = {"saved": time.strftime("%Y-%m-%d %H:%M:%S"), "python": platform.python_version(),
+                       "machine": platform.node(), "results": {**baseline, **results}}
+        with open(args.baseline, "w") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+        print(f"\n💾 Baseline saved to {args.baseline} ({key})")
+        return 0
+
+    if not baseline:
+        print(f"\n❌ No baseline for {key} in {args.baseline}; run with --save to create one.")
+        return 1
+    missing = sorted(set(results) - set(baseline))
+    if missing:
+        print(f"\n❌ Not in the baseline: {', '.join(missing)}; run with --save to add them.")
+        return 1
+
+    regressions = compare(results, baseline, args.tolerance, args.rss_tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond tolerance:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print(f"\n✅ No regressions beyond {args.tolerance:.0%} (RSS {args.rss_tolerance:.0%}) of the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
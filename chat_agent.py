@@ -1,28 +1,90 @@
 # chat_agent.py
 import os
 
-from openai import OpenAI
+import tracing
 
+DISABLED_REPLY = "⚠️ OpenAI API key is disabled by sudheer debbati. Chat features are currently unavailable."
 
-def chat_reply(prompt):
+
+def _messages(prompt, history=None):
+    """
+    (messages, chat_context.ContextStats): system prompt + recalled
+    memories + recent turns + prompt, within the token budget
+    """
+    from chat_context import build_messages
+    return build_messages(prompt, history)
+
+
+@tracing.traced("chat_reply", mode="sync")
+def chat_reply(prompt, history=None):
     """
     Handles chat replies.
+    history: earlier (role, content) turns, oldest first; as many as fit
+    the context budget are sent along with related stored memories.
     If OPENAI_API_KEY is missing, return fallback message.
     """
 
     api_key = os.getenv("OPENAI_API_KEY")  # picks key only if available
 
     if not api_key:
-        return "⚠️ OpenAI API key is disabled by sudheer debbati. Chat features are currently unavailable."
+        return DISABLED_REPLY
+
+    import llm_client  # asyncio + openai: only loaded once chat is used
+    messages, _ = _messages(prompt, history)
+    return llm_client.complete(messages)
+
+
+class ChatStream:
+    """
+    A streamed chat reply: iterate it for the pieces as they arrive.
+    `context` is this request's chat_context.ContextStats (tokens sent and
+    saved, ms added) once the first piece is out; it stays None for the
+    fallback message.
+    """
+
+    def __init__(self, prompt, history=None):
+        self.context = None
+        self._pieces = self._generate(prompt, history)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._pieces)
+
+    def close(self):
+        self._pieces.close()
+
+    def _generate(self, prompt, history):
+        if not os.getenv("OPENAI_API_KEY"):
+            yield DISABLED_REPLY
+            return
+
+        import llm_client
+        with tracing.span("chat_reply", mode="stream"):
+            messages, self.context = _messages(prompt, history)
+            yield from llm_client.stream(messages)
+
+
+def chat_reply_stream(prompt, history=None) -> ChatStream:
+    """
+    Like chat_reply, but yields the reply in pieces as they arrive.
+    Yields the single fallback message if OPENAI_API_KEY is missing.
+    """
+    return ChatStream(prompt, history)
+
+
+@tracing.traced("chat_reply", mode="async")
+async def achat_reply(prompt, history=None):
+    """Async variant of chat_reply (shares the same pooled client)."""
+    if not os.getenv("OPENAI_API_KEY"):
+        return DISABLED_REPLY
 
-    client = OpenAI(api_key=api_key)
+    import llm_client
+    messages, _ = _messages(prompt, history)
+    return await llm_client.acomplete(messages)
 
-    resp = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "You are a helpful assistant."},
-            {"role": "user", "content": prompt}
-        ]
-    )
 
-    return resp.choices[0].message.content
+async def handle_chat(slots: dict, ctx=None) -> str:
+    """Dispatcher handler for the chat intent"""
+    return await achat_reply(slots.get("query") or "introduce yourself")
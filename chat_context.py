@@ -0,0 +1,136 @@
+# chat_context.py
+"""
+Context assembly for chat requests.
+
+build_messages() puts the system prompt, the stored memories most
+related to the prompt (memory_agent.recall_memory) and as many recent
+conversation turns as fit in front of the user's prompt. The whole
+request stays under a token budget:
+- Memories go in first, best match first, and the set is then sorted
+  by key, so the same recall yields byte-identical prefixes. The
+  provider's prompt cache can reuse those.
+- Turns are added newest first until the budget runs out.
+
+Token counts are estimated locally (about 4 characters per token plus
+per-message overhead) rather than with a real tokenizer, and the system
+block for a given set of memories is cached, so assembling a request
+usually costs well under a millisecond once recall has run.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import NamedTuple
+
+SYSTEM_PROMPT = "You are a helpful assistant."
+CONTEXT_BUDGET = int(os.getenv("CHAT_CONTEXT_TOKENS", "1500"))
+RECALL_K = 5
+RECALL_MIN_SCORE = 0.25
+MESSAGE_OVERHEAD = 4    # role + separators per chat message
+PREFIX_CACHE_SIZE = 256
+
+
+class ContextStats(NamedTuple):
+    tokens: int          # estimated prompt tokens actually sent
+    full_tokens: int     # what sending every turn and recalled memory would cost
+    memories: int
+    turns: int
+    build_ms: float      # latency added by recall + assembly
+
+    @property
+    def saved(self) -> int:
+        return self.full_tokens - self.tokens
+
+
+@lru_cache(maxsize=4096)
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English text (~4 chars per token), no tokenizer needed"""
+    return (len(text) + 3) // 4 + MESSAGE_OVERHEAD
+
+
+_prefixes = OrderedDict()   # memories tuple -> (system message, tokens)
+_prefix_lock = threading.Lock()
+prefix_hits = 0
+prefix_misses = 0
+
+
+def _system_message(memories: tuple) -> tuple[dict, int]:
+    """System message carrying `memories` ((key, value) pairs), cached per set"""
+    global prefix_hits, prefix_misses
+    with _prefix_lock:
+        cached = _prefixes.get(memories)
+        if cached is not None:
+            _prefixes.move_to_end(memories)
+            prefix_hits += 1
+            return cached
+        prefix_misses += 1
+
+    content = SYSTEM_PROMPT
+    if memories:
+        facts = "\n".join(f"- {key}: {value}" for key, value in memories)
+        content += f"\n\nThings the user has told you before:\n{facts}"
+    entry = ({"role": "system", "content": content}, estimate_tokens(content))
+
+    with _prefix_lock:
+        _prefixes[memories] = entry
+        if len(_prefixes) > PREFIX_CACHE_SIZE:
+            _prefixes.popitem(last=False)
+    return entry
+
+
+def _fact_tokens(key: str, value: str) -> int:
+    """Tokens one "- key: value" line adds to the system message"""
+    return estimate_tokens(f"- {key}: {value}") - MESSAGE_OVERHEAD + 1
+
+
+def _recall(prompt: str) -> list:
+    try:
+        from memory_agent import recall_memory
+        return [(k, v) for k, v, _ in recall_memory(prompt, RECALL_K, RECALL_MIN_SCORE) if v]
+    except Exception as e:
+        print("Memory recall failed:", e)
+        return []
+
+
+def build_messages(prompt: str, history=None, budget: int = CONTEXT_BUDGET,
+                   recall: bool = True) -> tuple[list, ContextStats]:
+    """
+    Messages for one chat request plus what went into them.
+    history: earlier (role, content) turns, oldest first.
+    """
+    start = time.perf_counter()
+    history = list(history or ())
+    prompt_tokens = estimate_tokens(prompt)
+    _, base_tokens = _system_message(())  # without memories
+    remaining = budget - prompt_tokens - base_tokens
+
+    # memories: best match first while they fit, then sorted for a stable prefix
+    recalled = _recall(prompt) if recall and remaining > 0 else []
+    chosen, used = [], 0
+    for key, value in recalled:
+        cost = _fact_tokens(key, value)
+        if used + cost > remaining:
+            break
+        chosen.append((key, value))
+        used += cost
+    system, system_tokens = _system_message(tuple(sorted(chosen)))
+    remaining = budget - prompt_tokens - system_tokens
+
+    # turns: newest first while they fit
+    turns = []
+    for role, content in reversed(history):
+        cost = estimate_tokens(content)
+        if cost > remaining:
+            break
+        turns.append({"role": role, "content": content})
+        remaining -= cost
+    turns.reverse()
+
+    messages = [system, *turns, {"role": "user", "content": prompt}]
+    full = (prompt_tokens + system_tokens
+            + sum(_fact_tokens(k, v) for k, v in recalled[len(chosen):])
+            + sum(estimate_tokens(content) for _, content in history))
+    stats = ContextStats(budget - remaining, full, len(chosen), len(turns),
+                         (time.perf_counter() - start) * 1000)
+    return messages, stats
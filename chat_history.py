@@ -0,0 +1,82 @@
+# chat_history.py
+"""
+Bounded chat history for the Streamlit app.
+
+The newest RING_SIZE turns live in a ring buffer of (role, content)
+tuples; anything older is paged out to the chat_history table in
+memory.db as it falls off the ring and read back a page at a time when
+the user asks for it. Memory use and render time per rerun stay flat no
+matter how long the session runs.
+"""
+import sqlite3
+import threading
+import time
+from collections import deque
+
+HISTORY_DB = "memory.db"
+RING_SIZE = 100
+PAGE_SIZE = 50
+
+
+class ChatHistory:
+    def __init__(self, session_id: str, db_path: str = HISTORY_DB, ring_size: int = RING_SIZE):
+        self.session_id = session_id
+        self._ring = deque(maxlen=ring_size)   # (seq, role, content)
+        self._next_seq = 0
+        self._lock = threading.Lock()
+        # Streamlit reruns the script on a new thread each time
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS chat_history ("
+            " session_id TEXT NOT NULL,"
+            " seq INTEGER NOT NULL,"
+            " role TEXT NOT NULL,"
+            " content TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " PRIMARY KEY (session_id, seq))"
+        )
+        self._db.commit()
+
+    def __len__(self) -> int:
+        return self._next_seq
+
+    def append(self, role: str, content: str):
+        with self._lock:
+            if len(self._ring) == self._ring.maxlen:
+                seq, old_role, old_content = self._ring[0]
+                with self._db:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO chat_history (session_id, seq, role, content, created_at)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        (self.session_id, seq, old_role, old_content, time.time()),
+                    )
+            self._ring.append((self._next_seq, role, content))
+            self._next_seq += 1
+
+    def recent(self) -> list:
+        """The turns still in memory, oldest first, as (seq, role, content)"""
+        with self._lock:
+            return list(self._ring)
+
+    def older(self, before_seq: int, limit: int = PAGE_SIZE) -> list:
+        """Up to `limit` paged-out turns just before `before_seq`, oldest first"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT seq, role, content FROM chat_history"
+                " WHERE session_id = ? AND seq < ? ORDER BY seq DESC LIMIT ?",
+                (self.session_id, before_seq, limit),
+            ).fetchall()
+        rows.reverse()
+        return rows
+
+    def clear(self):
+        with self._lock:
+            self._ring.clear()
+            self._next_seq = 0
+            with self._db:
+                self._db.execute("DELETE FROM chat_history WHERE session_id = ?", (self.session_id,))
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,209 @@
+# dispatcher.py
+"""
+Runs the actions returned by intent_agent.interpret() concurrently.
+
+HANDLERS is the one dispatch table shared by main.py and app.py: per
+intent, the handler to call (loaded on first use), how many actions of
+that intent may run at once and how long one may take. Blocking handlers
+(SMTP, file moves, SQLite) are offloaded to a thread pool; async ones
+(chat) run directly on the dispatcher's event loop, a daemon thread
+started on first use.
+
+Results come back in the order the actions were given, each with the
+time it waited for a slot and the wall-clock time it ran.
+"""
+import importlib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, NamedTuple
+
+import tracing
+
+# asyncio is imported when the loop starts (it is ~30 ms of the CLI's cold
+# start); main.py warms it up in the background after the prompt appears.
+# Everything below that uses it runs after _ensure_loop().
+asyncio = None
+
+_lock = threading.RLock()   # a handler module may register() while being imported
+
+
+class Handler(NamedTuple):
+    fn: str | Callable           # fn(slots, ctx) -> message; raises ValueError for bad slots
+    limit: int = 4               # actions of this intent running at once
+    timeout: float | None = 60.0
+
+
+class Context(NamedTuple):
+    """Passed to every handler. Long-running ones watch `cancel` and call `progress`."""
+    cancel: threading.Event
+    progress: Callable | None = None
+
+
+class _ActionCancel(threading.Event):
+    """
+    One action's cancel flag, linked to the caller's: set when that action
+    times out, and reads as set once the caller's event is. A timeout
+    therefore only stops its own action, not the others of the command.
+    Handlers poll it with is_set().
+    """
+
+    def __init__(self, caller: threading.Event):
+        super().__init__()
+        self._caller = caller
+
+    def is_set(self) -> bool:
+        return super().is_set() or self._caller.is_set()
+
+
+class ActionResult(NamedTuple):
+    intent: str
+    slots: dict
+    ok: bool
+    message: str
+    queued: float    # seconds spent waiting for the intent's limit
+    elapsed: float   # seconds the handler ran
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+# Handlers are named "module:function" and imported the first time their
+# intent is dispatched, so a chat-only session never loads the SMTP, file
+# or reminder agents (and a reminder never loads openai).
+HANDLERS = {
+    "send_email":     Handler("email_agent:handle_send_email", limit=4, timeout=60.0),
+    "set_reminder":   Handler("reminder_agent:handle_set_reminder", limit=8, timeout=10.0),
+    "organize_files": Handler("file_agent:handle_organize_files", limit=1, timeout=None),  # cancellable instead
+    "chat":           Handler("chat_agent:handle_chat", limit=4, timeout=120.0),
+}
+
+_resolved = {}   # intent -> callable
+
+
+def register(intent: str, target: str | Callable, limit: int = 4, timeout: float | None = 60.0):
+    """
+    Add (or replace) the handler for an intent. `target` is a callable
+    fn(slots, ctx) -> message, sync or async, or a "module:function"
+    string imported on first use.
+    """
+    with _lock:
+        HANDLERS[intent] = Handler(target, limit, timeout)
+        _resolved.pop(intent, None)
+
+
+def _resolve(intent: str) -> Callable:
+    fn = _resolved.get(intent)
+    if fn is None:
+        with _lock:
+            fn = HANDLERS[intent].fn
+            if isinstance(fn, str):
+                module, _, attr = fn.partition(":")
+                fn = getattr(importlib.import_module(module), attr)
+            _resolved[intent] = fn
+    return fn
+
+
+# ---------------------------------------------------------------------------
+# Event loop
+# ---------------------------------------------------------------------------
+
+_loop = None
+_executor = None
+_semaphores = {}   # intent -> asyncio.Semaphore, only touched on the loop thread
+
+
+def _ensure_loop():
+    """Start the background event loop thread once."""
+    global _loop, _executor, asyncio
+    with _lock:
+        if _loop is None:
+            import asyncio
+            _executor = ThreadPoolExecutor(
+                max_workers=sum(h.limit for h in HANDLERS.values()),
+                thread_name_prefix="dispatch",
+            )
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="dispatcher", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def warm_up():
+    """Start the event loop ahead of the first dispatch."""
+    _ensure_loop()
+
+
+async def _run(action: dict, ctx: Context) -> ActionResult:
+    intent = action.get("intent")
+    slots = action.get("slots") or {}
+    handler = HANDLERS.get(intent)
+    if handler is None:
+        return ActionResult(intent, slots, False, "❓ Unknown command.", 0.0, 0.0)
+
+    sem = _semaphores.get(intent)
+    if sem is None:
+        sem = _semaphores[intent] = asyncio.Semaphore(handler.limit)
+
+    submitted = time.perf_counter()
+    with tracing.span("dispatch_one", intent=intent) as sp:
+        async with sem:
+            started = time.perf_counter()
+            try:
+                fn = _resolve(intent)
+                if asyncio.iscoroutinefunction(fn):
+                    work = fn(slots, ctx)
+                else:
+                    work = asyncio.get_running_loop().run_in_executor(_executor, fn, slots, ctx)
+                ok, message = True, await asyncio.wait_for(work, handler.timeout)
+            except asyncio.TimeoutError:
+                # a thread can't be killed: cooperative handlers stop on cancel,
+                # others finish in the background and their result is dropped
+                ctx.cancel.set()
+                ok, message = False, f"⏱️ {intent} timed out after {handler.timeout:.0f}s"
+            except ValueError as e:
+                ok, message = False, f"❌ {e}"
+            except Exception as e:
+                ok, message = False, f"❌ {intent} failed: {e}"
+            finished = time.perf_counter()
+        if not ok:
+            sp.fail()
+    return ActionResult(intent, slots, ok, message, started - submitted, finished - started)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def submit(actions: list, cancel: threading.Event | None = None,
+           progress: Callable | None = None) -> list[Future]:
+    """
+    Start every action now; returns one Future per action (resolving to
+    an ActionResult), in the same order. `cancel` stops cooperative
+    handlers (the organizer) of every action; each action also gets its
+    own flag, set when it times out. `progress(index, event)` receives
+    their progress events.
+    """
+    loop = _ensure_loop()
+    cancel = cancel or threading.Event()
+    return [
+        asyncio.run_coroutine_threadsafe(
+            _run(action, Context(_ActionCancel(cancel), progress and partial(progress, i))), loop
+        )
+        for i, action in enumerate(actions)
+    ]
+
+
+@tracing.traced("dispatch")
+def dispatch(actions: list, **kwargs) -> list[ActionResult]:
+    """Run all actions concurrently and wait for them; results in input order."""
+    return [fut.result() for fut in submit(actions, **kwargs)]
+
+
+@tracing.traced("dispatch")
+async def adispatch(actions: list, **kwargs) -> list[ActionResult]:
+    """dispatch() for callers already inside an event loop."""
+    futures = submit(actions, **kwargs)     # starts the loop, imports asyncio
+    return list(await asyncio.gather(*(asyncio.wrap_future(f) for f in futures)))
@@ -1,34 +1,84 @@
 import os
-import smtplib
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
-def send_email(receiver_email, subject, message):
+import tracing
+from smtp_pool import Outbox
+
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+# SMTP_STARTTLS=0 only for the local sink in benchmarks/: credentials go in cleartext
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "1") != "0"
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+def get_outbox() -> Outbox | None:
+    """Shared outbound queue (one per process), or None without credentials"""
+    global _outbox
     sender_email = os.getenv("GMAIL_EMAIL")
     app_password = os.getenv("GMAIL_APP_PASSWORD")
-
     if not sender_email or not app_password:
+        return None
+    with _outbox_lock:
+        if _outbox is None:
+            _outbox = Outbox(SMTP_HOST, SMTP_PORT, sender_email, app_password, starttls=SMTP_STARTTLS)
+        return _outbox
+
+def _build_message(sender_email, receiver_email, subject, message) -> str:
+    msg = MIMEMultipart()
+    msg["From"] = sender_email
+    msg["To"] = receiver_email
+    msg["Subject"] = subject
+
+    msg.attach(MIMEText(message, "plain"))
+    return msg.as_string()
+
+def queue_email(receiver_email, subject, message):
+    """Queue an email without waiting for SMTP; returns a Future (or None on config error)"""
+    outbox = get_outbox()
+    if outbox is None:
         print("❌ Error: Environment variables not set.")
-        return
+        return None
 
-    try:
-        msg = MIMEMultipart()
-        msg["From"] = sender_email
-        msg["To"] = receiver_email
-        msg["Subject"] = subject
+    sender_email = outbox.user
+    fut = outbox.submit(sender_email, receiver_email,
+                        _build_message(sender_email, receiver_email, subject, message))
+
+    def _report(f):
+        if f.exception():
+            print("❌ Error:", f.exception())
+        else:
+            print("✅ Email sent successfully!")
+
+    fut.add_done_callback(_report)
+    return fut
 
-        msg.attach(MIMEText(message, "plain"))
+@tracing.traced("send_email")
+def send_email(receiver_email, subject, message):
+    fut = queue_email(receiver_email, subject, message)
+    if fut is None:
+        return
 
-        server = smtplib.SMTP("smtp.gmail.com", 587)
-        server.starttls()
-        server.login(sender_email, app_password)
-        server.sendmail(sender_email, receiver_email, msg.as_string())
-        server.quit()
+    try:
+        fut.result()
+    except Exception:
+        pass  # already reported by queue_email
 
-        print("✅ Email sent successfully!")
+@tracing.traced("send_email")
+def handle_send_email(slots: dict, ctx=None) -> str:
+    """Dispatcher handler for the send_email intent"""
+    to = slots.get("to")
+    msg = slots.get("message")
+    if not (to and msg):
+        raise ValueError("Missing email address or message.")
 
-    except Exception as e:
-        print("❌ Error:", e)
+    fut = queue_email(to, slots.get("subject") or "Automated Email", msg)
+    if fut is None:
+        raise ValueError("Email is not configured (GMAIL_EMAIL / GMAIL_APP_PASSWORD).")
+    fut.result()  # raises if the server refused it
+    return f"✅ Email sent to {to}"
 
 
 # ---- Test ----
@@ -38,4 +88,3 @@ if __name__ == "__main__":
     message = input("Message: ")
 
     send_email(receiver, subject, message)
-
@@ -1,6 +1,16 @@
+import errno
 import os
 import shutil
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
 from pathlib import Path
+from typing import NamedTuple
+
+import tracing
+from file_manifest import FileManifest
+from move_journal import MoveJournal, last_run, undo_run
 
 CATEGORIES = {
     "Images":      {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".tiff", ".heic", ".svg"},
@@ -16,56 +26,433 @@ CATEGORIES = {
     "Design":      {".psd", ".ai", ".fig", ".xd", ".sketch"},
 }
 
+# Flattened once: extension -> category, O(1) per lookup
+EXT_TO_CATEGORY = {ext: cat for cat, exts in CATEGORIES.items() for ext in exts}
+MANAGED_DIRS = frozenset(CATEGORIES) | {"Others", "Duplicates"}
+APPLY_BATCH = 64   # small enough for smooth progress, big enough to amortize a task
+
 def _category_for(ext: str) -> str:
-    ext = ext.lower()
-    for cat, exts in CATEGORIES.items():
-        if ext in exts:
-            return cat
-    return "Others"
-
-def _unique_destination(dst_dir: Path, filename: str) -> Path:
-    base = Path(filename).stem
-    ext = Path(filename).suffix
-    candidate = dst_dir / (base + ext)
-    counter = 1
-    while candidate.exists():
-        candidate = dst_dir / f"{base} ({counter}){ext}"
-        counter += 1
-    return candidate
-
-def organize_files(root: str, dry_run: bool = False) -> None:
+    return EXT_TO_CATEGORY.get(ext.lower(), "Others")
+
+def _split_name(filename: str) -> tuple[str, str]:
+    # same split as Path(filename).stem / .suffix, without building a Path
+    i = filename.rfind(".")
+    if 0 < i < len(filename) - 1:
+        return filename[:i], filename[i:]
+    return filename, ""
+
+class _NameIndex:
+    """
+    Names in one target folder, read with a single scandir and kept up to
+    date as files are moved in. Picks "name", "name (1)", "name (2)", ...
+    without stat-ing every candidate: a per-(stem, ext) counter remembers
+    where the last search stopped, so each name is O(1) amortized.
+
+    Files land with create-or-fail semantics (hard link, or an O_EXCL
+    placeholder where links aren't possible), so a file created by another
+    process in the meantime is never overwritten.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        with os.scandir(path) as it:
+            self._taken = {entry.name for entry in it}
+        self._next = {}   # (stem, ext) -> next counter to try
+
+    def _claim_name(self, filename: str) -> str:
+        with self._lock:
+            if filename not in self._taken:
+                self._taken.add(filename)
+                return filename
+            base, ext = _split_name(filename)
+            counter = self._next.get((base, ext), 1)
+            while f"{base} ({counter}){ext}" in self._taken:
+                counter += 1
+            self._next[(base, ext)] = counter + 1
+            name = f"{base} ({counter}){ext}"
+            self._taken.add(name)
+            return name
+
+    def place(self, src: str, filename: str) -> str:
+        """Move `src` in under a unique name derived from `filename`; returns the destination."""
+        while True:
+            dst = os.path.join(self.path, self._claim_name(filename))
+            try:
+                os.link(src, dst, follow_symlinks=False)  # atomic create-or-fail, same filesystem only
+            except FileExistsError:
+                continue  # created behind our back: it's in _taken now, try the next one
+            except OSError:
+                return self._place_with_placeholder(src, dst, filename)
+            os.unlink(src)
+            return dst
+
+    def _place_with_placeholder(self, src: str, dst: str, filename: str) -> str:
+        # no hard links here (other device, FAT, ...): claim the name with an
+        # empty file first, then replace it
+        while True:
+            try:
+                os.close(os.open(dst, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+                break
+            except FileExistsError:
+                dst = os.path.join(self.path, self._claim_name(filename))
+        try:
+            _move(src, dst)
+        except Exception:
+            os.unlink(dst)
+            raise
+        return dst
+
+def _move(src: str, dst: str):
+    try:
+        os.replace(src, dst)  # same filesystem: atomic, metadata-only, no copy
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dst)
+
+class MoveOp(NamedTuple):
+    """One planned move: `src` goes into the `category` folder as `name`."""
+    name: str
+    src: str
+    category: str
+    stat: tuple | None = None   # (size, mtime, inode), only when a manifest is kept
+
+class Progress(NamedTuple):
+    """
+    Event streamed by apply(). kind is "moved", "failed", "done" or
+    "cancelled"; the counters are running totals. total is None until
+    the plan has been fully scanned, and eta (seconds) is None until then.
+    moved + skipped counts planned ops and never exceeds total; what the
+    plan itself left alone (folders, duplicates) is in plan_skipped.
+    """
+    kind: str
+    op: MoveOp | None
+    dst: str | None
+    error: str | None
+    moved: int
+    skipped: int            # planned moves that failed
+    plan_skipped: int
+    bytes: int
+    total: int | None
+    rate: float
+    eta: float | None
+    run_id: int | None
+
+class _Mover:
+    """Moves files into category folders, each with its own _NameIndex, so
+    worker threads never hand out the same destination twice."""
+
+    def __init__(self, root_path: Path):
+        self.root_path = root_path
+        self.moved = []             # (src, size, mtime, inode, category, destination)
+        self.failed_dirs = set()
+        self._lock = threading.Lock()
+        self._indexes = {}
+
+    def _index_for(self, cat: str) -> _NameIndex:
+        with self._lock:
+            index = self._indexes.get(cat)
+            if index is None:
+                target_dir = self.root_path / cat
+                target_dir.mkdir(exist_ok=True)
+                index = self._indexes[cat] = _NameIndex(str(target_dir))
+            return index
+
+    def move_one(self, op: MoveOp):
+        """Returns (op, destination, size, error); destination is None on failure"""
+        try:
+            size = op.stat[0] if op.stat else os.lstat(op.src).st_size
+            dst = self._index_for(op.category).place(op.src, op.name)
+        except Exception as e:
+            with self._lock:
+                self.failed_dirs.add(os.path.dirname(op.src))
+            return op, None, 0, str(e)
+        with self._lock:
+            self.moved.append((op.src, *(op.stat or (None, None, None)), op.category, dst))
+        return op, dst, size, None
+
+    def move_batch(self, ops: list, cancel: threading.Event) -> list:
+        """Moves a batch of MoveOps, stopping early once `cancel` is set"""
+        results = []
+        for op in ops:
+            if cancel.is_set():
+                break
+            results.append(self.move_one(op))
+        return results
+
+def _scan_dir(path: str, is_root: bool, recursive: bool, manifest):
+    """
+    List one directory.
+    Returns (files, subdirs, skipped, listed): files are MoveOps, subdirs
+    are paths to descend into (recursive mode), listed is False when the
+    manifest shows the directory unchanged and it wasn't read.
+    """
+    if manifest is not None:
+        known = manifest.unchanged_subdirs(path, os.stat(path))
+        if known is not None:
+            return [], known, 0, False
+
+    files, subdirs, skipped = [], [], 0
+    with os.scandir(path) as it:
+        for entry in it:
+            # symlinked folders are not descended into (avoids cycles)
+            if entry.is_dir(follow_symlinks=not recursive):
+                # Skip top-level folders we create
+                if is_root and entry.name in MANAGED_DIRS:
+                    continue
+                if recursive:
+                    subdirs.append(entry.path)
+                else:
+                    # Skip existing folders; only top-level files without recursive=True
+                    skipped += 1
+                continue
+
+            if entry.is_file():
+                cat = _category_for(os.path.splitext(entry.name)[1])
+                stat = None
+                if manifest is not None:
+                    st = entry.stat()
+                    stat = (st.st_size, st.st_mtime, st.st_ino)
+                files.append(MoveOp(entry.name, entry.path, cat, stat))
+    return files, subdirs, skipped, True
+
+class Plan:
+    """
+    Lazy move plan for one folder, returned by plan(). Iterating it scans
+    the tree and yields MoveOps as each directory is listed; it can be
+    iterated once. skipped / listed / total are filled in along the way.
+    """
+
+    def __init__(self, root_path: Path, recursive: bool, incremental: bool,
+                 inspect_content: bool, workers: int):
+        self.root_path = root_path
+        self.recursive = recursive
+        self.inspect_content = inspect_content
+        self.workers = workers
+        self.manifest = FileManifest(str(root_path), recursive) if incremental else None
+        self.skipped = 0
+        self.listed = {}        # directory actually read -> its sub-directories
+        self.total = None       # number of ops, once fully iterated
+
+    def __iter__(self):
+        ops = self._scan()
+        if self.inspect_content:
+            # duplicate detection compares files across the whole tree, so
+            # this stage needs the full scan before it can yield anything
+            from file_inspect import refine_jobs
+            ops = map(MoveOp._make, refine_jobs(str(self.root_path), list(ops), MANAGED_DIRS))
+        count = 0
+        for op in ops:
+            count += 1
+            yield op
+        self.total = count
+
+    def _collect(self, path, result):
+        dir_files, subdirs, dir_skipped, was_listed = result
+        self.skipped += dir_skipped
+        if was_listed:
+            self.listed[path] = subdirs
+        return dir_files, subdirs
+
+    def _scan(self):
+        """
+        Walk the root (and sub-trees if recursive) listing up to `workers`
+        directories at a time, yielding each directory's files as soon as
+        it has been read.
+        """
+        root = str(self.root_path)
+        files, pending = self._collect(root, _scan_dir(root, True, self.recursive, self.manifest))
+        yield from files
+        if not pending:
+            return
+
+        scan = lambda p: _scan_dir(p, False, self.recursive, self.manifest)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            running = {pool.submit(scan, p): p for p in pending}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    path = running.pop(fut)
+                    try:
+                        files, subdirs = self._collect(path, fut.result())
+                    except OSError as e:
+                        print(f"❌ Failed to read {path}: {e}")
+                        self.skipped += 1
+                        continue
+                    for sub in subdirs:
+                        running[pool.submit(scan, sub)] = sub
+                    yield from files
+
+    def close(self):
+        if self.manifest is not None:
+            self.manifest.close()
+
+def _resolve_root(root: str) -> Path | None:
     root_path = Path(root).expanduser().resolve()
     if not root_path.exists() or not root_path.is_dir():
         print(f"❌ Path not found or not a folder: {root_path}")
+        return None
+    return root_path
+
+def plan(root: str, recursive: bool = False, incremental: bool = False,
+         inspect_content: bool = False, workers: int = 8) -> Plan | None:
+    """
+    Work out what organize_files would move, without touching anything.
+    Returns a lazy Plan (or None if `root` isn't a folder); iterate it for
+    MoveOps or hand it to apply(). Options are as for organize_files.
+    """
+    root_path = _resolve_root(root)
+    if root_path is None:
+        return None
+    return Plan(root_path, recursive, incremental, inspect_content, workers)
+
+def apply(plan: Plan, workers: int = 8, cancel: threading.Event | None = None):
+    """
+    Carry out a Plan, yielding a Progress event per file and a final
+    "done" (or "cancelled") event. Scanning and moving overlap: batches
+    are handed to `workers` threads while the plan is still being read.
+
+    Setting `cancel`, or simply closing the generator, stops the run
+    after the batches already in flight. Every completed move is
+    journaled as it happens; undo(root) rolls the run back.
+    """
+    cancel = cancel or threading.Event()
+    mover = _Mover(plan.root_path)
+    journal = MoveJournal(str(plan.root_path))
+    ops = iter(plan)
+    moved = skipped = nbytes = 0
+    started = time.monotonic()
+    pool = ThreadPoolExecutor(max_workers=max(workers, 1))
+    running = set()
+    exhausted = finished = False
+
+    def event(kind, op=None, dst=None, error=None):
+        elapsed = time.monotonic() - started
+        done = moved + skipped
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (plan.total - done) / rate if plan.total is not None and rate else None
+        return Progress(kind, op, dst, error, moved, skipped, plan.skipped, nbytes,
+                        plan.total, rate, eta, journal.run_id)
+
+    try:
+        while True:
+            while not exhausted and not cancel.is_set() and len(running) < max(workers, 1) * 2:
+                batch = list(islice(ops, APPLY_BATCH))
+                if not batch:
+                    exhausted = True
+                    break
+                running.add(pool.submit(mover.move_batch, batch, cancel))
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                running.discard(fut)
+                results = fut.result()
+                journal.record([(op.src, dst) for op, dst, _, _ in results if dst])
+                for op, dst, size, error in results:
+                    if dst:
+                        moved += 1
+                        nbytes += size
+                        yield event("moved", op, dst)
+                    else:
+                        skipped += 1
+                        yield event("failed", op, error=error)
+        finished = True
+        journal.finish("cancelled" if cancel.is_set() else "done")
+        yield event("cancelled" if cancel.is_set() else "done")
+    finally:
+        if not finished:
+            # consumer stopped early: let in-flight batches wind down
+            cancel.set()
+        ops.close()
+        pool.shutdown(wait=True, cancel_futures=True)
+        for fut in running:
+            if not fut.cancelled():
+                journal.record([(op.src, dst) for op, dst, _, _ in fut.result() if dst])
+        if not finished:
+            journal.finish("cancelled")
+        journal.close()
+
+        if plan.manifest is not None:
+            # directories with failed moves are read again next time; an
+            # interrupted run records nothing about directories
+            if finished and not cancel.is_set():
+                failed = mover.failed_dirs
+                plan.manifest.record_dirs({p: subs for p, subs in plan.listed.items() if p not in failed})
+                plan.manifest.forget_dirs(failed)
+            plan.manifest.record_moves(mover.moved)
+        plan.close()
+
+def undo(root: str, run_id: int | None = None) -> tuple[int, int]:
+    """Roll back an apply() run (the latest one for `root` by default); returns (restored, skipped)"""
+    root_path = Path(root).expanduser().resolve()
+    run_id = run_id if run_id is not None else last_run(str(root_path))
+    if run_id is None:
+        print(f"⚠️ Nothing to undo in: {root_path}")
+        return 0, 0
+    restored, skipped = undo_run(run_id)
+    print(f"↩️  Undo run {run_id}: restored {restored}, skipped {skipped}")
+    return restored, skipped
+
+@tracing.traced("organize_files")
+def organize_files(root: str, dry_run: bool = False, workers: int = 8, verbose: bool = True,
+                   recursive: bool = False, incremental: bool = False,
+                   inspect_content: bool = False) -> None:
+    """
+    Move files into category folders under `root` (plan() + apply()).
+    dry_run:         only print the plan
+    recursive:       also organize files in sub-folders (into root's categories)
+    incremental:     keep a manifest in memory.db and skip directories that
+                     haven't changed since the last (non-dry) run
+    inspect_content: sniff magic bytes to fix missing/wrong extensions and
+                     send files whose content is already filed to Duplicates/
+    """
+    p = plan(root, recursive=recursive, incremental=incremental and not dry_run,
+             inspect_content=inspect_content, workers=workers)
+    if p is None:
         return
 
-    print(f"{'🧪 DRY RUN' if dry_run else '🗂️  Organizing'} in: {root_path}")
-    moved, skipped = 0, 0
+    print(f"{'🧪 DRY RUN' if dry_run else '🗂️  Organizing'} in: {p.root_path}")
+    if dry_run:
+        moved = 0
+        for op in p:
+            if verbose:
+                print(f"🧪 Would move: {op.name} → {op.category}/")
+            moved += 1
+        p.close()
+        print(f"\n✅ Done. Simulated: {moved}, Skipped: {p.skipped}")
+        return
 
-    for item in root_path.iterdir():
-        if item.is_dir():
-            # Skip top-level folders we create
-            if item.name in set(CATEGORIES.keys()) | {"Others"}:
-                continue
-            # Skip existing folders; we only move top-level files in v1
-            skipped += 1
-            continue
-
-        if item.is_file():
-            cat = _category_for(item.suffix)
-            target_dir = root_path / cat
-            if not dry_run:
-                target_dir.mkdir(exist_ok=True)
-                dst = _unique_destination(target_dir, item.name)
-                try:
-                    shutil.move(str(item), str(dst))
-                    print(f"➡️  {item.name}  →  {cat}/{dst.name}")
-                    moved += 1
-                except Exception as e:
-                    print(f"❌ Failed to move {item.name}: {e}")
-                    skipped += 1
-            else:
-                print(f"🧪 Would move: {item.name} → {cat}/")
-                moved += 1
+    for ev in apply(p, workers=workers):
+        if ev.kind == "moved" and verbose:
+            print(f"➡️  {ev.op.name}  →  {ev.op.category}/{os.path.basename(ev.dst)}")
+        elif ev.kind == "failed":
+            print(f"❌ Failed to move {ev.op.name}: {ev.error}")
+    print(f"\n✅ Done. Moved: {ev.moved}, Skipped: {ev.skipped + ev.plan_skipped}")
+
+@tracing.traced("organize_files")
+def handle_organize_files(slots: dict, ctx) -> str:
+    """Dispatcher handler for the organize_files intent; stops on ctx.cancel, reports to ctx.progress"""
+    path = slots.get("path")
+    if not path:
+        raise ValueError("Folder path missing.")
+    todo = plan(path)
+    if todo is None:
+        raise ValueError(f"Folder not found: {path}")
+
+    if slots.get("dry_run"):
+        ops = list(todo)
+        todo.close()
+        lines = "".join(f"\n- {op.name} → {op.category}/" for op in ops[:20])
+        more = f"\n- … and {len(ops) - 20} more" if len(ops) > 20 else ""
+        return f"🔍 Dry run: {len(ops)} file(s) would be moved.{lines}{more}"
 
-    print(f"\n✅ Done. {'Simulated' if dry_run else 'Moved'}: {moved}, Skipped: {skipped}")
+    ev = None
+    for ev in apply(todo, cancel=ctx.cancel):
+        if ctx.progress:
+            ctx.progress(ev)
+    skipped = ev.skipped + ev.plan_skipped
+    if ev.kind == "cancelled":
+        return f"⏹ Organizing stopped: {ev.moved} moved, {skipped} skipped (undo with file_agent.undo)."
+    return f"✅ Files organized: {ev.moved} moved, {skipped} skipped."
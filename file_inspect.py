@@ -0,0 +1,268 @@
+# file_inspect.py
+"""
+Optional content stage for the file organizer.
+
+Sniffing:   the first HEADER_BYTES of a file are memory-mapped and matched
+            against known magic numbers, so files with no extension or the
+            wrong one still land in the right category.
+Duplicates: candidates are grouped by size, then by a hash of the first
+            and last BLOCK bytes, and only files that still collide are
+            hashed in full (in CHUNK pieces). Most files are never read
+            past their header.
+
+Sniff results and hashes are cached in memory.db keyed by
+(device, inode, mtime_ns, size), so unchanged files cost nothing on the
+next run.
+"""
+import hashlib
+import mmap
+import os
+import sqlite3
+import stat as stat_mod
+from collections import defaultdict
+
+FINGERPRINT_DB = "memory.db"
+HEADER_BYTES = 64
+BLOCK = 64 * 1024
+CHUNK = 1024 * 1024
+
+DUPLICATES_DIR = "Duplicates"
+
+# (offset, magic, category, is_container). Containers (zip, RIFF, ...) also
+# wrap formats with their own extensions (docx, xlsx, ...), so they only
+# decide the category of files whose extension says nothing.
+_SIGNATURES = [
+    (0, b"\xff\xd8\xff", "Images", False),
+    (0, b"\x89PNG\r\n\x1a\n", "Images", False),
+    (0, b"GIF87a", "Images", False),
+    (0, b"GIF89a", "Images", False),
+    (0, b"II*\x00", "Images", False),
+    (0, b"MM\x00*", "Images", False),
+    (0, b"%PDF-", "PDFs", False),
+    (0, b"Rar!\x1a\x07", "Archives", False),
+    (0, b"7z\xbc\xaf\x27\x1c", "Archives", False),
+    (0, b"\x1f\x8b", "Archives", False),
+    (0, b"BZh", "Archives", False),
+    (0, b"PK\x03\x04", "Archives", True),
+    (0, b"ID3", "Audio", False),
+    (0, b"fLaC", "Audio", False),
+    (0, b"OggS", "Audio", False),
+    (0, b"\x1aE\xdf\xa3", "Videos", False),
+    (0, b"8BPS", "Design", False),
+    (0, b"MZ", "Executables", True),
+]
+# Formats built on another format: their own extension wins over the
+# signature they carry (an .ai file starts with %PDF-, a .docx is a zip)
+_CARRIED_BY = {
+    ".ai": "PDFs",
+    **dict.fromkeys((".docx", ".xlsx", ".pptx", ".odt", ".ods", ".odp",
+                     ".epub", ".jar", ".apk"), "Archives"),
+}
+_RIFF_KINDS = {b"WAVE": "Audio", b"AVI ": "Videos", b"WEBP": "Images"}
+_FTYP_BRANDS = {b"M4A ": "Audio", b"M4B ": "Audio", b"heic": "Images", b"heix": "Images",
+                b"mif1": "Images", b"avif": "Images"}
+
+
+def _match_header(head: bytes):
+    """(category, is_container) for a file header, or None"""
+    if head[:4] == b"RIFF" and head[8:12] in _RIFF_KINDS:
+        return _RIFF_KINDS[head[8:12]], True
+    if head[4:8] == b"ftyp":
+        return _FTYP_BRANDS.get(head[8:12], "Videos"), False
+    for offset, magic, cat, container in _SIGNATURES:
+        if head.startswith(magic, offset):
+            return cat, container
+    return None
+
+
+def _read_header(path: str, size: int) -> bytes:
+    if size == 0:
+        return b""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), min(size, HEADER_BYTES), access=mmap.ACCESS_READ) as m:
+            return m[:]
+
+
+def _partial_hash(path: str, size: int) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        h.update(f.read(BLOCK))
+        if size > 2 * BLOCK:
+            f.seek(-BLOCK, os.SEEK_END)
+            h.update(f.read(BLOCK))
+        elif size > BLOCK:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _full_hash(path: str) -> str:
+    h = hashlib.blake2b()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class FingerprintCache:
+    """(dev, inode, mtime_ns, size) -> sniffed category / partial / full hash"""
+
+    def __init__(self, db_path: str = FINGERPRINT_DB):
+        self._db = sqlite3.connect(db_path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS file_fingerprints ("
+            " dev INTEGER, inode INTEGER, mtime_ns INTEGER, size INTEGER,"
+            " sniffed TEXT, partial TEXT, full TEXT,"
+            " PRIMARY KEY (dev, inode, mtime_ns, size))"
+        )
+        self._rows = {}
+        self._dirty = set()
+
+    def _row(self, key: tuple) -> dict:
+        row = self._rows.get(key)
+        if row is None:
+            found = self._db.execute(
+                "SELECT sniffed, partial, full FROM file_fingerprints"
+                " WHERE dev = ? AND inode = ? AND mtime_ns = ? AND size = ?", key
+            ).fetchone()
+            row = dict(zip(("sniffed", "partial", "full"), found or (None, None, None)))
+            self._rows[key] = row
+        return row
+
+    def get(self, key: tuple, field: str):
+        return self._row(key)[field]
+
+    def put(self, key: tuple, field: str, value):
+        self._row(key)[field] = value
+        self._dirty.add(key)
+
+    def flush(self):
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO file_fingerprints"
+                " (dev, inode, mtime_ns, size, sniffed, partial, full) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((*k, self._rows[k]["sniffed"], self._rows[k]["partial"], self._rows[k]["full"])
+                 for k in self._dirty),
+            )
+        self._dirty.clear()
+
+    def close(self):
+        self.flush()
+        self._db.close()
+
+
+class FileInspector:
+    def __init__(self, cache: FingerprintCache | None = None):
+        self.cache = cache or FingerprintCache()
+
+    @staticmethod
+    def _key(st: os.stat_result) -> tuple:
+        return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def sniff(self, path: str, st: os.stat_result):
+        """(category, is_container) from the file's magic number, or None"""
+        key = self._key(st)
+        cached = self.cache.get(key, "sniffed")
+        if cached is None:
+            try:
+                match = _match_header(_read_header(path, st.st_size))
+            except (OSError, ValueError):
+                match = None
+            cached = f"{match[0]}|{int(match[1])}" if match else ""
+            self.cache.put(key, "sniffed", cached)
+        if not cached:
+            return None
+        cat, container = cached.split("|")
+        return cat, container == "1"
+
+    def _hash(self, path: str, st: os.stat_result, field: str) -> str:
+        key = self._key(st)
+        value = self.cache.get(key, field)
+        if value is None:
+            value = _partial_hash(path, st.st_size) if field == "partial" else _full_hash(path)
+            self.cache.put(key, field, value)
+        return value
+
+    def duplicate_groups(self, files: list) -> list:
+        """
+        files: (path, stat) pairs. Returns lists of paths with identical
+        content (size -> partial hash -> full hash), in input order.
+        """
+        by_size = defaultdict(list)
+        for path, st in files:
+            if st.st_size:
+                by_size[st.st_size].append((path, st))
+
+        groups = []
+        for same_size in by_size.values():
+            if len(same_size) < 2:
+                continue
+            by_partial = defaultdict(list)
+            for path, st in same_size:
+                by_partial[self._hash(path, st, "partial")].append((path, st))
+            for candidates in by_partial.values():
+                if len(candidates) < 2:
+                    continue
+                if candidates[0][1].st_size <= 2 * BLOCK:
+                    # partial hash already covered the whole file
+                    groups.append([p for p, _ in candidates])
+                    continue
+                by_full = defaultdict(list)
+                for path, st in candidates:
+                    by_full[self._hash(path, st, "full")].append(path)
+                groups.extend(g for g in by_full.values() if len(g) > 1)
+        return groups
+
+
+def refine_jobs(root: str, jobs: list, managed_dirs) -> list:
+    """
+    Content stage for file_agent.organize_files.
+    jobs: (name, src, cat, stat) from the scan. Returns new jobs where
+    sniffed categories replace "Others" and categories the content
+    contradicts (except for _CARRIED_BY formats), and files whose content
+    already exists (in a category folder or earlier in the batch) go to
+    DUPLICATES_DIR instead.
+    """
+    inspector = FileInspector()
+    try:
+        # regular files only: symlinks are moved as-is, never read through
+        stats = {}
+        for name, src, cat, _ in jobs:
+            try:
+                st = os.stat(src, follow_symlinks=False)
+            except OSError:
+                continue
+            if stat_mod.S_ISREG(st.st_mode):
+                stats[src] = st
+
+        refined = {}
+        for name, src, cat, stat in jobs:
+            st = stats.get(src)
+            if st is not None:
+                sniffed = inspector.sniff(src, st)
+                if sniffed and sniffed[0] != cat and (cat == "Others" or not sniffed[1]):
+                    if _CARRIED_BY.get(os.path.splitext(name)[1].lower()) != sniffed[0]:
+                        cat = sniffed[0]
+            refined[src] = (name, src, cat, stat)
+
+        # files already organized take part in size grouping, so a new
+        # copy of something filed earlier is caught too
+        existing = []
+        for folder in managed_dirs:
+            if folder == DUPLICATES_DIR:
+                continue
+            try:
+                with os.scandir(os.path.join(root, folder)) as it:
+                    existing.extend((e.path, e.stat()) for e in it if e.is_file(follow_symlinks=False))
+            except FileNotFoundError:
+                continue
+
+        candidates = existing + list(stats.items())
+        for group in inspector.duplicate_groups(candidates):
+            # keep the first (an already-filed copy if there is one), divert the rest
+            for dup in group[1:]:
+                if dup in refined:
+                    name, src, _, stat = refined[dup]
+                    refined[dup] = (name, src, DUPLICATES_DIR, stat)
+        return [refined[src] for _, src, _, _ in jobs]
+    finally:
+        inspector.cache.close()
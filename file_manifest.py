@@ -0,0 +1,112 @@
+# file_manifest.py
+"""
+Manifest index for incremental organizer runs (tables in memory.db).
+
+organizer_dirs:  one row per scanned directory and mode (recursive or
+                 not) -- (mtime_ns, inode) as seen after the last pass
+                 plus its sub-directories. A directory's mtime only
+                 changes when entries are added, removed or renamed in
+                 it, so an unchanged row means there is nothing new to
+                 organize there and its listing can be skipped. Rows are
+                 only reused by a run in the same mode: a flat run
+                 doesn't read sub-directories, a recursive one does.
+organizer_files: one row per moved file -- (path, size, mtime, inode,
+                 category, destination).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+MANIFEST_DB = "memory.db"
+
+
+class FileManifest:
+    def __init__(self, root: str, recursive: bool = False, db_path: str = MANIFEST_DB):
+        self.root = root
+        self.recursive = int(recursive)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(organizer_dirs)")}
+        if columns and "recursive" not in columns:
+            # rows written before the mode was recorded: only a cache, start over
+            self._db.execute("DROP TABLE organizer_dirs")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS organizer_dirs ("
+            " root TEXT NOT NULL,"
+            " recursive INTEGER NOT NULL,"
+            " path TEXT NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " inode INTEGER NOT NULL,"
+            " subdirs TEXT NOT NULL,"
+            " PRIMARY KEY (root, recursive, path))"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS organizer_files ("
+            " root TEXT NOT NULL,"
+            " path TEXT NOT NULL,"
+            " size INTEGER,"
+            " mtime REAL,"
+            " inode INTEGER,"
+            " category TEXT NOT NULL,"
+            " destination TEXT NOT NULL,"
+            " moved_at REAL NOT NULL,"
+            " PRIMARY KEY (root, path))"
+        )
+        self._db.commit()
+        # directory rows are few next to files: keep them all in memory
+        self._dirs = {
+            path: (mtime_ns, inode, json.loads(subdirs))
+            for path, mtime_ns, inode, subdirs in self._db.execute(
+                "SELECT path, mtime_ns, inode, subdirs FROM organizer_dirs"
+                " WHERE root = ? AND recursive = ?", (root, self.recursive)
+            )
+        }
+
+    def unchanged_subdirs(self, path: str, st: os.stat_result) -> list | None:
+        """Recorded sub-directories if `path` hasn't changed since the last pass, else None."""
+        known = self._dirs.get(path)
+        if known and known[0] == st.st_mtime_ns and known[1] == st.st_ino:
+            return known[2]
+        return None
+
+    def record_dirs(self, dirs: dict):
+        """dirs: path -> list of sub-directory paths; stats are taken now (after moves)."""
+        rows = []
+        for path, subdirs in dirs.items():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            rows.append((self.root, self.recursive, path, st.st_mtime_ns, st.st_ino, json.dumps(subdirs)))
+            self._dirs[path] = (st.st_mtime_ns, st.st_ino, subdirs)
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO organizer_dirs (root, recursive, path, mtime_ns, inode, subdirs)"
+                " VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def forget_dirs(self, paths):
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM organizer_dirs WHERE root = ? AND recursive = ? AND path = ?",
+                ((self.root, self.recursive, p) for p in paths),
+            )
+        for p in paths:
+            self._dirs.pop(p, None)
+
+    def record_moves(self, moves: list):
+        """moves: (src, size, mtime, inode, category, destination) tuples"""
+        now = time.time()
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO organizer_files"
+                " (root, path, size, mtime, inode, category, destination, moved_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((self.root, *m, now) for m in moves),
+            )
+
+    def close(self):
+        self._db.close()
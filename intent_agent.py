@@ -1,6 +1,71 @@
 import re
+import copy
 import json
 import os
+import threading
+from collections import deque
+from itertools import islice
+
+import tracing
+
+# llm_client (asyncio + openai), llm_cache (sqlite3), the process pool and
+# time_parser (its token table) are imported on first use: the rule-based
+# path for chat and email needs none of them.
+
+# ================================================================
+# Precompiled patterns (built once at import, reused on every call)
+# ================================================================
+
+# Applied in order: " at the rate " must win over " at ".
+_SPOKEN_EMAIL_REPLACEMENTS = (
+    (" at the rate ", "@"),
+    (" at ", "@"),
+    (" underscore ", "_"),
+    (" under score ", "_"),
+    (" dot ", "."),
+    (" dash ", "-"),
+    (" hyphen ", "-"),
+    (" space ", ""),
+)
+_EMAIL_PUNCT_RE = re.compile(r"\s*([@.])\s*")
+_EMAIL_RE = re.compile(r"[\w\.-]+@[\w\.-]+\.\w+")
+
+# LLM cache keys: emails and clock times are masked so that phrasings that
+# only differ in those share one cached parse. Only parses whose masked
+# spans sit in slots _refill_slots() rewrites are stored (_cacheable).
+_CACHE_TIME_RE = re.compile(r"\b\d{1,2}(?::\d{2})?\s?(?:am|pm)\b|\b\d{1,2}:\d{2}\b")
+_WS_RE = re.compile(r"\s+")
+
+_CHAT_KEYWORDS = ("what is", "who are you", "explain", "tell me", "define ")
+
+# Whole rule grammar as one alternation, tried in the same priority order as
+# the original if/elif cascade. Each branch is anchored at the start (like
+# re.match) and names its own slots, so a single match picks the intent and
+# extracts every slot.
+_REMIND_TIME = r"[^\s]+(?:\s?(?:am|pm))?"
+_INTENT_RE = re.compile(
+    # CHAT: keyword anywhere in the command (lookahead, consumes nothing)
+    r"(?P<chat>(?=(?s:.)*?(?:" + "|".join(re.escape(k) for k in _CHAT_KEYWORDS) + r")))"
+    # EMAIL: "send happy birthday to someone@example.com"
+    r"|(?P<bday>send (?:a )?(?:happy birthday|birthday wish|birthday message) to (?P<bday_to>.+))"
+    # EMAIL: "send email to someone@example.com <message>"
+    r"|(?P<email>send email to (?P<email_to>\S+)\s+(?P<email_msg>.+))"
+    # REMINDER A: "remind me to <message> at <time> [email me|to my mail <email>]"
+    r"|(?P<remind_a>(?:remind me|set reminder)\s+(?:to\s+)?(?P<a_msg>.+?)\s+(?:at|@)\s+"
+    r"(?P<a_time>" + _REMIND_TIME + r")\s*"
+    r"(?:.*?(?P<a_email_me>email me)|.*?(?:to|at)\s*(?:my\s*)?mail\s*(?P<a_email>\S+))?$)"
+    # REMINDER B: "remind me at <time> to <message> [email me|to my mail <email>]"
+    r"|(?P<remind_b>(?:remind me|set reminder)\s+(?:at|@)\s+(?P<b_time>" + _REMIND_TIME + r")\s+"
+    r"(?:to\s+)?(?P<b_msg>.+?)"
+    r"(?:\s*(?P<b_email_me>email me)|\s*(?:to|at)\s*(?:my\s*)?mail\s*(?P<b_email>\S+))?$)"
+    # REMINDER N: any other wording, the time phrase is found by time_parser
+    r"|(?P<remind_n>(?:remind me|set reminder)\s+(?P<n_body>.+?)"
+    r"(?:\s*(?P<n_email_me>email me)|\s*(?:to|at)\s*(?:my\s*)?mail\s*(?P<n_email>\S+))?$)"
+)
+
+# words left at the edges of a reminder message once its time phrase is cut out
+_MESSAGE_EDGE_WORDS = {"to", "at", "@", "on", "in", "and"}
+
 
 # ================================================================
 # Helpers
@@ -10,28 +75,17 @@ def normalize_spoken_email(text: str) -> str | None:
     if not text:
         return None
     t = text.lower().strip()
-    replacements = {
-        " at the rate ": "@",
-        " at ": "@",
-        " underscore ": "_",
-        " under score ": "_",
-        " dot ": ".",
-        " dash ": "-",
-        " hyphen ": "-",
-        " space ": "",
-    }
-    for spoken, symbol in replacements.items():
+    for spoken, symbol in _SPOKEN_EMAIL_REPLACEMENTS:
         t = t.replace(spoken, symbol)
-    t = re.sub(r"\s*@\s*", "@", t)
-    t = re.sub(r"\s*\.\s*", ".", t)
-    return t
+    # one pass drops whitespace around both "@" and "."
+    return _EMAIL_PUNCT_RE.sub(r"\1", t)
 
 
 def extract_email_and_message(text: str):
     if not text:
         return None, None
     text_norm = normalize_spoken_email(text)
-    email_match = re.search(r"[\w\.-]+@[\w\.-]+\.\w+", text_norm or "")
+    email_match = _EMAIL_RE.search(text_norm or "")
     email = email_match.group(0) if email_match else None
     msg = (text_norm or "").replace(email, "", 1).strip() if email else None
     return email, msg
@@ -59,44 +113,92 @@ def parse_time_from_text(text: str) -> str | None:
       23:20am (messy but seen in speech)
     Returns HH:MM (24h) or None
     """
-    t = text.lower().strip().replace(" ", "")
-    # 1) H:MM(am|pm)? or HH:MM(am|pm)?
-    m = re.search(r"\b(\d{1,2}):(\d{2})(am|pm)?\b", t)
-    if m:
-        hh = int(m.group(1)); mm = int(m.group(2)); ap = m.group(3)
-        return _to_hhmm(hh, mm, ap)
-    # 2) H(am|pm)
-    m = re.search(r"\b(\d{1,2})(am|pm)\b", t)
-    if m:
-        hh = int(m.group(1)); ap = m.group(2)
-        return _to_hhmm(hh, 0, ap)
-    # 3) Bare HH:MM 24h
-    m = re.search(r"\b(\d{1,2}):(\d{2})\b", t)
-    if m:
-        hh = int(m.group(1)); mm = int(m.group(2))
-        return _to_hhmm(hh, mm, None)
-    return None
+    import time_parser
+    clock = time_parser.parse_clock(text)
+    return f"{clock[0]:02d}:{clock[1]:02d}" if clock else None
+
+
+def _natural_reminder(body: str, email_me_flag: bool, email_to: str | None):
+    """
+    Reminder whose time isn't a plain clock ("tomorrow at 9", "in 20
+    minutes", "every monday 7pm"). The time phrase goes into the "time"
+    slot as written; reminder_agent resolves it when the action runs.
+    """
+    import time_parser
+    tokens = time_parser.tokenize(body)
+    when = time_parser.parse_tokens(tokens)
+    if when is None:
+        return None
+    # "at" stays in the phrase: "at 5" resolves, a bare "5" doesn't
+    phrase = tokens[when.start:when.end]
+    return _reminder(" ".join(phrase), _trim_message(tokens[:when.start] + tokens[when.end:]),
+                     email_me_flag, email_to)
+
+
+def _at_reminder(message: str, timestr_raw: str, time_first: bool,
+                 email_me_flag: bool, email_to: str | None):
+    """
+    "remind me to <message> at <time>" / "remind me at <time> <message>".
+    The captured time is the reminder time; only date words right next to
+    it join it ("call mom tomorrow at 9", "at 9am every monday stretch").
+    Nothing else in the message is read as a time.
+    """
+    hhmm = parse_time_from_text(timestr_raw)
+    import time_parser
+    words = time_parser.tokenize(message)
+    k = time_parser.date_words(words, leading=time_first)
+    at = ["at"] + time_parser.tokenize(timestr_raw)
+    if k:
+        if time_first:
+            phrase, rest = at + words[:k], words[k:]
+        else:
+            phrase, rest = words[-k:] + at, words[:-k]
+        if time_parser.parse_tokens(phrase) is not None:
+            return _reminder(" ".join(phrase), _trim_message(rest), email_me_flag, email_to)
+    if hhmm is None and time_parser.parse_tokens(at) is not None:
+        hhmm = " ".join(at)     # "at 5", "at noon"
+    # plain clock time (or none, and the agent asks for one)
+    return _reminder(hhmm, message, email_me_flag, email_to)
+
+
+def _trim_message(words: list[str]) -> str | None:
+    while words and words[0] in _MESSAGE_EDGE_WORDS:
+        words = words[1:]
+    while words and words[-1] in _MESSAGE_EDGE_WORDS:
+        words = words[:-1]
+    return " ".join(words) or None
+
+
+def _reminder(time_slot: str | None, message: str | None, email_me_flag: bool, email_to: str | None):
+    return [{
+        "intent": "set_reminder",
+        "slots": {"time": time_slot, "message": message, "email_me": email_me_flag, "email_to": email_to}
+    }]
 
 
 # ================================================================
 # RULE-BASED INTENT DETECTION
 # ================================================================
 
+@tracing.traced("rule_based_parse")
 def _rule_based_parse(text: str):
     original = text
     t = text.lower().strip()
     # strip wake words just in case
     t = t.replace("hey jarvis", "").replace("jarvis", "").strip()
 
+    m = _INTENT_RE.match(t)
+    if not m:
+        return None
+    kind = m.lastgroup
+
     # ----- CHAT -----
-    if any(q in t for q in ["what is", "who are you", "explain", "tell me", "define "]):
+    if kind == "chat":
         return [{"intent": "chat", "slots": {"query": original}}]
 
     # ----- EMAIL: "send happy birthday to someone@example.com"
-    m = re.match(r"send (?:a )?(?:happy birthday|birthday wish|birthday message) to (.+)", t)
-    if m:
-        email_or_name = m.group(1).strip()
-        email = normalize_spoken_email(email_or_name)
+    if kind == "bday":
+        email = normalize_spoken_email(m.group("bday_to").strip())
         return [{
             "intent": "send_email",
             "slots": {
@@ -107,64 +209,29 @@ def _rule_based_parse(text: str):
         }]
 
     # ----- EMAIL: "send email to someone@example.com <message>"
-    m = re.match(r"send email to (\S+)\s+(.+)", t)
-    if m:
-        email = normalize_spoken_email(m.group(1))
-        msg = m.group(2)
+    if kind == "email":
+        email = normalize_spoken_email(m.group("email_to"))
+        msg = m.group("email_msg")
         return [{"intent": "send_email", "slots": {"to": email, "subject": "Automated Email", "message": msg}}]
 
-    # ----- REMINDER patterns -----
-
-    # A) "remind me to <message> at <time> [email me|to my mail <email>]"
-    m = re.match(
-        r"(?:remind me|set reminder)\s+(?:to\s+)?(.+?)\s+(?:at|@)\s+([^\s]+(?:\s?(?:am|pm))?)\s*(?:.*?(email me)|.*?(?:to|at)\s*(?:my\s*)?mail\s*(\S+))?$",
-        t
-    )
-    if m:
-        message = m.group(1).strip()
-        timestr_raw = m.group(2).strip()
-        email_me_flag = bool(m.group(3))
-        email_raw = m.group(4)
-        hhmm = parse_time_from_text(timestr_raw)
-        email_to = normalize_spoken_email(email_raw) if email_raw else None
-        return [{
-            "intent": "set_reminder",
-            "slots": {"time": hhmm, "message": message, "email_me": email_me_flag, "email_to": email_to}
-        }]
-
-    # B) "remind me at <time> to <message> [email me|to my mail <email>]"
-    m = re.match(
-        r"(?:remind me|set reminder)\s+(?:at|@)\s+([^\s]+(?:\s?(?:am|pm))?)\s+(?:to\s+)?(.+?)(?:\s*(email me)|\s*(?:to|at)\s*(?:my\s*)?mail\s*(\S+))?$",
-        t
-    )
-    if m:
-        timestr_raw = m.group(1).strip()
-        message = m.group(2).strip()
-        email_me_flag = bool(m.group(3))
-        email_raw = m.group(4)
-        hhmm = parse_time_from_text(timestr_raw)
-        email_to = normalize_spoken_email(email_raw) if email_raw else None
-        return [{
-            "intent": "set_reminder",
-            "slots": {"time": hhmm, "message": message, "email_me": email_me_flag, "email_to": email_to}
-        }]
+    # ----- REMINDER patterns (A: message first, B: time first, N: anything else) -----
+    p = kind[-1] + "_"
+    email_me_flag = bool(m.group(p + "email_me"))
+    email_raw = m.group(p + "email")
+    email_to = normalize_spoken_email(email_raw) if email_raw else None
+    if kind == "remind_n":
+        return _natural_reminder(m.group("n_body"), email_me_flag, email_to)
 
-    return None
+    message = m.group(p + "msg").strip()
+    timestr_raw = m.group(p + "time").strip()
+    return _at_reminder(message, timestr_raw, kind == "remind_b", email_me_flag, email_to)
 
 
 # ================================================================
 # LLM FALLBACK
 # ================================================================
 
-def _llm_parse(text: str):
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        return None
-
-    from openai import OpenAI
-    client = OpenAI(api_key=api_key)
-
-    system_prompt = """
+_LLM_SYSTEM_PROMPT = """
 You are an intent extractor for a CLI assistant.
 
 Allowed intents:
@@ -182,60 +249,338 @@ If they provide an email inside text, set "email_to".
 Return ONLY valid JSON array.
 """
 
-    try:
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": text}
-            ]
-        )
-        raw = resp.choices[0].message.content.strip()
-        raw = raw.replace("```json", "").replace("```", "")
-        parsed = json.loads(raw)
-        parsed = parsed if isinstance(parsed, list) else [parsed]
-
-        # Post-fix: try to fill missing reminder slots using our parser
-        for item in parsed:
-            if item.get("intent") == "set_reminder":
-                slots = item.setdefault("slots", {})
-                # try to parse time if missing
-                if not slots.get("time"):
-                    slots["time"] = parse_time_from_text(text)
-                # try to parse message if missing
-                if not slots.get("message"):
-                    # crude: strip the leading verb and time phrase
-                    msg = re.sub(r"(remind me|set reminder)\s+(to\s+)?", "", text, flags=re.I)
-                    msg = re.sub(r"\s+(at|@)\s+.*$", "", msg, flags=re.I).strip()
-                    slots["message"] = msg or None
-                # email flags
-                if "email me" in text.lower() and not slots.get("email_me"):
-                    slots["email_me"] = True
-                if not slots.get("email_to"):
-                    e,_ = extract_email_and_message(text)
-                    slots["email_to"] = e
-
-        return parsed
+_LLM_BATCH_SUFFIX = """
+You will receive a JSON array of separate commands.
+Return ONLY a JSON array with exactly one entry per command, in the same
+order, where each entry is that command's JSON array of intents.
+"""
+
+
+def _strip_json_fence(raw: str) -> str:
+    return raw.strip().replace("```json", "").replace("```", "")
+
+
+def _fill_reminder_slots(parsed: list, text: str) -> list:
+    """Post-fix: try to fill missing reminder slots using our parser"""
+    for item in parsed:
+        if item.get("intent") == "set_reminder":
+            slots = item.setdefault("slots", {})
+            # try to parse time if missing
+            if not slots.get("time"):
+                slots["time"] = parse_time_from_text(text)
+            # try to parse message if missing
+            if not slots.get("message"):
+                # crude: strip the leading verb and time phrase
+                msg = re.sub(r"(remind me|set reminder)\s+(to\s+)?", "", text, flags=re.I)
+                msg = re.sub(r"\s+(at|@)\s+.*$", "", msg, flags=re.I).strip()
+                slots["message"] = msg or None
+            # email flags
+            if "email me" in text.lower() and not slots.get("email_me"):
+                slots["email_me"] = True
+            if not slots.get("email_to"):
+                e,_ = extract_email_and_message(text)
+                slots["email_to"] = e
+    return parsed
+
+
+# ================================================================
+# LLM RESULT CACHE
+# ================================================================
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def _get_llm_cache():
+    # opened lazily so worker processes of interpret_many never touch the DB
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            from llm_cache import LLMCache
+            _llm_cache = LLMCache()
+        return _llm_cache
+
+
+def llm_cache_stats() -> dict:
+    """hits / misses / evictions / size of the LLM parse cache"""
+    return _get_llm_cache().stats()
+
+
+def _llm_cache_key(text: str) -> str:
+    t = _WS_RE.sub(" ", text.lower().strip())
+    t = _EMAIL_RE.sub("<email>", t)
+    # "v2": entries from before _cacheable() may hold stale free-text slots
+    return "v2:" + _CACHE_TIME_RE.sub("<time>", t)
+
+
+# slots _refill_slots() rewrites for the current text, per intent
+_REFILLED_SLOTS = {"set_reminder": ("time", "email_to"), "send_email": ("to",)}
+
+
+def _cacheable(parsed: list, text: str) -> bool:
+    """
+    Can `parsed` answer other commands with the same key? Only if every
+    masked time / email of `text` ends up in a slot _refill_slots()
+    rewrites. "email bob@x.com saying meet at 9am" puts the time in the
+    message, so caching it would send "meet at 9am" for "... at 10am".
+    """
+    t = text.lower()
+    spans = _EMAIL_RE.findall(t) + _CACHE_TIME_RE.findall(t)
+    if not spans:
+        return True
+    if len(_EMAIL_RE.findall(t)) > 1 or len(_CACHE_TIME_RE.findall(t)) > 1:
+        return False    # _refill_slots() only knows the first of each
+    for item in parsed:
+        refilled = _REFILLED_SLOTS.get(item.get("intent"), ())
+        for name, value in (item.get("slots") or {}).items():
+            if name in refilled or not isinstance(value, str):
+                continue
+            v = value.lower()
+            if any(s in v for s in spans) or _CACHE_TIME_RE.search(v) or _EMAIL_RE.search(v):
+                return False
+    return True
+
+
+def _refill_slots(cached: list, text: str) -> list:
+    """Re-fill the masked slots (time, emails) of a cached parse from `text`."""
+    parsed = copy.deepcopy(cached)
+    t = text.lower()
+    email_match = _EMAIL_RE.search(t)
+    # parse only the masked time phrase: parse_time_from_text strips spaces,
+    # which glues the time onto the preceding word ("water10:30pm")
+    time_match = _CACHE_TIME_RE.search(t)
+    for item in parsed:
+        slots = item.get("slots") or {}
+        if item.get("intent") == "set_reminder" and slots.get("time") and time_match:
+            slots["time"] = parse_time_from_text(time_match.group(0)) or slots["time"]
+        if email_match:
+            for name in ("to", "email_to"):
+                if slots.get(name):
+                    slots[name] = email_match.group(0)
+    return parsed
+
+
+def _cache_llm_result(text: str, parsed):
+    if parsed and _cacheable(parsed, text):
+        _get_llm_cache().put(_llm_cache_key(text), copy.deepcopy(parsed))
+    return parsed
+
+
+def _cached_llm_result(text: str):
+    cached = _get_llm_cache().get(_llm_cache_key(text))
+    return _refill_slots(cached, text) if cached else None
+
 
+# ================================================================
+# LLM CALLS
+# ================================================================
+
+def _llm_parse(text: str):
+    with tracing.span("llm_parse") as sp:
+        cached = _cached_llm_result(text)
+        sp.label("cache", "hit" if cached else "miss")
+        return cached or _llm_parse_uncached(text)
+
+
+def _llm_messages(text: str) -> list:
+    return [
+        {"role": "system", "content": _LLM_SYSTEM_PROMPT},
+        {"role": "user", "content": text}
+    ]
+
+
+def _parse_llm_reply(raw: str, text: str):
+    parsed = json.loads(_strip_json_fence(raw))
+    parsed = parsed if isinstance(parsed, list) else [parsed]
+    return _cache_llm_result(text, _fill_reminder_slots(parsed, text))
+
+
+def _llm_parse_uncached(text: str):
+    if not os.getenv("OPENAI_API_KEY"):
+        return None
+
+    import llm_client
+    try:
+        return _parse_llm_reply(llm_client.complete(_llm_messages(text)), text)
     except Exception as e:
         print("LLM parse failed:", e)
         return None
 
 
+async def _allm_parse(text: str):
+    with tracing.span("llm_parse") as sp:
+        cached = _cached_llm_result(text)
+        sp.label("cache", "hit" if cached else "miss")
+        if cached or not os.getenv("OPENAI_API_KEY"):
+            return cached
+
+        import llm_client
+        try:
+            return _parse_llm_reply(await llm_client.acomplete(_llm_messages(text)), text)
+        except Exception as e:
+            sp.fail()
+            print("LLM parse failed:", e)
+            return None
+
+
+def _llm_parse_batch(texts: list[str]) -> list:
+    """
+    Parse several unmatched commands with ONE completion request.
+    Returns a list aligned with `texts` (None where nothing usable came back).
+    Cached commands are answered without a request. If the batched answer
+    can't be lined up with the input, falls back to one request per command.
+    """
+    results = [_cached_llm_result(t) for t in texts]
+    missing = [i for i, r in enumerate(results) if not r]
+    if not missing:
+        return results
+    if len(missing) == 1:
+        results[missing[0]] = _llm_parse_uncached(texts[missing[0]])
+        return results
+    texts_to_send = [texts[i] for i in missing]
+
+    if not os.getenv("OPENAI_API_KEY"):
+        return results
+
+    import llm_client
+    try:
+        raw = llm_client.complete([
+            {"role": "system", "content": _LLM_SYSTEM_PROMPT + _LLM_BATCH_SUFFIX},
+            {"role": "user", "content": json.dumps(texts_to_send)}
+        ])
+        batch = json.loads(_strip_json_fence(raw))
+        if not isinstance(batch, list) or len(batch) != len(texts_to_send):
+            raise ValueError(f"expected {len(texts_to_send)} results, got {len(batch) if isinstance(batch, list) else batch!r}")
+    except Exception as e:
+        print("LLM batch parse failed, retrying one by one:", e)
+        for i in missing:
+            results[i] = _llm_parse_uncached(texts[i])
+        return results
+
+    for i, parsed in zip(missing, batch):
+        if parsed:
+            parsed = parsed if isinstance(parsed, list) else [parsed]
+            if not _well_formed(parsed):
+                # one bad entry ("oops", a bare string...) only costs that command a request
+                results[i] = _llm_parse_uncached(texts[i])
+                continue
+            results[i] = _cache_llm_result(texts[i], _fill_reminder_slots(parsed, texts[i]))
+    return results
+
+
+def _well_formed(parsed: list) -> bool:
+    """Every entry is an intent dict: {"intent": ..., "slots": {...} (optional)}"""
+    return all(isinstance(item, dict) and "intent" in item
+               and isinstance(item.get("slots", {}), dict) for item in parsed)
+
+
 # ================================================================
 # MAIN
 # ================================================================
 
+def _default_chat(text: str):
+    return [{"intent": "chat", "slots": {"query": text}}]
+
+
+def _labelled(sp, path: str, parsed: list) -> list:
+    # latency histograms are kept per path (rule / llm / default) and first intent
+    sp.label("path", path)
+    sp.label("intent", parsed[0].get("intent") if parsed else None)
+    return parsed
+
+
 def interpret(text: str):
-    parsed = _rule_based_parse(text)
-    if parsed:
-        print("⚡ Intent detected using RULE-BASED logic")
-        return parsed
+    with tracing.span("interpret") as sp:
+        parsed = _rule_based_parse(text)
+        if parsed:
+            print("⚡ Intent detected using RULE-BASED logic")
+            return _labelled(sp, "rule", parsed)
 
-    llm_parsed = _llm_parse(text)
-    if llm_parsed:
-        print("🧠 Intent detected using LLM")
-        return llm_parsed
+        llm_parsed = _llm_parse(text)
+        if llm_parsed:
+            print("🧠 Intent detected using LLM")
+            return _labelled(sp, "llm", llm_parsed)
 
-    print("❓ Unknown → defaulting to CHAT")
-    return [{"intent": "chat", "slots": {"query": text}}]
+        print("❓ Unknown → defaulting to CHAT")
+        return _labelled(sp, "default", _default_chat(text))
+
+
+async def ainterpret(text: str):
+    """Async variant of interpret(); the LLM fallback doesn't block the caller's loop."""
+    with tracing.span("interpret") as sp:
+        parsed = _rule_based_parse(text)
+        if parsed:
+            print("⚡ Intent detected using RULE-BASED logic")
+            return _labelled(sp, "rule", parsed)
+
+        llm_parsed = await _allm_parse(text)
+        if llm_parsed:
+            print("🧠 Intent detected using LLM")
+            return _labelled(sp, "llm", llm_parsed)
+
+        print("❓ Unknown → defaulting to CHAT")
+        return _labelled(sp, "default", _default_chat(text))
+
+
+# ================================================================
+# BATCH
+# ================================================================
+
+def _rule_based_parse_chunk(texts: list[str]) -> list:
+    # top-level so it can be pickled into worker processes
+    return [_rule_based_parse(t) for t in texts]
+
+
+def _chunks(iterable, size: int):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _resolve_chunk(texts: list[str], parsed: list, llm_batch_size: int):
+    """Send only the unmatched commands of a chunk to the LLM, in batches."""
+    missing = [i for i, p in enumerate(parsed) if not p]
+    for start in range(0, len(missing), llm_batch_size):
+        idx = missing[start:start + llm_batch_size]
+        for i, llm_parsed in zip(idx, _llm_parse_batch([texts[i] for i in idx])):
+            parsed[i] = llm_parsed
+    for text, p in zip(texts, parsed):
+        yield p or _default_chat(text)
+
+
+def interpret_many(texts, workers: int = 1, chunksize: int = 512, llm_batch_size: int = 20):
+    """
+    Streaming batch version of interpret().
+
+    texts:          any iterable of commands (consumed lazily)
+    workers:        >1 spreads rule-based parsing over a process pool
+    chunksize:      commands per worker task
+    llm_batch_size: unmatched commands per LLM request
+
+    Yields one action list per input, in input order. Only commands the rule
+    parser can't handle reach the LLM; anything still unknown becomes chat.
+    """
+    chunks = _chunks(texts, chunksize)
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _resolve_chunk(chunk, _rule_based_parse_chunk(chunk), llm_batch_size)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Keep a bounded window of chunks in flight so huge inputs stream
+    # instead of being submitted to the pool all at once.
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, pool.submit(_rule_based_parse_chunk, chunk)))
+            if len(pending) >= workers * 2:
+                chunk, fut = pending.popleft()
+                yield from _resolve_chunk(chunk, fut.result(), llm_batch_size)
+        while pending:
+            chunk, fut = pending.popleft()
+            yield from _resolve_chunk(chunk, fut.result(), llm_batch_size)
@@ -0,0 +1,107 @@
+# llm_cache.py
+"""
+Two-level cache for LLM results.
+
+L1: in-process LRU (OrderedDict) with size + TTL eviction.
+L2: SQLite table in memory.db, so entries survive restarts.
+
+Keys and values are plain strings / JSON-serializable objects; callers
+decide how to normalize keys (see intent_agent._llm_cache_key).
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_DB = "memory.db"
+
+
+class LLMCache:
+    def __init__(self, db_path: str | None = CACHE_DB, max_size: int = 1024, ttl: float = 7 * 24 * 3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lru = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " stored_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return now - stored_at > self.ttl
+
+    def _remember(self, key: str, stored_at: float, value):
+        # caller holds the lock
+        self._lru[key] = (stored_at, value)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if not self._expired(stored_at, now):
+                    self._lru.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._lru[key]
+                self.evictions += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, stored_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    raw, stored_at = row
+                    if not self._expired(stored_at, now):
+                        value = json.loads(raw)
+                        self._remember(key, stored_at, value)
+                        self.hits += 1
+                        return value
+                    self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._db.commit()
+                    self.evictions += 1
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value):
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, stored_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), now),
+                )
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._lru),
+            }
@@ -0,0 +1,158 @@
+# llm_client.py
+"""
+Shared LLM client used by chat_agent and intent_agent.
+
+A single AsyncOpenAI client (and therefore a single pooled HTTP
+connection pool) lives on a background event-loop thread for the whole
+process. Sync callers block on complete() or iterate stream() for
+token deltas; async callers await acomplete(). Either way requests share
+the pool, are limited by one semaphore, time out after LLM_TIMEOUT
+seconds and are retried with jittered exponential backoff on 429 / 5xx /
+connection errors.
+
+Point OPENAI_BASE_URL at a local server (see benchmarks/stub_openai.py)
+to run everything without the real API.
+"""
+import asyncio
+import os
+import queue
+import random
+import threading
+
+MODEL = "gpt-4o-mini"
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+BACKOFF_BASE = 0.5   # seconds, doubled per attempt
+BACKOFF_CAP = 8.0
+
+_loop = None
+_client = None
+_semaphore = None
+_lock = threading.Lock()
+
+_DONE = object()
+
+
+class _StreamError:
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+def _ensure_loop() -> asyncio.AbstractEventLoop:
+    """Start the background event loop thread once."""
+    global _loop, _semaphore
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="llm-client", daemon=True).start()
+            _semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+            _loop = loop
+        return _loop
+
+
+def _get_client():
+    # only ever called on the background loop, so no lock needed
+    global _client
+    if _client is None:
+        from openai import AsyncOpenAI
+        _client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            timeout=TIMEOUT,
+            max_retries=0,  # retries are ours, with jitter
+        )
+    return _client
+
+
+def _is_retryable(exc: Exception) -> bool:
+    import openai
+    if isinstance(exc, (openai.RateLimitError, openai.APIConnectionError)):
+        return True
+    return isinstance(exc, openai.APIStatusError) and exc.status_code >= 500
+
+
+def _backoff(attempt: int) -> float:
+    # "full jitter": spreads retries of concurrent callers apart
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+async def _with_retries(make_request):
+    """Run make_request() under the semaphore, retrying transient failures."""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with _semaphore:
+                return await make_request()
+        except Exception as e:
+            if attempt == MAX_RETRIES or not _is_retryable(e):
+                raise
+            await asyncio.sleep(_backoff(attempt))
+
+
+async def _create(messages: list, **kwargs):
+    client = _get_client()
+    return await _with_retries(
+        lambda: client.chat.completions.create(model=MODEL, messages=messages, **kwargs)
+    )
+
+
+async def _pump_stream(messages: list, out: queue.Queue, kwargs: dict):
+    """Push content deltas of a streamed completion into `out`, then _DONE."""
+    client = _get_client()
+    try:
+        # retries only cover opening the stream, never a half-sent reply
+        resp = await _with_retries(
+            lambda: client.chat.completions.create(model=MODEL, messages=messages, stream=True, **kwargs)
+        )
+        try:
+            async with _semaphore:
+                async for chunk in resp:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        out.put(delta)
+        finally:
+            await resp.close()
+    except Exception as e:
+        out.put(_StreamError(e))
+    finally:
+        out.put(_DONE)
+
+
+def _submit(coro):
+    return asyncio.run_coroutine_threadsafe(coro, _ensure_loop())
+
+
+async def _init_client():
+    _get_client()
+
+
+def warm_up():
+    """Start the loop and build the client in the background (doesn't wait)."""
+    _submit(_init_client())
+
+
+def complete(messages: list, **kwargs) -> str:
+    """Blocking chat completion; returns the reply text."""
+    resp = _submit(_create(messages, **kwargs)).result()
+    return resp.choices[0].message.content
+
+
+def stream(messages: list, **kwargs):
+    """Blocking generator of reply deltas as they arrive from the server."""
+    out = queue.Queue()
+    fut = _submit(_pump_stream(messages, out, kwargs))
+    try:
+        while True:
+            item = out.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _StreamError):
+                raise item.error
+            yield item
+    finally:
+        fut.cancel()  # consumer stopped early: stop reading the response
+
+
+async def acomplete(messages: list, **kwargs) -> str:
+    """Awaitable chat completion from any event loop; returns the reply text."""
+    resp = await asyncio.wrap_future(_submit(_create(messages, **kwargs)))
+    return resp.choices[0].message.content
@@ -2,12 +2,17 @@
 # main.py  (TEXT-ONLY JARVIS - NO VOICE)
 # ============================================================
 
-import os
 from intent_agent import interpret, extract_email_and_message
-from email_agent import send_email
-from reminder_agent import set_reminder_with_email as set_reminder
-from file_agent import organize_files
-from chat_agent import chat_reply
+from reminder_agent import start_reminders
+from chat_agent import chat_reply_stream, DISABLED_REPLY
+from dispatcher import HANDLERS, submit, warm_up
+from collections import deque
+import argparse
+import threading
+import tracing
+
+# recent chat turns (role, content), offered to chat_reply as context
+chat_turns = deque(maxlen=40)
 
 
 HELP = """
@@ -22,6 +27,10 @@ HELP = """
   remind me at 23:20 to stretch
   remind me to pray at 7pm email me
   remind me to send report at 9am to my mail someone@example.com
+  remind me to stretch in 20 minutes
+  remind me to call mom tomorrow at 9
+  remind me every monday 7pm to take out the trash
+  remind me to pay rent on the 5th
 
 🗂 File Organizer:
   organize files in "C:\\Users\\YourName\\Downloads"
@@ -36,103 +45,76 @@ Type **exit** to quit.
 """
 
 
-def dispatch_one(intent: str, slots: dict):
-    """Perform task based on extracted slots"""
+def fill_slots(intent: str, slots: dict):
+    """Ask for anything an action can't run without (before dispatch, one at a time)"""
     print(f"\n➡️ Debug: Intent={intent}, Slots={slots}")
 
-    # --------------------------------------------------------
-    # ✅ CHAT MODE (fallback message when API key disabled)
-    # --------------------------------------------------------
-    if intent == "chat":
-        query = slots.get("query") or "introduce yourself"
-        reply = chat_reply(query)
-
-        if "disabled by admin" in reply.lower():
-            print("⚠️ OpenAI API key is disabled by admin. Chat features unavailable.")
-        else:
-            print(f"🧠 Jarvis: {reply}")
-        return
-
-    # --------------------------------------------------------
-    # ✅ SEND EMAIL
-    # --------------------------------------------------------
     if intent == "send_email":
-        to = slots.get("to")
-        subject = slots.get("subject") or "Automated Email"
-        msg = slots.get("message")
-
         # Missing email → ask user
-        if not to:
+        if not slots.get("to"):
             print("🟡 Who should I send it to?")
             reply = input("📥 Email: ")
-            to, _ = extract_email_and_message(reply)
+            slots["to"], _ = extract_email_and_message(reply)
 
         # Missing message → ask user
-        if not msg:
+        if not slots.get("message"):
             print("🟡 What should be the message?")
-            msg = input("📥 Message: ")
-
-        if not (to and msg):
-            print("❌ Missing email address or message.")
-            return
-
-        send_email(to, subject, msg)
-        print(f"✅ Email sent to: {to}")
-        return
-
-    # --------------------------------------------------------
-    # ✅ REMINDER
-    # --------------------------------------------------------
-    if intent == "set_reminder":
-        time_str = slots.get("time")
-        message = slots.get("message")
-        email_to = slots.get("email_to")  # extracted if user says “to my email someone@example.com”
-
-        # If user said "email me", fallback to env
-        if not email_to and slots.get("email_me"):
-            email_to = os.getenv("GMAIL_EMAIL")
-
-        if not (time_str and message):
-            print("❌ Missing reminder time or message.")
-            return
-
-        set_reminder(time_str, message, email_to)
-
-        if email_to:
-            print(f"⏰ Reminder set for {time_str} (Email will be sent to {email_to})")
-        else:
-            print(f"⏰ Reminder set for {time_str}")
-        return
+            slots["message"] = input("📥 Message: ")
 
-    # --------------------------------------------------------
-    # ✅ FILE ORGANIZER
-    # --------------------------------------------------------
-    if intent == "organize_files":
-        path = slots.get("path")
-        dry = bool(slots.get("dry_run"))
 
-        if not path:
-            print("❌ Folder path missing.")
-            return
+def stream_chat(slots: dict):
+    """Print a chat reply as it streams in (fallback message when API key disabled)"""
+    query = slots.get("query") or "introduce yourself"
+    stream = chat_reply_stream(query, chat_turns)
+    first = next(stream, "")
 
-        organize_files(path, dry_run=dry)
-        print("✅ Files organized!" if not dry else "🔍 Dry run completed.")
+    if first == DISABLED_REPLY:
+        print("⚠️ OpenAI API key is disabled by admin. Chat features unavailable.")
         return
 
-    # --------------------------------------------------------
-    # ❓ UNKNOWN
-    # --------------------------------------------------------
-    print("❓ Unknown command. Type `help` to see what I can do.")
-    print(HELP)
-
+    ctx = stream.context
+    if ctx:
+        print(f"🧩 Context: {ctx.tokens} tokens, {ctx.memories} memories, {ctx.turns} turns, "
+              f"saved {ctx.saved}, +{ctx.build_ms:.1f} ms")
+
+    # print tokens as they arrive instead of waiting for the full reply
+    reply = [first]
+    print(f"🧠 Jarvis: {first}", end="", flush=True)
+    for delta in stream:
+        reply.append(delta)
+        print(delta, end="", flush=True)
+    print()
+    chat_turns.extend([("user", query), ("assistant", "".join(reply))])
+
+
+def run_actions(actions: list):
+    """
+    Start every non-chat action at once on the dispatcher, then report
+    results in the order they were asked for; chat replies stream in
+    their place.
+    """
+    for a in actions:
+        fill_slots(a.get("intent"), a.setdefault("slots", {}))
+
+    background = [i for i, a in enumerate(actions) if a.get("intent") != "chat"]
+    futures = dict(zip(background, submit([actions[i] for i in background])))
+
+    for i, a in enumerate(actions):
+        if i not in futures:
+            stream_chat(a["slots"])
+            continue
+        result = futures[i].result()
+        print(f"{result.message}  ({result.elapsed:.2f}s)")
+        if result.intent not in HANDLERS:
+            print("Type `help` to see what I can do.")
+            print(HELP)
 
-# ============================================================
-# ✅ MAIN LOOP (NO DUPLICATION)
-# ============================================================
 
-if __name__ == "__main__":
+def repl():
+    start_reminders()
     print("\n🤖 Jarvis Text Assistant Ready.")
     print("Type `help` to see commands. Type `exit` to quit.\n")
+    threading.Thread(target=warm_up, daemon=True).start()  # while the user types
 
     while True:
         user = input("\n🧑 You: ").strip()
@@ -145,6 +127,52 @@ if __name__ == "__main__":
             print(HELP)
             continue
 
-        actions = interpret(user)
-        for a in actions or []:
-            dispatch_one(a.get("intent"), a.get("slots", {}))
+        run_actions(interpret(user) or [])
+
+
+def profiled(fn, out: str):
+    """
+    Run fn() under cProfile and dump the stats to `out` (pstats format:
+    open with snakeviz, or `flameprof out > flame.svg` for a flame graph).
+    cProfile only sees this thread; dispatched handlers show up in the
+    tracing spans instead.
+    """
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(fn)
+    finally:
+        profiler.dump_stats(out)
+        print(f"\n📈 Profile written to {out}")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Jarvis text assistant")
+    parser.add_argument("--profile", nargs="?", const="jarvis.prof", metavar="FILE",
+                        help="profile the session with cProfile and dump stats to FILE (default jarvis.prof)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="record spans and append them to FILE as JSON lines")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="record spans and serve Prometheus metrics on 127.0.0.1:PORT/metrics")
+    return parser.parse_args(argv)
+
+
+# ============================================================
+# ✅ MAIN LOOP (NO DUPLICATION)
+# ============================================================
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.trace or args.metrics_port or args.profile:
+        tracing.enable(args.trace, args.metrics_port)
+    try:
+        if args.profile:
+            profiled(repl, args.profile)
+        else:
+            repl()
+    finally:
+        if tracing.enabled():
+            print("\n⏱️ Latency by span:")
+            print(tracing.summary())
@@ -1,39 +1,87 @@
 # memory_agent.py
+import atexit
 import json
 import os
+import threading
 
+from memory_store import MemoryStore
+
+# Legacy store: imported into memory.db on first use, then renamed
+# to memory.json.migrated so it is never imported twice.
 MEMORY_FILE = "memory.json"
 
+_store = None
+_index = None   # memory_index.RecallIndex, built on the first recall
+_lock = threading.Lock()
 
-def init_memory():
+
+def _migrate_json(store: MemoryStore):
     if not os.path.exists(MEMORY_FILE):
-        with open(MEMORY_FILE, "w") as f:
-            json.dump({}, f)
+        return
+    try:
+        with open(MEMORY_FILE, "r") as f:
+            data = json.load(f)
+    except json.JSONDecodeError:
+        data = {}
+    store.put_many((str(k).lower(), str(v)) for k, v in data.items())
+    os.replace(MEMORY_FILE, MEMORY_FILE + ".migrated")
+    print(f"💾 Migrated {len(data)} memories from {MEMORY_FILE} to memory.db")
+
+
+def _get_store() -> MemoryStore:
+    global _store
+    with _lock:
+        if _store is None:
+            _store = MemoryStore()
+            _migrate_json(_store)
+            atexit.register(_store.flush)
+        return _store
+
+
+def _get_index():
+    global _index
+    store = _get_store()
+    with _lock:
+        if _index is None:
+            from memory_index import RecallIndex  # numpy: only once recall is used
+            _index = RecallIndex()
+            _index.add_many((k, f"{k} {v}") for k, v in store.items().items())
+        return _index
+
+
+def init_memory():
+    _get_store()
 
 
 def save_memory(key: str, value: str):
-    data = load_all_memory()
-    data[key.lower()] = value
+    key = key.lower()
+    _get_store().put(key, value)
+    if _index is not None:
+        _index.add(key, f"{key} {value}")
+    print("💾 Saved memory:", key)
 
-    with open(MEMORY_FILE, "w") as f:
-        json.dump(data, f, indent=4)
 
-    print("💾 Saved memory:", data)
+def delete_memory(key: str):
+    key = key.lower()
+    _get_store().delete(key)
+    if _index is not None:
+        _index.delete(key)
 
 
 def load_all_memory():
-    if not os.path.exists(MEMORY_FILE):
-        return {}
-
-    with open(MEMORY_FILE, "r") as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return {}
+    return _get_store().items()
 
 
 def get_memory(key: str):
-    data = load_all_memory()
-    return data.get(key.lower())
+    return _get_store().get(key.lower())
 
 
+def recall_memory(query: str, k: int = 3, min_score: float = 0.2) -> list:
+    """
+    Memories related to `query` even when the wording differs
+    ("what's my bank pin" finds "bank"). Returns up to k
+    (key, value, score) tuples, best first.
+    """
+    store = _get_store()
+    return [(key, store.get(key), score)
+            for key, score in _get_index().search(query, k, min_score)]
@@ -0,0 +1,146 @@
+# memory_index.py
+"""
+Offline similarity search over stored memories.
+
+Each memory ("key value") becomes a hashed bag of word and character
+trigram features (the hashing trick: no vocabulary to build or ship),
+log-scaled and L2-normalised, stored as one float32 row of a NumPy
+matrix. A query is hashed the same way, weighted by inverse document
+frequency so words like "what" or "my" count for little, and scored
+against every row with a single matrix-vector product. The best few
+rows are then re-scored on their exact tokens, so a small DIM costs
+little accuracy.
+
+Rows are added, replaced and deleted in place (deleted rows are zeroed
+and reused), and document frequencies are kept as running counts, so
+the index never needs a rebuild. Memory use is rows x DIM x 4 bytes
+(~100 MB at 100k memories with DIM=256) plus the indexed texts.
+"""
+import math
+import re
+import threading
+
+import numpy as np
+
+DIM = 256
+RERANK = 10   # rows shortlisted per requested result
+_WORD_RE = re.compile(r"\w+")
+
+
+def tokens(text: str) -> dict:
+    """Feature counts for `text`: words and the character trigrams of each word"""
+    counts = {}
+    for word in _WORD_RE.findall(text.lower()):
+        counts[word] = counts.get(word, 0) + 1
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            gram = padded[i:i + 3]
+            counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+def features(counts: dict, dim: int = DIM) -> np.ndarray:
+    """Hash token counts into a dense log-scaled vector"""
+    vec = np.zeros(dim, dtype=np.float32)
+    for tok, n in counts.items():
+        vec[hash(tok) % dim] += n
+    return np.log1p(vec)
+
+
+def _exact_score(weights: dict, text: str) -> float:
+    """Cosine of idf-weighted query tokens against the unhashed tokens of `text`"""
+    doc = {tok: math.log1p(n) for tok, n in tokens(text).items()}
+    dot = sum(w * doc[tok] for tok, w in weights.items() if tok in doc)
+    norm = math.sqrt(sum(v * v for v in doc.values()))
+    return dot / norm if norm else 0.0
+
+
+class RecallIndex:
+    def __init__(self, dim: int = DIM, capacity: int = 1024):
+        self.dim = dim
+        self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self._df = np.zeros(dim, dtype=np.float32)   # rows containing each feature
+        self._keys = []          # row -> key (None for free rows)
+        self._texts = []         # row -> indexed text, for re-ranking
+        self._rows = {}          # key -> row
+        self._free = []          # rows freed by delete(), reused first
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _row_for(self, key: str) -> int:
+        # caller holds the lock
+        row = self._rows.get(key)
+        if row is not None:
+            self._df -= self._matrix[row] > 0
+            return row
+        if self._free:
+            row = self._free.pop()
+        else:
+            row = len(self._keys)
+            if row == len(self._matrix):
+                grown = np.zeros((row * 2, self.dim), dtype=np.float32)
+                grown[:row] = self._matrix
+                self._matrix = grown
+            self._keys.append(None)
+            self._texts.append(None)
+        self._keys[row] = key
+        self._rows[key] = row
+        return row
+
+    def add(self, key: str, text: str):
+        """Index (or re-index) one memory"""
+        vec = features(tokens(text), self.dim)
+        norm = np.linalg.norm(vec)
+        if norm:
+            vec /= norm
+        with self._lock:
+            row = self._row_for(key)
+            self._matrix[row] = vec
+            self._texts[row] = text
+            self._df += vec > 0
+
+    def add_many(self, items):
+        """Index (key, text) pairs"""
+        for key, text in items:
+            self.add(key, text)
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            row = self._rows.pop(key, None)
+            if row is None:
+                return False
+            self._df -= self._matrix[row] > 0
+            self._matrix[row] = 0.0
+            self._keys[row] = None
+            self._texts[row] = None
+            self._free.append(row)
+            return True
+
+    def search(self, query: str, k: int = 5, min_score: float = 0.0) -> list:
+        """
+        Top-k (key, score) pairs, best first; scores are in [0, 1].
+        The matrix product shortlists RERANK * k rows; those are re-scored
+        on their unhashed tokens, which undoes hash collisions.
+        """
+        counts = tokens(query)
+        q = features(counts, self.dim)
+        with self._lock:
+            n = len(self._keys)
+            if not self._rows or not q.any():
+                return []
+            # smoothed idf from the running document frequencies
+            idf = np.log((1 + len(self._rows)) / (1 + self._df)) + 1.0
+            q *= idf
+            q /= np.linalg.norm(q)
+            scores = self._matrix[:n] @ q
+            m = min(k * RERANK, n)
+            shortlist = np.argpartition(-scores, m - 1)[:m]
+            candidates = [(self._keys[i], self._texts[i]) for i in shortlist if self._keys[i] is not None]
+
+        weights = {tok: math.log1p(c) * float(idf[hash(tok) % self.dim]) for tok, c in counts.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        weights = {tok: w / norm for tok, w in weights.items()}
+        ranked = sorted(((_exact_score(weights, text), key) for key, text in candidates), reverse=True)
+        return [(key, score) for score, key in ranked[:k] if score > min_score]
@@ -0,0 +1,135 @@
+# memory_store.py
+"""
+Key/value memory in memory.db (the `memory` table).
+
+memory(id, key, value) with a unique index on key, so a lookup is one
+index probe however many memories exist. The DB runs in WAL mode with a
+busy timeout, so the CLI and the Streamlit app can use it at once.
+
+Reads go through an in-process LRU (misses are cached too). Writes land
+in the cache right away and are written back in one transaction per
+batch: every BATCH_SIZE changes, on the first write FLUSH_INTERVAL
+seconds after the last flush, on flush() and at exit. Another process
+sees a write once it has been flushed; its own cache notices through
+PRAGMA data_version and starts over.
+"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+MEMORY_DB = "memory.db"
+CACHE_SIZE = 10_000
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 1.0
+
+_DELETED = object()
+
+
+class MemoryStore:
+    def __init__(self, db_path: str = MEMORY_DB, cache_size: int = CACHE_SIZE, batch_size: int = BATCH_SIZE):
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self._cache = OrderedDict()   # key -> value (None = known missing)
+        self._pending = {}            # key -> value or _DELETED, not yet written
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS memory ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " key TEXT,"
+            " value TEXT)"
+        )
+        with self._db:
+            # older copies of the table allowed repeated keys: keep the newest
+            self._db.execute(
+                "DELETE FROM memory WHERE id NOT IN (SELECT MAX(id) FROM memory GROUP BY key)"
+            )
+            self._db.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_memory_key ON memory (key)")
+        self._data_version = self._version()
+
+    def _version(self) -> int:
+        return self._db.execute("PRAGMA data_version").fetchone()[0]
+
+    def _remember(self, key: str, value):
+        # caller holds the lock
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def get(self, key: str):
+        with self._lock:
+            value = self._pending.get(key)
+            if value is not None:
+                return None if value is _DELETED else value
+
+            version = self._version()
+            if version != self._data_version:
+                # another process committed: anything cached may be stale
+                self._cache.clear()
+                self._data_version = version
+            elif key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+            row = self._db.execute("SELECT value FROM memory WHERE key = ?", (key,)).fetchone()
+            value = row[0] if row else None
+            self._remember(key, value)
+            return value
+
+    def put(self, key: str, value: str):
+        self._write(key, value)
+
+    def delete(self, key: str):
+        self._write(key, _DELETED)
+
+    def _write(self, key: str, value):
+        with self._lock:
+            self._pending[key] = value
+            self._remember(key, None if value is _DELETED else value)
+            due = (len(self._pending) >= self.batch_size
+                   or time.monotonic() - self._flushed_at >= FLUSH_INTERVAL)
+        if due:
+            self.flush()
+
+    def put_many(self, items):
+        """Bulk load (key, value) pairs in one transaction, bypassing the cache"""
+        self.flush()
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO memory (key, value) VALUES (?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                items,
+            )
+            self._cache.clear()
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                self._flushed_at = time.monotonic()
+                return
+            upserts = [(k, v) for k, v in self._pending.items() if v is not _DELETED]
+            deletes = [(k,) for k, v in self._pending.items() if v is _DELETED]
+            with self._db:
+                self._db.executemany(
+                    "INSERT INTO memory (key, value) VALUES (?, ?)"
+                    " ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                    upserts,
+                )
+                self._db.executemany("DELETE FROM memory WHERE key = ?", deletes)
+            self._pending.clear()
+            self._flushed_at = time.monotonic()
+
+    def items(self) -> dict:
+        """Every stored memory (flushes pending writes first)"""
+        self.flush()
+        with self._lock:
+            return dict(self._db.execute("SELECT key, value FROM memory ORDER BY id"))
+
+    def close(self):
+        self.flush()
+        self._db.close()
@@ -0,0 +1,134 @@
+# move_journal.py
+"""
+Undo journal for organizer runs (tables in memory.db).
+
+organizer_runs:  one row per apply() -- root, start time and final status
+                 (running / done / cancelled / undone).
+organizer_moves: one row per file actually moved -- (source, destination),
+                 written every FLUSH_ROWS moves or FLUSH_INTERVAL seconds
+                 as the run progresses, so a run that is cancelled or
+                 crashes can still be rolled back.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+JOURNAL_DB = "memory.db"
+FLUSH_ROWS = 1024
+FLUSH_INTERVAL = 0.5
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    db = sqlite3.connect(db_path, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")  # no fsync per batch; survives an app crash
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS organizer_runs ("
+        " run_id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " root TEXT NOT NULL,"
+        " started_at REAL NOT NULL,"
+        " status TEXT NOT NULL)"
+    )
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS organizer_moves ("
+        " run_id INTEGER NOT NULL,"
+        " src TEXT NOT NULL,"
+        " dst TEXT NOT NULL)"
+    )
+    db.execute("CREATE INDEX IF NOT EXISTS organizer_moves_run ON organizer_moves (run_id)")
+    db.commit()
+    return db
+
+
+class MoveJournal:
+    """Journal for one run; opened by file_agent.apply()."""
+
+    def __init__(self, root: str, db_path: str = JOURNAL_DB):
+        self.root = root
+        self._lock = threading.Lock()
+        self._db = _connect(db_path)
+        with self._db:
+            cur = self._db.execute(
+                "INSERT INTO organizer_runs (root, started_at, status) VALUES (?, ?, 'running')",
+                (root, time.time()),
+            )
+        self.run_id = cur.lastrowid
+        self._pending = []
+        self._flushed_at = time.monotonic()
+
+    def record(self, moves: list):
+        """moves: (src, dst) pairs"""
+        with self._lock:
+            self._pending.extend(moves)
+            if len(self._pending) < FLUSH_ROWS and time.monotonic() - self._flushed_at < FLUSH_INTERVAL:
+                return
+        self.flush()
+
+    def flush(self):
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO organizer_moves (run_id, src, dst) VALUES (?, ?, ?)",
+                ((self.run_id, src, dst) for src, dst in self._pending),
+            )
+            self._pending.clear()
+            self._flushed_at = time.monotonic()
+
+    def finish(self, status: str):
+        self.flush()
+        with self._lock, self._db:
+            self._db.execute("UPDATE organizer_runs SET status = ? WHERE run_id = ?", (status, self.run_id))
+
+    def close(self):
+        self.flush()
+        self._db.close()
+
+
+def last_run(root: str, db_path: str = JOURNAL_DB) -> int | None:
+    """Most recent run for `root` that hasn't been undone yet"""
+    db = _connect(db_path)
+    try:
+        row = db.execute(
+            "SELECT run_id FROM organizer_runs WHERE root = ? AND status != 'undone'"
+            " ORDER BY run_id DESC LIMIT 1", (root,)
+        ).fetchone()
+        return row[0] if row else None
+    finally:
+        db.close()
+
+
+def undo_run(run_id: int, db_path: str = JOURNAL_DB) -> tuple[int, int]:
+    """
+    Move every file of a run back where it came from, newest first.
+    Files that were moved or deleted since, or whose old name is taken
+    again, are left alone; category folders left empty are removed.
+    Returns (restored, skipped).
+    """
+    db = _connect(db_path)
+    restored = skipped = 0
+    try:
+        moves = db.execute(
+            "SELECT src, dst FROM organizer_moves WHERE run_id = ? ORDER BY rowid DESC", (run_id,)
+        ).fetchall()
+        for src, dst in moves:
+            if not os.path.lexists(dst) or os.path.lexists(src):
+                skipped += 1
+                continue
+            try:
+                os.makedirs(os.path.dirname(src), exist_ok=True)
+                os.rename(dst, src)
+            except OSError as e:
+                print(f"❌ Failed to restore {src}: {e}")
+                skipped += 1
+                continue
+            restored += 1
+        for folder in {os.path.dirname(dst) for _, dst in moves}:
+            try:
+                os.rmdir(folder)
+            except OSError:
+                pass  # not empty (or already gone)
+        with db:
+            db.execute("UPDATE organizer_runs SET status = 'undone' WHERE run_id = ?", (run_id,))
+    finally:
+        db.close()
+    return restored, skipped
@@ -1,34 +1,184 @@
-from email_agent import send_email
-import schedule
-import time
+from scheduler import Scheduler
+from reminder_store import ReminderStore, recurrence_interval, PENDING, DONE, MISSED, CANCELLED
+from datetime import datetime
+import atexit
+import os
 import threading
+import time
+
+# Only reminders due within the next WINDOW seconds are held in memory;
+# the rest wait in the store and are loaded by a refill job.
+WINDOW = 60 * 60
+FLUSH_INTERVAL = 5.0
+
+# What to do with reminders that came due while the process was down:
+#   "fire" - fire them once on startup
+#   "mark" - don't fire, just mark them missed
+MISSED_POLICY = os.getenv("REMINDER_MISSED_POLICY", "fire")
+
+_scheduler = Scheduler()
+_store = None
+_loaded = {}            # reminder id -> scheduler job id
+_lock = threading.Lock()
+
+def _get_store() -> ReminderStore:
+    global _store
+    with _lock:
+        if _store is None:
+            _store = ReminderStore()
+            atexit.register(_store.flush)
+        return _store
+
+def _resolve_time(time_str: str) -> tuple[float, str | None]:
+    """(first due timestamp, recurrence rule) for "HH:MM", "tomorrow at 9", "every monday 7pm"..."""
+    import time_parser  # builds its token table (~5 ms): not at CLI start
+    when = time_parser.parse(time_str) if isinstance(time_str, str) else None
+    if when is None:
+        raise ValueError(f"Invalid reminder time {time_str!r}, expected e.g. 09:00, tomorrow at 9 or in 20 minutes")
+    return when.due_at, when.recurrence
+
+def _describe(due_at: float, recurrence: str | None) -> str:
+    due = datetime.fromtimestamp(due_at)
+    text = f"{due:%H:%M}" if due.date() == datetime.now().date() else f"{due:%a %d %b %H:%M}"
+    return f"{text} ({recurrence})" if recurrence else text
+
+_CALENDAR_DAYS = {"daily": 1, "weekly": 7}    # rules that keep their local clock time
 
-_scheduler_started = False
+def _advance(due_at: float, recurrence: str, now: float) -> float:
+    """Next due time of a recurring reminder strictly after `now`"""
+    days = _CALENDAR_DAYS.get(recurrence)
+    if days is None:
+        # "hourly", "<n>s": a fixed number of seconds, DST or not
+        interval = recurrence_interval(recurrence)
+        if due_at <= now:
+            due_at += ((now - due_at) // interval + 1) * interval
+        return due_at
+    if due_at <= now:
+        # count missed periods in local days, not 86400 s steps, so 9:00
+        # stays 9:00 after the clocks change
+        import time_parser
+        missed = datetime.fromtimestamp(now).toordinal() - datetime.fromtimestamp(due_at).toordinal()
+        due_at = time_parser.shift_days(due_at, missed // days * days)
+        while due_at <= now:
+            due_at = time_parser.shift_days(due_at, days)
+    return due_at
 
-def _run_scheduler():
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+def _notify(message: str, email: str | None):
+    print(f"🔔 Reminder: {message}")
+    if email:
+        from email_agent import queue_email  # email.mime + smtplib: only when a reminder mails
+        queue_email(email, "Reminder from AI Agent", message)  # don't block the scheduler thread
 
-def _ensure_scheduler():
-    """Runs scheduler in background if not already started"""
-    global _scheduler_started
-    if not _scheduler_started:
-        threading.Thread(target=_run_scheduler, daemon=True).start()
-        _scheduler_started = True
+def _fire(reminder_id: int, due_at: float, recurrence: str | None, message: str, email: str | None):
+    store = _get_store()
+    with _lock:
+        _loaded.pop(reminder_id, None)
+        if not recurrence:
+            # under the lock, so cancel_reminder() never sees it loaded-and-pending
+            # once it has fired (the write itself is buffered until the next flush)
+            store.set_status(reminder_id, DONE)
+    _notify(message, email)
+    if recurrence:
+        next_due = _advance(due_at, recurrence, time.time())
+        store.reschedule(reminder_id, next_due)
+        if next_due < time.time() + WINDOW:
+            _load((reminder_id, next_due, recurrence, message, email))
 
-def set_reminder_with_email(time_str: str, message: str, email=None):
-    """Schedules a reminder. 
-    time_str: HH:MM format
+def _load(row):
+    """Hand one stored reminder to the in-memory scheduler"""
+    reminder_id, due_at = row[0], row[1]
+    with _lock:
+        if reminder_id in _loaded:
+            return
+        _loaded[reminder_id] = _scheduler.schedule(due_at, lambda: _fire(*row))
+
+def _refill():
+    now = time.time()
+    for row in _get_store().pending_before(now + WINDOW, start=now):
+        _load(row)
+
+def _recover_missed():
+    store = _get_store()
+    now = time.time()
+    for reminder_id, due_at, recurrence, message, email in store.pending_before(now):
+        if MISSED_POLICY == "fire":
+            print(f"⚠️ Missed reminder (was due {datetime.fromtimestamp(due_at):%Y-%m-%d %H:%M}):")
+            _notify(message, email)
+        if recurrence:
+            store.reschedule(reminder_id, _advance(due_at, recurrence, now))
+        else:
+            store.set_status(reminder_id, DONE if MISSED_POLICY == "fire" else MISSED)
+    store.flush()
+
+_started = False
+
+def get_scheduler() -> Scheduler:
+    """The process-wide scheduler that fires reminders"""
+    return _scheduler
+
+def start_reminders():
+    """Restore persisted reminders: handle missed ones, load the next
+    WINDOW, and keep the window topped up. Safe to call more than once."""
+    global _started
+    with _lock:
+        if _started:
+            return
+        _started = True
+    _recover_missed()
+    _refill()
+    _scheduler.schedule(time.time() + WINDOW / 2, _refill, interval=WINDOW / 2)
+    _scheduler.schedule(time.time() + FLUSH_INTERVAL, _get_store().flush, interval=FLUSH_INTERVAL)
+
+def set_reminder_with_email(time_str: str, message: str, email=None, repeat_daily: bool = False) -> int:
+    """Schedules a reminder.
+    time_str: HH:MM or a phrase like "tomorrow at 9", "in 20 minutes",
+              "every monday 7pm", "on the 5th" (see time_parser)
     message: reminder text
     email: if provided, sends email reminder too
+    repeat_daily: fire every day at time_str instead of once
+    Returns a reminder id for cancel_reminder().
     """
-    _ensure_scheduler()
+    due_at, recurrence = _resolve_time(time_str)
+    return _add_reminder(due_at, "daily" if repeat_daily else recurrence, message, email)
+
+def _add_reminder(due_at: float, recurrence: str | None, message: str, email: str | None) -> int:
+    start_reminders()
+    reminder_id = _get_store().add(due_at, message, email, recurrence)
+    if due_at < time.time() + WINDOW:
+        _load((reminder_id, due_at, recurrence, message, email))
+    print(f"⏳ Reminder set for {_describe(due_at, recurrence)}: {message}")
+    return reminder_id
+
+def cancel_reminder(reminder_id: int) -> bool:
+    """Cancels a pending reminder; False if it already fired or doesn't exist"""
+    store = _get_store()
+    with _lock:
+        # status() sees buffered writes: a reminder that fired within the
+        # last flush interval is already DONE here
+        if store.status(reminder_id) != PENDING:
+            return False
+        job_id = _loaded.pop(reminder_id, None)
+    if job_id is not None and not _scheduler.cancel(job_id):
+        return False    # the scheduler is running it right now
+    store.set_status(reminder_id, CANCELLED)
+    store.flush()
+    return True
+
+def handle_set_reminder(slots: dict, ctx=None) -> str:
+    """Dispatcher handler for the set_reminder intent"""
+    time_str = slots.get("time")
+    message = slots.get("message") or "Reminder"
+    if not time_str:
+        raise ValueError("Missing reminder time.")
 
-    def task():
-        print(f"🔔 Reminder: {message}")
-        if email:
-            send_email(email, "Reminder from AI Agent", message)
+    # "email me" → the configured address; an explicit address wins
+    email_to = slots.get("email_to")
+    if not email_to and slots.get("email_me"):
+        email_to = os.getenv("GMAIL_EMAIL")
 
-    schedule.every().day.at(time_str).do(task)
-    print(f"⏳ Reminder set for {time_str}: {message}")
+    due_at, recurrence = _resolve_time(time_str)
+    _add_reminder(due_at, recurrence, message, email_to)
+    when = _describe(due_at, recurrence)
+    if email_to:
+        return f"⏰ Reminder set for {when} (Email will be sent to {email_to})"
+    return f"⏰ Reminder set for {when}"
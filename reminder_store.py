@@ -0,0 +1,125 @@
+# reminder_store.py
+"""
+Durable reminder table in memory.db.
+
+reminders(id, due_at, recurrence, message, email, status)
+  due_at:     UTC timestamp of the next firing
+  recurrence: None (one-shot), a rule name from RECURRENCE_INTERVALS or
+              "<seconds>s" for any other interval
+  status:     pending | done | missed | cancelled
+
+The DB runs in WAL mode. New reminders are committed right away (the
+user was just told "Reminder set"); status changes are buffered and
+written in one transaction per batch, so a burst of firings doesn't cost
+one fsync each. Queries for a time window hit the (status, due_at) index,
+so loading the next hour doesn't depend on how many reminders exist.
+"""
+import sqlite3
+import threading
+
+REMINDER_DB = "memory.db"
+
+DAY = 24 * 60 * 60
+RECURRENCE_INTERVALS = {
+    "hourly": 60 * 60,
+    "daily": DAY,
+    "weekly": 7 * DAY,
+}
+
+PENDING, DONE, MISSED, CANCELLED = "pending", "done", "missed", "cancelled"
+
+
+def recurrence_interval(rule: str) -> float:
+    """Seconds between firings for a recurrence rule ("daily", "1200s")"""
+    interval = RECURRENCE_INTERVALS.get(rule)
+    if interval is None:
+        if not (rule.endswith("s") and rule[:-1].isdigit() and int(rule[:-1]) > 0):
+            raise ValueError(f"Unknown recurrence rule {rule!r}")
+        interval = int(rule[:-1])
+    return interval
+
+
+class ReminderStore:
+    def __init__(self, db_path: str = REMINDER_DB, batch_size: int = 100):
+        self.batch_size = batch_size
+        self._pending_writes = []   # (sql, params)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS reminders ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " due_at REAL NOT NULL,"
+            " recurrence TEXT,"
+            " message TEXT NOT NULL,"
+            " email TEXT,"
+            " status TEXT NOT NULL DEFAULT 'pending')"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_reminders_status_due ON reminders (status, due_at)"
+        )
+        self._db.commit()
+
+    def add(self, due_at: float, message: str, email: str | None = None, recurrence: str | None = None) -> int:
+        with self._lock:
+            cur = self._db.execute(
+                "INSERT INTO reminders (due_at, recurrence, message, email, status) VALUES (?, ?, ?, ?, ?)",
+                (due_at, recurrence, message, email, PENDING),
+            )
+            self._db.commit()
+            return cur.lastrowid
+
+    def get(self, reminder_id: int):
+        with self._lock:
+            return self._db.execute(
+                "SELECT id, due_at, recurrence, message, email, status FROM reminders WHERE id = ?",
+                (reminder_id,),
+            ).fetchone()
+
+    def status(self, reminder_id: int) -> str | None:
+        """Current status, counting writes still waiting for flush(); None if unknown"""
+        with self._lock:
+            for sql, params in reversed(self._pending_writes):
+                if params[-1] == reminder_id:
+                    return params[-2]   # both buffered writes end with (..., status, id)
+            row = self._db.execute("SELECT status FROM reminders WHERE id = ?", (reminder_id,)).fetchone()
+            return row[0] if row else None
+
+    def pending_before(self, end: float, start: float | None = None) -> list:
+        """Pending reminders with start <= due_at < end, oldest first."""
+        with self._lock:
+            if start is None:
+                sql = "WHERE status = ? AND due_at < ?"
+                params = (PENDING, end)
+            else:
+                sql = "WHERE status = ? AND due_at >= ? AND due_at < ?"
+                params = (PENDING, start, end)
+            return self._db.execute(
+                "SELECT id, due_at, recurrence, message, email FROM reminders "
+                + sql + " ORDER BY due_at", params
+            ).fetchall()
+
+    # ---- buffered writes ----
+
+    def _queue(self, sql: str, params: tuple):
+        with self._lock:
+            self._pending_writes.append((sql, params))
+            full = len(self._pending_writes) >= self.batch_size
+        if full:
+            self.flush()
+
+    def set_status(self, reminder_id: int, status: str):
+        self._queue("UPDATE reminders SET status = ? WHERE id = ?", (status, reminder_id))
+
+    def reschedule(self, reminder_id: int, due_at: float):
+        self._queue("UPDATE reminders SET due_at = ?, status = ? WHERE id = ?", (due_at, PENDING, reminder_id))
+
+    def flush(self):
+        with self._lock:
+            writes, self._pending_writes = self._pending_writes, []
+            if not writes:
+                return
+            with self._db:  # one transaction for the whole batch
+                for sql, params in writes:
+                    self._db.execute(sql, params)
@@ -0,0 +1,116 @@
+# scheduler.py
+"""
+Min-heap job scheduler with a single timed wait.
+
+One daemon thread sleeps on a Condition until the earliest due time (or
+until a new/earlier job is scheduled), runs whatever is due and goes back
+to sleep. Nothing is scanned while idle, so cost doesn't grow with the
+number of pending jobs.
+
+  schedule():  O(log n) heap push
+  cancel():    O(1) tombstone; the entry is dropped when it reaches the
+               top, and the heap is compacted once tombstones outnumber
+               live jobs, so cleanup stays amortized O(log n)
+"""
+import heapq
+import itertools
+import threading
+import time
+
+# Wake up at least this often even with nothing due, so wall-clock changes
+# (NTP, suspend/resume) can't leave a job sleeping far past its due time.
+MAX_WAIT = 60.0
+
+
+class Scheduler:
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self._heap = []                 # [due, job_id, fn, interval, cancelled]
+        self._jobs = {}                 # job_id -> heap entry
+        self._ids = itertools.count(1)
+        self._cancelled = 0
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def __len__(self):
+        with self._cond:
+            return len(self._jobs)
+
+    def _ensure_thread(self):
+        # caller holds the lock
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="scheduler", daemon=True)
+            self._thread.start()
+
+    def schedule(self, due: float, fn, interval: float | None = None) -> int:
+        """Run fn() at timestamp `due`; repeat every `interval` seconds if given."""
+        with self._cond:
+            job_id = next(self._ids)
+            entry = [due, job_id, fn, interval, False]
+            self._jobs[job_id] = entry
+            heapq.heappush(self._heap, entry)
+            self._ensure_thread()
+            if self._heap[0] is entry:
+                self._cond.notify()  # new earliest deadline
+            return job_id
+
+    def cancel(self, job_id: int) -> bool:
+        with self._cond:
+            entry = self._jobs.pop(job_id, None)
+            if entry is None:
+                return False
+            entry[4] = True
+            self._cancelled += 1
+            if self._cancelled > len(self._jobs):
+                self._heap = [e for e in self._heap if not e[4]]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+            return True
+
+    def next_due(self) -> float | None:
+        with self._cond:
+            self._drop_cancelled()
+            return self._heap[0][0] if self._heap else None
+
+    def _drop_cancelled(self):
+        # caller holds the lock
+        while self._heap and self._heap[0][4]:
+            heapq.heappop(self._heap)
+            self._cancelled -= 1
+
+    def _pop_due(self) -> list:
+        """Wait until something is due, then pop and return it."""
+        with self._cond:
+            while True:
+                self._drop_cancelled()
+                now = self._clock()
+                if self._heap and self._heap[0][0] <= now:
+                    break
+                timeout = self._heap[0][0] - now if self._heap else MAX_WAIT
+                self._cond.wait(min(timeout, MAX_WAIT))
+
+            due_jobs = []
+            while self._heap and self._heap[0][0] <= now:
+                entry = heapq.heappop(self._heap)
+                if entry[4]:
+                    self._cancelled -= 1
+                    continue
+                due_jobs.append(entry)
+                due, job_id, fn, interval, _ = entry
+                if interval:
+                    # recurring: keep the same job id, skip missed periods
+                    while due <= now:
+                        due += interval
+                    entry[0] = due
+                    heapq.heappush(self._heap, entry)
+                else:
+                    del self._jobs[job_id]
+            return due_jobs
+
+    def _run(self):
+        while True:
+            for _, job_id, fn, _, _ in self._pop_due():
+                try:
+                    fn()
+                except Exception as e:
+                    print(f"❌ Scheduled job {job_id} failed: {e}")
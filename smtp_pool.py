@@ -0,0 +1,124 @@
+# smtp_pool.py
+"""
+Outbound mail queue drained by worker threads that each keep one
+authenticated SMTP session open.
+
+- The STARTTLS + login handshake is paid once per session, not per
+  message; a session is recycled after MAX_MESSAGES_PER_SESSION messages
+  or IDLE_TIMEOUT seconds without mail.
+- A dropped connection is reopened and the message retried once.
+- STARTTLS is required before login; a server that doesn't offer it is
+  refused (starttls=False is only for local test sinks).
+- The queue is bounded: submit() blocks (or raises queue.Full when
+  block=False) when the workers fall behind, instead of growing forever.
+"""
+import queue
+import smtplib
+import threading
+from concurrent.futures import Future
+
+MAX_MESSAGES_PER_SESSION = 100
+IDLE_TIMEOUT = 30.0
+CONNECT_TIMEOUT = 30.0
+
+_STOP = object()
+
+
+class SMTPSession:
+    def __init__(self, host: str, port: int, user: str | None, password: str | None,
+                 starttls: bool = True):
+        self.host, self.port = host, port
+        self.user, self.password = user, password
+        self.starttls = starttls
+        self._smtp = None
+        self._sent = 0
+
+    def _connect(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=CONNECT_TIMEOUT)
+        try:
+            smtp.ehlo()
+            if self.starttls:
+                # raises SMTPNotSupportedError if the extension is missing
+                # (or was stripped): never send the password in cleartext
+                smtp.starttls()
+                smtp.ehlo()
+        except (smtplib.SMTPException, OSError):
+            smtp.close()
+            raise
+        if self.user and self.password:
+            smtp.login(self.user, self.password)
+        self._smtp = smtp
+        self._sent = 0
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+    def send(self, sender: str, recipients, msg: str):
+        if self._smtp is None or self._sent >= MAX_MESSAGES_PER_SESSION:
+            self.close()
+            self._connect()
+        try:
+            self._smtp.sendmail(sender, recipients, msg)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            # server dropped the idle session: reconnect and retry once
+            self._smtp = None
+            self._connect()
+            self._smtp.sendmail(sender, recipients, msg)
+        self._sent += 1
+
+
+class Outbox:
+    def __init__(self, host: str, port: int, user: str | None = None, password: str | None = None,
+                 workers: int = 2, maxsize: int = 1000, starttls: bool = True):
+        self.host, self.port = host, port
+        self.user, self.password = user, password
+        self.starttls = starttls
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"smtp-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, sender: str, recipients, msg: str, block: bool = True, timeout: float | None = None) -> Future:
+        """Queue one message; the Future resolves when the server accepted it."""
+        fut = Future()
+        self._queue.put((sender, recipients, msg, fut), block=block, timeout=timeout)
+        return fut
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def close(self):
+        """Send what's queued, then stop the workers."""
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for t in self._threads:
+            t.join()
+
+    def _worker(self):
+        session = SMTPSession(self.host, self.port, self.user, self.password, self.starttls)
+        while True:
+            try:
+                item = self._queue.get(timeout=IDLE_TIMEOUT)
+            except queue.Empty:
+                session.close()
+                continue
+            if item is _STOP:
+                session.close()
+                return
+            sender, recipients, msg, fut = item
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                session.send(sender, recipients, msg)
+                fut.set_result(True)
+            except Exception as e:
+                session.close()
+                fut.set_exception(e)
@@ -1,27 +1,186 @@
 # speak.py (FINAL FIX WITH QUEUE)
-import pyttsx3
+"""
+Text-to-speech on one background thread.
+
+Replies are split into sentences and queued one sentence at a time, so
+the first sentence plays while the rest are still arriving, and a new
+command can cut in: jarvis_say(..., interrupt_current=True)
+(or interrupt()) stops the current sentence and drops everything queued
+before it. The queue is bounded; when it is full the oldest sentence is
+dropped, and sentences that waited longer than MAX_AGE are skipped.
+
+The engine is created on the speech thread on first use. TTS_BACKEND=null
+replaces pyttsx3 with NullAudio, which takes as long as reading the text
+aloud would but makes no sound (headless machines, benchmarks).
+"""
+import os
+import re
+import statistics
 import threading
 import queue
+import time
+from collections import deque
+
+MAX_QUEUE = 32      # sentences waiting to be spoken
+MAX_AGE = 15.0      # seconds a sentence may wait before it is skipped as stale
+RATE = 175          # words per minute
+TTS_BACKEND = os.getenv("TTS_BACKEND", "pyttsx3")
+
+engine = None  # created by the speech thread on first use (pyttsx3.init() is slow)
+speech_queue = queue.Queue(maxsize=MAX_QUEUE)  # (generation, sentence, enqueued at)
+speech_thread = None
+
+_lock = threading.Lock()
+_generation = 0   # bumped by interrupt(); sentences queued before it are dropped
+stats = {"spoken": 0, "dropped": 0, "interrupted": 0}
+_waits = deque(maxlen=500)  # seconds from enqueue to start of speech
+
+
+class NullAudio:
+    """Speaks into the void: as slow as real speech, interruptible, no sound"""
+
+    def __init__(self, rate: int = RATE):
+        self.rate = rate
+        self.spoken = []
+        self._stop = threading.Event()
+
+    def reset(self):
+        self._stop.clear()
 
-engine = pyttsx3.init()
-engine.setProperty("rate", 175)
-engine.setProperty("volume", 1.0)
+    def say(self, text: str):
+        self.spoken.append(text)
+        self._stop.wait(len(text.split()) * 60 / self.rate)
+
+    def stop(self):
+        self._stop.set()
+
+
+class Pyttsx3Audio:
+    def __init__(self, rate: int = RATE):
+        import pyttsx3
+        self.engine = pyttsx3.init()
+        self.engine.setProperty("rate", rate)
+        self.engine.setProperty("volume", 1.0)
+
+    def reset(self):
+        pass
+
+    def say(self, text: str):
+        self.engine.say(text)
+        self.engine.runAndWait()
+
+    def stop(self):
+        self.engine.stop()
+
+
+def _init_engine():
+    global engine
+    engine = NullAudio() if TTS_BACKEND == "null" else Pyttsx3Audio()
 
-speech_queue = queue.Queue()
 
 def _speech_worker():
     while True:
-        text = speech_queue.get()
-        if text is None:
-            break
-        print(f"🗣 Jarvis: {text}")
-        engine.say(text)
-        engine.runAndWait()
-        speech_queue.task_done()
-
-# start background speaking thread
-speech_thread = threading.Thread(target=_speech_worker, daemon=True)
-speech_thread.start()
-
-def jarvis_say(text: str):
-    speech_queue.put(text)
+        item = speech_queue.get()
+        try:
+            if item is None:
+                break
+            gen, text, queued_at = item
+            if engine is None:
+                _init_engine()
+            with _lock:
+                engine.reset()
+                if gen != _generation:
+                    stats["interrupted"] += 1
+                    continue
+            waited = time.perf_counter() - queued_at
+            if waited > MAX_AGE:
+                stats["dropped"] += 1
+                continue
+            _waits.append(waited)
+            print(f"🗣 Jarvis: {text}")
+            engine.say(text)
+            stats["spoken"] += 1
+        except Exception as e:
+            print("⚠️ Speech failed:", e)
+        finally:
+            speech_queue.task_done()
+
+
+def _ensure_thread():
+    global speech_thread
+    with _lock:
+        if speech_thread is None:
+            speech_thread = threading.Thread(target=_speech_worker, daemon=True)
+            speech_thread.start()
+
+
+def _enqueue(item):
+    while True:
+        try:
+            speech_queue.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                speech_queue.get_nowait()  # make room: the oldest sentence goes
+                speech_queue.task_done()
+                stats["dropped"] += 1
+            except queue.Empty:
+                pass
+
+
+def interrupt():
+    """Stop the sentence being spoken and drop everything already queued"""
+    global _generation
+    with _lock:
+        _generation += 1
+        if engine is not None:
+            engine.stop()
+
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+def split_sentences(text: str) -> list:
+    return [s.strip() for s in _SENTENCE_END.split(text) if s.strip()]
+
+
+def _say(text: str, gen: int):
+    _ensure_thread()
+    for sentence in split_sentences(text):
+        _enqueue((gen, sentence, time.perf_counter()))
+
+
+def jarvis_say(text: str, interrupt_current: bool = False):
+    """Queue text for speech, sentence by sentence (returns at once)"""
+    if interrupt_current:
+        interrupt()
+    _say(text, _generation)
+
+
+def jarvis_say_stream(deltas, interrupt_current: bool = False) -> str:
+    """Speak a streamed reply sentence by sentence, starting at the first
+    sentence boundary instead of waiting for the whole text. Returns the full
+    text; if something interrupts it meanwhile, the rest is not spoken."""
+    if interrupt_current:
+        interrupt()
+    gen = _generation
+    buffer, parts = "", []
+    for delta in deltas:
+        parts.append(delta)
+        buffer += delta
+        *sentences, buffer = _SENTENCE_END.split(buffer)
+        for sentence in sentences:
+            _say(sentence, gen)
+    if buffer.strip():
+        _say(buffer, gen)
+    return "".join(parts)
+
+
+def speech_stats() -> dict:
+    """Queue depth, counters, and enqueue-to-speech wait (ms) for recent sentences"""
+    waits = sorted(_waits)
+    return {
+        "depth": speech_queue.qsize(),
+        **stats,
+        "wait_p50_ms": statistics.median(waits) * 1000 if waits else 0.0,
+        "wait_p95_ms": waits[int(len(waits) * 0.95)] * 1000 if waits else 0.0,
+    }
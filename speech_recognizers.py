@@ -0,0 +1,224 @@
+# speech_recognizers.py
+"""
+Speech-to-text backends for voice_agent.
+
+Every backend is a Recognizer: recognize(clip) returns the text, or ""
+when the clip held nothing intelligible, and raises RecognitionError
+when the backend itself failed (no network, no model). Silence and
+outages look different.
+
+cloud   CloudRecognizer: Google Web Speech through speech_recognition,
+        one blocking request per clip (the original behaviour).
+vosk    PooledRecognizer running vosk_backend: an offline Kaldi model
+        loaded once per worker process. Clips that arrive while every
+        worker is busy are sent together in the next call, so a burst
+        costs one round-trip per worker rather than one per clip.
+
+SPEECH_BACKEND picks the default (cloud); VOSK_MODEL is the model
+directory. PooledRecognizer takes any "module:function" backend that
+builds a decode(clips, sample_rate) -> texts function inside a worker.
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from importlib import import_module
+
+SAMPLE_RATE = 16000
+BACKEND = os.getenv("SPEECH_BACKEND", "cloud")
+WORKERS = int(os.getenv("SPEECH_WORKERS", "1"))
+BATCH_SIZE = 8
+
+
+class RecognitionError(RuntimeError):
+    """The recognizer could not run (as opposed to hearing nothing)"""
+
+
+class Recognizer:
+    name = "base"
+
+    def submit(self, clip, sample_rate: int = SAMPLE_RATE) -> Future:
+        """Start recognizing a clip (int16 samples); the Future gives the text"""
+        fut = Future()
+        try:
+            fut.set_result(self.recognize_batch([clip], sample_rate)[0])
+        except Exception as e:
+            fut.set_exception(e)
+        return fut
+
+    def recognize(self, clip, sample_rate: int = SAMPLE_RATE) -> str:
+        return self.submit(clip, sample_rate).result()
+
+    def recognize_batch(self, clips: list, sample_rate: int = SAMPLE_RATE) -> list:
+        raise NotImplementedError
+
+    def warm_up(self) -> Future:
+        """Get ready for the first clip (load models) in the background"""
+        fut = Future()
+        fut.set_result(None)
+        return fut
+
+    def close(self):
+        pass
+
+
+class CloudRecognizer(Recognizer):
+    name = "cloud"
+
+    def __init__(self):
+        import speech_recognition as sr
+        self._sr = sr
+        self._recognizer = sr.Recognizer()
+
+    def recognize_batch(self, clips: list, sample_rate: int = SAMPLE_RATE) -> list:
+        texts = []
+        for clip in clips:
+            audio = self._sr.AudioData(clip.tobytes(), sample_rate, 2)
+            try:
+                texts.append(self._recognizer.recognize_google(audio).lower())
+            except self._sr.UnknownValueError:
+                texts.append("")
+            except self._sr.RequestError as e:
+                raise RecognitionError(f"cloud recognizer unavailable: {e}") from e
+        return texts
+
+
+# ---------------------------------------------------------------- workers
+
+_decode = None  # the backend's decode function, one per worker process
+
+
+def _init_worker(backend: str, options: dict):
+    global _decode
+    module, fn = backend.split(":")
+    _decode = getattr(import_module(module), fn)(**options)
+
+
+def _decode_batch(clips: list, sample_rate: int) -> tuple[list, float]:
+    # top-level so it can be pickled into worker processes
+    start = time.perf_counter()
+    texts = _decode(clips, sample_rate)
+    return [t.lower() for t in texts], time.perf_counter() - start
+
+
+def vosk_backend(model_path: str = None):
+    """decode() for an offline vosk model (loaded once per worker)"""
+    from vosk import KaldiRecognizer, Model, SetLogLevel
+    SetLogLevel(-1)
+    model = Model(model_path or os.getenv("VOSK_MODEL", "model"))
+
+    def decode(clips: list, sample_rate: int) -> list:
+        texts = []
+        for clip in clips:
+            rec = KaldiRecognizer(model, sample_rate)
+            rec.AcceptWaveform(clip)
+            texts.append(json.loads(rec.FinalResult()).get("text", ""))
+        return texts
+
+    return decode
+
+
+class PooledRecognizer(Recognizer):
+    """
+    Runs a backend in `workers` processes. A clip goes out at once if a
+    worker is free; otherwise it waits and leaves with up to batch_size
+    others as soon as one is.
+
+    If the pool breaks (a worker died, or the backend failed to load) the
+    recognizer is marked failed: waiting and later clips get the
+    RecognitionError instead of hanging.
+    """
+
+    def __init__(self, backend: str, workers: int = WORKERS, batch_size: int = BATCH_SIZE, **options):
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.name = backend
+        self.workers = workers
+        self.batch_size = batch_size
+        self._pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(backend, options))
+        self._lock = threading.RLock()  # done-callbacks may run inline
+        self._pending = []      # (bytes, sample_rate, Future) waiting for a worker
+        self._busy = 0
+        self._broken = None     # RecognitionError once the pool is unusable
+        self.calls = 0
+        self.clips = 0
+        self.decode_s = 0.0     # time spent decoding inside workers
+
+    def warm_up(self) -> Future:
+        """Start the workers (and load their models) before the first clip"""
+        return self._pool.submit(_decode_batch, [], SAMPLE_RATE)
+
+    def submit(self, clip, sample_rate: int = SAMPLE_RATE) -> Future:
+        fut = Future()
+        with self._lock:
+            if self._broken is not None:
+                fut.set_exception(self._broken)
+                return fut
+            self._pending.append((clip.tobytes(), sample_rate, fut))
+            self._dispatch()
+        return fut
+
+    def recognize_batch(self, clips: list, sample_rate: int = SAMPLE_RATE) -> list:
+        return [f.result() for f in [self.submit(c, sample_rate) for c in clips]]
+
+    def _dispatch(self):
+        # caller holds the lock
+        while self._pending and self._busy < self.workers:
+            rate = self._pending[0][1]
+            batch, rest = [], []
+            for p in self._pending:
+                (batch if p[1] == rate and len(batch) < self.batch_size else rest).append(p)
+            self._pending = rest
+            try:
+                job = self._pool.submit(_decode_batch, [b for b, _, _ in batch], rate)
+            except Exception as e:     # BrokenProcessPool, or shut down
+                self._fail(batch, RecognitionError(f"{self.name} unavailable: {e}"))
+                return
+            self._busy += 1
+            self.calls += 1
+            self.clips += len(batch)
+            job.add_done_callback(lambda job, batch=batch: self._finished(job, batch))
+
+    def _fail(self, batch: list, err: RecognitionError):
+        """Mark the recognizer failed and fail `batch` plus every waiting clip"""
+        with self._lock:
+            self._broken = err
+            batch = batch + self._pending
+            self._pending = []
+        for _, _, fut in batch:
+            if not fut.done():
+                fut.set_exception(err)
+
+    def _finished(self, job: Future, batch: list):
+        try:
+            texts, elapsed = job.result()
+        except BrokenProcessPool as e:
+            with self._lock:
+                self._busy -= 1
+            self._fail(batch, RecognitionError(f"{self.name} failed: {e}"))
+            return
+        except Exception as e:
+            err = RecognitionError(f"{self.name} failed: {e}")
+            for _, _, fut in batch:
+                fut.set_exception(err)
+        else:
+            self.decode_s += elapsed
+            for (_, _, fut), text in zip(batch, texts):
+                fut.set_result(text)
+        with self._lock:
+            self._busy -= 1
+            self._dispatch()
+
+    def close(self):
+        self._pool.shutdown(cancel_futures=True)
+
+
+def make_recognizer(backend: str = None) -> Recognizer:
+    backend = backend or BACKEND
+    if backend == "cloud":
+        return CloudRecognizer()
+    if backend == "vosk":
+        return PooledRecognizer("speech_recognizers:vosk_backend")
+    return PooledRecognizer(backend)   # any "module:function" backend
@@ -0,0 +1,541 @@
+# time_parser.py
+"""
+Natural-language reminder times → absolute UTC timestamps.
+
+    parse("in 20 minutes")        one-shot, now + 1200 s
+    parse("tomorrow at 9")        one-shot, 09:00 local tomorrow
+    parse("every monday 7pm")     weekly, first firing next Monday 19:00
+    parse("on the 5th")           one-shot, 09:00 local on the next 5th
+    parse("23:20") / "9:05 pm"    next occurrence of that clock time
+
+The text is split into tokens once and every token is classified with a
+single lookup in _TOKENS, a table built at import that already holds
+every clock spelling ("9am", "09:05pm", "23:20"), number and ordinal word,
+weekday, month and unit. A small state machine walks the tokens; the
+first run of time tokens that says something concrete is the
+expression, its token span is returned so callers can cut it out of the
+surrounding text. No regexes run per call.
+
+Local midnights are cached per day, so resolving a date is an addition
+unless the day has a DST change.
+
+Recurrence rules are "hourly", "daily", "weekly" or "<seconds>s" for
+other intervals ("every 20 minutes" → "1200s"); see
+reminder_store.recurrence_interval(). Daily and weekly rules keep their
+local clock time across DST changes (shift_days()), the others repeat
+every so many seconds.
+"""
+import time
+from datetime import date, datetime
+from typing import NamedTuple
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+
+DEFAULT_HOUR = 9    # "tomorrow", "on the 5th" without a time of day
+
+_RULE_NAMES = {HOUR: "hourly", DAY: "daily", WEEK: "weekly"}
+
+
+class When(NamedTuple):
+    due_at: float              # UTC timestamp of the first firing
+    recurrence: str | None     # None for one-shot reminders
+    start: int                 # token span of the expression in tokenize(text)
+    end: int
+
+
+# ================================================================
+# Token table (built once at import)
+# ================================================================
+
+(NUM, CLOCK, AMPM, OCLOCK, UNIT, DAYREL, WEEKDAY, ORDINAL, MONTH,
+ EVERY, PERIOD, PART, AT, NEXT, AFTER, IN, A, HALF, FILLER) = range(19)
+CLOCK_HOUR = -1     # not in the table: a bare hour after "at", minutes may follow
+
+_UNITS = ("zero one two three four five six seven eight nine ten eleven twelve thirteen "
+          "fourteen fifteen sixteen seventeen eighteen nineteen").split()
+_TENS = {"twenty": 20, "thirty": 30, "forty": 40, "fifty": 50}
+_TENS_VALUES = frozenset(_TENS.values())
+_ORDINAL_WORDS = ("first second third fourth fifth sixth seventh eighth ninth tenth eleventh "
+                  "twelfth thirteenth fourteenth fifteenth sixteenth seventeenth eighteenth "
+                  "nineteenth").split()
+# no "sun": "put on sun cream" would become a Sunday reminder
+_WEEKDAYS = (("monday", "mon"), ("tuesday", "tue", "tues"), ("wednesday", "wed"),
+             ("thursday", "thu", "thur", "thurs"), ("friday", "fri"),
+             ("saturday", "sat"), ("sunday",))
+_MONTHS = (("january", "jan"), ("february", "feb"), ("march", "mar"), ("april", "apr"),
+           ("may",), ("june", "jun"), ("july", "jul"), ("august", "aug"),
+           ("september", "sep", "sept"), ("october", "oct"), ("november", "nov"),
+           ("december", "dec"))
+
+
+def _to_24h(hour: int, ampm: str | None) -> int | None:
+    # same rules as intent_agent._to_hhmm: 12am → 0, 1pm → 13, 23am stays 23
+    if ampm == "am" and hour == 12:
+        hour = 0
+    elif ampm == "pm" and hour != 12:
+        hour += 12
+    return hour if 0 <= hour <= 23 else None
+
+
+def _ordinal_suffix(n: int) -> str:
+    if 10 <= n % 100 <= 20:
+        return "th"
+    return {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+
+
+def _build_tokens() -> dict:
+    t = {}
+    for n in range(100):
+        t[str(n)] = (NUM, n)
+    for n in range(10):
+        t[f"0{n}"] = (NUM, n)
+    for n, word in enumerate(_UNITS):
+        t[word] = (NUM, n)
+    for word, n in _TENS.items():
+        t[word] = (NUM, n)
+        for u in range(1, 10):
+            t[f"{word}-{_UNITS[u]}"] = (NUM, n + u)
+
+    for n in range(1, 32):
+        t[f"{n}{_ordinal_suffix(n)}"] = (ORDINAL, n)
+    for n, word in enumerate(_ORDINAL_WORDS, 1):
+        t[word] = (ORDINAL, n)
+    t["twentieth"] = (ORDINAL, 20)
+    t["thirtieth"] = (ORDINAL, 30)
+    for u, word in enumerate(_ORDINAL_WORDS[:9], 1):
+        t[f"twenty-{word}"] = (ORDINAL, 20 + u)
+    t["thirty-first"] = (ORDINAL, 31)
+
+    # every clock spelling: "9:05", "09:05", "9:05pm", "9pm", "09am" ...
+    for h in range(24):
+        for spelled in {str(h), f"{h:02d}"}:
+            for m in range(60):
+                t[f"{spelled}:{m:02d}"] = (CLOCK, (h, m, None))
+            for ampm in ("am", "pm"):
+                if _to_24h(h, ampm) is None:
+                    continue
+                t[f"{spelled}{ampm}"] = (CLOCK, (h, 0, ampm))
+                for m in range(60):
+                    t[f"{spelled}:{m:02d}{ampm}"] = (CLOCK, (h, m, ampm))
+    t["noon"] = t["midday"] = (CLOCK, (12, 0, None))
+    t["midnight"] = (CLOCK, (0, 0, None))
+
+    for word in ("am", "a.m.", "a.m"):
+        t[word] = (AMPM, "am")
+    for word in ("pm", "p.m.", "p.m"):
+        t[word] = (AMPM, "pm")
+    t["o'clock"] = t["oclock"] = (OCLOCK, None)
+
+    # "second" stays an ordinal ("the second invoice"); _run() reads it as
+    # a unit only after a count ("in a second", "30 second")
+    for words, secs in ((("sec", "secs", "seconds"), 1),
+                        (("min", "mins", "minute", "minutes"), MINUTE),
+                        (("hr", "hrs", "hour", "hours"), HOUR),
+                        (("day", "days"), DAY),
+                        (("week", "weeks"), WEEK),
+                        (("fortnight",), 2 * WEEK)):
+        for word in words:
+            t[word] = (UNIT, secs)
+
+    t["today"] = (DAYREL, (0, None))
+    t["tonight"] = t["tonite"] = (DAYREL, (0, (20, "pm")))
+    for word in ("tomorrow", "tmrw", "tmr", "tomorow"):
+        t[word] = (DAYREL, (1, None))
+
+    for wd, names in enumerate(_WEEKDAYS):
+        for name in names:
+            t[name] = (WEEKDAY, (wd, False))
+        t[names[0] + "s"] = (WEEKDAY, (wd, True))     # "on mondays" repeats
+    for month, names in enumerate(_MONTHS, 1):
+        for name in names:
+            t[name] = (MONTH, month)
+
+    t["every"] = t["each"] = (EVERY, None)
+    t["daily"] = t["everyday"] = t["nightly"] = (PERIOD, DAY)
+    t["hourly"] = (PERIOD, HOUR)
+    t["weekly"] = (PERIOD, WEEK)
+
+    t["morning"] = (PART, (DEFAULT_HOUR, "am"))
+    t["afternoon"] = (PART, (15, "pm"))
+    t["evening"] = (PART, (18, "pm"))
+    t["night"] = (PART, (21, "pm"))
+
+    t["at"] = t["@"] = t["around"] = t["by"] = (AT, None)
+    t["next"] = (NEXT, None)
+    t["after"] = (AFTER, None)
+    t["in"] = t["within"] = (IN, None)
+    t["a"] = t["an"] = (A, None)
+    t["half"] = (HALF, 0.5)
+    for word in ("on", "the", "of", "this", "from", "now", "and", "coming"):
+        t[word] = (FILLER, None)
+    return t
+
+
+_TOKENS = _build_tokens()
+
+
+def tokenize(text: str) -> list[str]:
+    return text.lower().replace(",", " ").split()
+
+
+def _lookup(tok: str):
+    entry = _TOKENS.get(tok)
+    if entry is None:
+        stripped = tok.strip(".!?;")
+        if stripped != tok:
+            entry = _TOKENS.get(stripped)
+        elif tok.isdigit():
+            entry = (NUM, int(tok))
+    return entry
+
+
+# ================================================================
+# Local calendar
+# ================================================================
+
+_days = {}     # ordinal -> (local midnight timestamp, day is exactly 24 h long)
+
+
+def _day_info(ordinal: int) -> tuple[float, bool]:
+    info = _days.get(ordinal)
+    if info is None:
+        if len(_days) > 1024:
+            _days.clear()
+        midnight = datetime.fromordinal(ordinal).timestamp()
+        following = datetime.fromordinal(ordinal + 1).timestamp()
+        info = _days[ordinal] = (midnight, following - midnight == DAY)
+    return info
+
+
+_today = (0.0, 0.0, 0)     # (midnight, next midnight, ordinal) of the last `now` seen
+
+
+def _today_ordinal(now: float) -> int:
+    global _today
+    start, end, ordinal = _today
+    if not start <= now < end:
+        ordinal = datetime.fromtimestamp(now).toordinal()
+        _today = (_day_info(ordinal)[0], _day_info(ordinal + 1)[0], ordinal)
+    return ordinal
+
+
+def _local_ts(ordinal: int, hour: int, minute: int) -> float:
+    midnight, regular = _days.get(ordinal) or _day_info(ordinal)
+    if regular:
+        return midnight + hour * HOUR + minute * MINUTE
+    d = date.fromordinal(ordinal)
+    return datetime(d.year, d.month, d.day, hour, minute).timestamp()
+
+
+def shift_days(ts: float, days: int) -> float:
+    """`ts` moved by whole local days: same wall-clock time even across a DST change"""
+    local = datetime.fromtimestamp(ts)
+    return (_local_ts(local.toordinal() + days, local.hour, local.minute)
+            + local.second + local.microsecond / 1e6)
+
+
+_month_days = {}   # (ordinal, mday, month) -> _next_month_day(), same for the whole day
+
+
+def _next_month_day(today: int, mday: int, month: int | None) -> int | None:
+    """Ordinal of the first date on/after `today` with that day (and month)"""
+    key = (today, mday, month)
+    if key in _month_days:
+        return _month_days[key]
+    if len(_month_days) > 1024:
+        _month_days.clear()
+    target = _month_days[key] = _scan_month_day(today, mday, month)
+    return target
+
+
+def _scan_month_day(today: int, mday: int, month: int | None) -> int | None:
+    d = date.fromordinal(today)
+    year, mon = d.year, month or d.month
+    for _ in range(9 if month else 13):   # 29 Feb recurs within 8 years
+        try:
+            candidate = date(year, mon, mday).toordinal()
+        except ValueError:
+            candidate = None    # no 31st this month / 29 Feb outside leap years
+        if candidate is not None and candidate >= today:
+            return candidate
+        if month:
+            year += 1
+        else:
+            mon = mon % 12 + 1
+            year += mon == 1
+    return None
+
+
+def _rule(interval: float) -> str:
+    return _RULE_NAMES.get(interval) or f"{int(interval)}s"
+
+
+# ================================================================
+# Parser
+# ================================================================
+
+def parse(text: str, now: float | None = None) -> When | None:
+    """First time expression in `text`, resolved against `now` (default: time.time())"""
+    return parse_tokens(text.lower().replace(",", " ").split(), now)     # tokenize(), inlined
+
+
+def parse_tokens(tokens: list[str], now: float | None = None) -> When | None:
+    if now is None:
+        now = time.time()
+    get = _TOKENS.get
+    i = 0
+    n = len(tokens)
+    while i < n:
+        entry = get(tokens[i]) or _lookup(tokens[i])
+        if entry is None:
+            i += 1
+            continue
+        # a run of time tokens starts here; _run() returns None if it
+        # turns out to be filler ("in the", "2" in "buy 2 apples")
+        result, i = _run(tokens, i, entry, now)
+        if result is not None:
+            return result
+    return None
+
+
+def _run(tokens, start, entry, now):
+    """`entry` is the table entry of tokens[start], already looked up by the caller"""
+    get = _TOKENS.get
+    n = len(tokens)
+    num = None              # number waiting for its unit / am-pm / month
+    counted = False         # num was spelled out ("2", "half"), not just "a" / "next"
+    tens = False            # num is a tens word, a unit word may follow ("twenty five")
+    relative = False        # "in" / "after" / "next" seen: units are offsets from now
+    rel = 0.0               # seconds from now ("in 2 hours and 5 minutes")
+    day = weekday = mday = month = None
+    hour = minute = ampm = None
+    part = None             # (default hour, am/pm hint) from "morning", "tonight"...
+    every = False
+    interval = None         # recurrence interval in seconds
+    bare_day = False        # "day" in "day after tomorrow"
+    after_at = False
+    end = start             # past the last token that said something concrete
+    last = None
+
+    i = start
+    while True:
+        kind, value = entry
+        # the next token's entry: read ahead once, it is also the next iteration's
+        nxt = i + 1
+        ahead = get(tokens[nxt]) or _lookup(tokens[nxt]) if nxt < n else None
+        if kind == ORDINAL and value == 2 and num is not None and tokens[i].startswith("second"):
+            kind, value = UNIT, 1
+
+        # branches roughly by how often the kind turns up in reminders
+        if kind == AT or kind == FILLER:
+            pass                # "at" only marks the number after it, see after_at
+        elif kind == NUM:
+            if tens and last == NUM and 0 < value < 10:
+                num += value
+                tens = False
+            elif last == CLOCK_HOUR and minute is None and value < 60:
+                minute = value          # "nine thirty", "at 7 30"
+                end = nxt
+            elif after_at and value <= 23 and (ahead is not None or nxt == n
+                                               or tokens[nxt] == "to"):
+                # "at 5", "at 5 tomorrow" but not "stop by 3 shops"
+                hour, minute, ampm = value, None, None
+                end = nxt
+                kind = CLOCK_HOUR
+            elif month is not None and mday is None and 1 <= value <= 31:
+                mday = value            # "march 5"
+                end = nxt
+            else:
+                num, counted = value, True
+                tens = value in _TENS_VALUES and tokens[i].isalpha()
+        elif kind == CLOCK:
+            hour, minute, ampm = value
+            end = nxt
+        elif kind == AMPM or kind == OCLOCK:
+            if num is not None and num >= 1:
+                hour, minute, num = int(num), 0, None
+            if hour is not None:
+                if kind == AMPM:
+                    ampm = value
+                minute = minute or 0
+                end = nxt
+        elif kind == UNIT:
+            count = 1 if num is None else num
+            if every:
+                interval = count * value
+                end = nxt
+            elif num is None and value == DAY and last not in (A, NEXT):
+                bare_day = True
+            elif counted or relative:
+                # "2 days", "in a day", but not "a day pass"
+                rel += count * value
+                end = nxt
+            num, counted = None, False
+        elif kind == IN or kind == AFTER:
+            relative = True
+        elif kind == DAYREL:
+            offset, part_hint = value
+            day = offset + (1 if bare_day and last == AFTER else 0)
+            if part_hint:
+                part = part_hint
+            end = nxt
+        elif kind == WEEKDAY:
+            weekday, plural = value
+            every = every or plural
+            end = nxt
+        elif kind == ORDINAL:
+            # "on the 5th", not "the second invoice"
+            if ahead is not None or nxt == n or tokens[nxt] == "to":
+                mday = value
+                end = nxt
+        elif kind == MONTH:
+            month = value
+            if num is not None and 1 <= num <= 31:
+                mday, num = int(num), None  # "5 march"
+            if mday is not None:
+                end = nxt
+        elif kind == EVERY:
+            every = True
+        elif kind == PERIOD:
+            every = True
+            interval = value
+            end = nxt
+        elif kind == PART:
+            part = value
+            end = nxt
+        elif kind == A or kind == NEXT:
+            if num is None:
+                num = 1
+            relative = relative or kind == NEXT
+        elif kind == HALF:
+            num = 0.5 if num is None else num + 0.5     # "half an hour", "2 and a half hours"
+            counted = True
+        after_at = kind == AT
+        last = kind
+        i = nxt
+        if ahead is None:
+            break
+        entry = ahead
+
+    if end == start:
+        return None, max(i, start + 1)
+    return _resolve(now, start, end, rel, day, weekday, mday, month,
+                    hour, minute, ampm, part, every, interval), i
+
+
+def _resolve(now, start, end, rel, day, weekday, mday, month,
+             hour, minute, ampm, part, every, interval):
+    if hour is not None:
+        if ampm is None and part and part[1] == "pm" and hour < 12:
+            ampm = "pm"
+        hour = _to_24h(hour, ampm)
+        if hour is None:
+            return None
+        minute = minute or 0
+    elif part:
+        hour, minute = part[0], 0
+
+    if every and mday is not None:
+        return None         # monthly rules aren't supported
+
+    recurrence = None
+    if every:
+        if weekday is not None:
+            interval = WEEK
+        elif interval is None:
+            interval = DAY
+        recurrence = _rule(interval)
+
+    if hour is None and day is None and weekday is None and mday is None:
+        if rel:
+            return When(now + rel, recurrence, start, end)
+        if interval == DAY or interval == WEEK:
+            return When(shift_days(now, interval // DAY), recurrence, start, end)
+        if interval:
+            return When(now + interval, recurrence, start, end)
+        return None
+
+    midnight, next_midnight, today = _today     # _today_ordinal(), without the call
+    if not midnight <= now < next_midnight:
+        today = _today_ordinal(now)
+    if hour is None:
+        hour, minute = DEFAULT_HOUR, 0
+
+    if day is not None:
+        target = today + day
+    elif weekday is not None:
+        target = today + (weekday - (today - 1) % 7) % 7
+    elif mday is not None:
+        target = _next_month_day(today, mday, month)
+        if target is None:
+            return None
+    else:
+        target = today + int(rel // DAY)
+
+    due = _local_ts(target, hour, minute)
+    if due <= now:
+        if weekday is not None:
+            due = _local_ts(target + 7, hour, minute)
+        elif mday is not None:
+            target = _next_month_day(target + 1, mday, month)
+            if target is None:
+                return None
+            due = _local_ts(target, hour, minute)
+        else:
+            due = _local_ts(target + 1, hour, minute)
+    return When(due, recurrence, start, end)
+
+
+_DATE_STARTS = frozenset((DAYREL, WEEKDAY, ORDINAL, MONTH, EVERY, PERIOD, PART, NEXT))
+_DATE_WORDS = _DATE_STARTS | {NUM, UNIT, IN, FILLER}
+
+
+def date_words(tokens: list[str], leading: bool) -> int:
+    """
+    How many tokens at the start (leading=True) or end of `tokens` are a
+    date phrase that can go with a clock time next to them: "tomorrow",
+    "every monday", "on the 5th". Counts, units and fillers only join
+    behind a date word, so "chapter 2" and "in" stay where they are.
+    """
+    count = 0
+    for tok in (tokens if leading else reversed(tokens)):
+        entry = _lookup(tok)
+        if entry is None or entry[0] not in _DATE_WORDS:
+            break
+        count += 1
+    run = tokens[:count] if leading else tokens[len(tokens) - count:]
+    kinds = [_lookup(tok)[0] for tok in run]
+    # the phrase has to read as a date from its first real word on
+    first = next((k for k in kinds if k not in (FILLER, IN)), None)
+    if first not in _DATE_STARTS:
+        return 0
+    if leading:
+        while kinds[-1] in (FILLER, IN):    # "tomorrow in the office": keep "in the"
+            kinds.pop()
+        return len(kinds)
+    return count
+
+
+def parse_clock(text: str) -> tuple[int, int] | None:
+    """First clock time in `text` ("9am", "9:05 pm", "23:20") as 24h (hour, minute)"""
+    tokens = tokenize(text)
+    for i, tok in enumerate(tokens):
+        entry = _lookup(tok)
+        if entry is None:
+            continue
+        nxt = _lookup(tokens[i + 1]) if i + 1 < len(tokens) else None
+        suffix = nxt[1] if nxt is not None and nxt[0] == AMPM else None
+        if entry[0] == CLOCK:
+            hour, minute, ampm = entry[1]
+            ampm = ampm or suffix
+        elif entry[0] == NUM and suffix:
+            hour, minute, ampm = entry[1], 0, suffix
+        else:
+            continue
+        hour = _to_24h(hour, ampm)
+        if hour is not None:
+            return hour, minute
+    return None
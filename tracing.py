@@ -0,0 +1,294 @@
+# tracing.py
+"""
+Lightweight spans and latency histograms for the request hot path.
+
+    with tracing.span("dispatch_one", intent="send_email") as sp:
+        ...
+        sp.label("path", "llm")       # labels can be added before the span ends
+
+    @tracing.traced("chat_reply")
+    def chat_reply(...): ...
+
+Off by default. While off, span() returns a shared no-op object and
+traced() wrappers call straight through, so the cost is one global check
+per call (see benchmarks/bench_tracing.py). When on, every finished span
+is added to a histogram per (span, labels) with fixed buckets, and can
+also be written out:
+
+  JARVIS_TRACE_FILE=trace.jsonl    one JSON object per finished span
+  JARVIS_METRICS_PORT=9464         Prometheus text at http://127.0.0.1:9464/metrics
+
+Setting either variable turns tracing on at import; main.py also takes
+--trace / --metrics-port. Spans opened inside another span on the same
+thread (or asyncio task) record it as their parent.
+"""
+import atexit
+import contextvars
+import functools
+import inspect
+import itertools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# upper bounds in seconds; the last bucket is +Inf
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_enabled = False
+_lock = threading.Lock()
+_histograms = {}            # (name, labels tuple) -> Histogram
+_current = contextvars.ContextVar("tracing_span", default=None)
+_ids = itertools.count(1)
+_sink = None                # open JSON-lines file
+_server = None
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count", "errors")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.errors = 0
+
+    def observe(self, seconds: float, error: bool = False):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        self.errors += error
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation (an estimate)"""
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Span:
+    __slots__ = ("name", "labels", "id", "parent", "error", "_start", "_wall", "_token")
+
+    def __init__(self, name: str, labels: dict):
+        self.name = name
+        self.labels = labels
+        self.error = False
+
+    def label(self, key: str, value):
+        self.labels[key] = value
+
+    def fail(self):
+        """Count the span as an error without raising (e.g. a handler that returned a failure)"""
+        self.error = True
+
+    def __enter__(self):
+        parent = _current.get()
+        self.parent = parent.id if parent else None
+        self.id = next(_ids)
+        self._token = _current.set(self)
+        self._wall = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._start
+        try:
+            _current.reset(self._token)
+        except ValueError:
+            pass    # a generator's span closed from another context
+
+        if exc_type is not None and not issubclass(exc_type, GeneratorExit):
+            self.error = True
+        _record(self, elapsed)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def label(self, key, value):
+        pass
+
+    def fail(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, **labels):
+    """Context manager timing one call of `name`; a shared no-op while tracing is off"""
+    if not _enabled:
+        return _NOOP
+    return Span(name, labels)
+
+
+def traced(name: str, **labels):
+    """Decorator: run every call of the function (sync or async) inside span(name)"""
+    def wrap(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return await fn(*args, **kwargs)
+                with Span(name, dict(labels)):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with Span(name, dict(labels)):
+                return fn(*args, **kwargs)
+        return wrapper
+    return wrap
+
+
+def _record(sp: Span, elapsed: float):
+    key = (sp.name, tuple(sorted(sp.labels.items())))
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = Histogram()
+        hist.observe(elapsed, sp.error)
+        if _sink is not None:
+            _sink.write(json.dumps({
+                "ts": sp._wall, "span": sp.name, "ms": round(elapsed * 1000, 3),
+                "id": sp.id, "parent": sp.parent, "thread": threading.current_thread().name,
+                "error": sp.error, **sp.labels,
+            }, default=str) + "\n")
+            if sp.parent is None:
+                _sink.flush()   # one write per request tree, not per span
+
+
+# ---------------------------------------------------------------------------
+# Control
+# ---------------------------------------------------------------------------
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(trace_file: str | None = None, metrics_port: int | None = None):
+    """Start recording spans; optionally append them to `trace_file` and serve /metrics"""
+    global _enabled, _sink
+    with _lock:
+        if trace_file and _sink is None:
+            _sink = open(trace_file, "a", encoding="utf-8")
+            atexit.register(_close_sink)
+        _enabled = True
+    if metrics_port:
+        serve_prometheus(int(metrics_port))
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def reset():
+    """Drop all recorded histograms"""
+    with _lock:
+        _histograms.clear()
+
+
+def _close_sink():
+    global _sink
+    with _lock:
+        if _sink is not None:
+            _sink.close()
+            _sink = None
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def snapshot() -> dict:
+    """{(span, labels tuple): (count, errors, sum seconds, p50, p99)}"""
+    with _lock:
+        return {key: (h.count, h.errors, h.total, h.quantile(0.5), h.quantile(0.99))
+                for key, h in _histograms.items()}
+
+
+def summary() -> str:
+    """Human-readable table of every span seen so far"""
+    lines = [f"{'span':<40} {'count':>7} {'err':>5} {'mean ms':>9} {'p50 ≤ms':>9} {'p99 ≤ms':>9}"]
+    for (name, labels), (count, errors, total, p50, p99) in sorted(snapshot().items()):
+        label = name + "".join(f" {k}={v}" for k, v in labels)
+        lines.append(f"{label:<40} {count:>7} {errors:>5} {total / count * 1000:>9.2f}"
+                     f" {p50 * 1000:>9.2f} {p99 * 1000:>9.2f}")
+    return "\n".join(lines)
+
+
+def _prom_labels(name: str, labels: tuple, le: str | None = None) -> str:
+    pairs = (("span", name),) + labels + ((("le", le),) if le else ())
+    return "{" + ",".join(f'{k}="{_prom_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _prom_escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text() -> str:
+    """All histograms in the Prometheus text exposition format"""
+    out = ["# HELP jarvis_span_seconds Latency of instrumented spans.",
+           "# TYPE jarvis_span_seconds histogram"]
+    errors = ["# HELP jarvis_span_errors_total Spans that raised or were marked failed.",
+              "# TYPE jarvis_span_errors_total counter"]
+    with _lock:
+        items = sorted((key, list(h.counts), h.total, h.count, h.errors) for key, h in _histograms.items())
+    for (name, labels), counts, total, count, failed in items:
+        cumulative = 0
+        for bound, n in zip(BUCKETS + (float("inf"),), counts):
+            cumulative += n
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            out.append(f"jarvis_span_seconds_bucket{_prom_labels(name, labels, le)} {cumulative}")
+        out.append(f"jarvis_span_seconds_sum{_prom_labels(name, labels)} {total}")
+        out.append(f"jarvis_span_seconds_count{_prom_labels(name, labels)} {count}")
+        errors.append(f"jarvis_span_errors_total{_prom_labels(name, labels)} {failed}")
+    return "\n".join(out + errors) + "\n"
+
+
+def serve_prometheus(port: int, host: str = "127.0.0.1"):
+    """Serve prometheus_text() at http://host:port/metrics from a daemon thread"""
+    global _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    with _lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _Handler)
+            threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+    return _server
+
+
+if os.getenv("JARVIS_TRACE_FILE") or os.getenv("JARVIS_METRICS_PORT"):
+    enable(os.getenv("JARVIS_TRACE_FILE"), os.getenv("JARVIS_METRICS_PORT"))
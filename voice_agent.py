@@ -1,55 +1,86 @@
 # voice_agent.py
-import sounddevice as sd
-import numpy as np
-import speech_recognition as sr
+import statistics
+import time
+from collections import deque
 
-recognizer = sr.Recognizer()
+from audio_stream import SAMPLE_RATE, mic_blocks, speech_segments
+from speech_recognizers import RecognitionError, make_recognizer
+
+recognizer = None  # speech_recognizers.Recognizer (SPEECH_BACKEND), created on first transcribe()
 WAKE_WORDS = ["hey jarvis", "jarvis"]
 STOP_WORDS = ["stop listening", "go to sleep", "sleep", "bye", "exit"]
+IDLE_TIMEOUT = 8.0  # seconds without speech that end continuous mode
+
+# seconds per stage for recent utterances: waiting for audio, VAD, recognizer
+STAGES = ("capture", "vad", "decode")
+stage_times = {stage: deque(maxlen=200) for stage in STAGES}
 
-def listen_audio(seconds=4, sample_rate=16000):
-    """Record audio using sounddevice"""
+def listen_audio(seconds=4, sample_rate=SAMPLE_RATE):
+    """Record a fixed-length clip using sounddevice"""
+    import sounddevice as sd
     audio = sd.rec(int(seconds * sample_rate), samplerate=sample_rate, channels=1, dtype='int16')
     sd.wait()
     return audio
 
-def transcribe(audio, sample_rate=16000):
-    """Convert numpy audio to text"""
-    try:
-        audio_data = sr.AudioData(audio.tobytes(), sample_rate, 2)
-        text = recognizer.recognize_google(audio_data).lower()
-        return text
-    except:
-        return ""
+def get_recognizer():
+    global recognizer
+    if recognizer is None:
+        recognizer = make_recognizer()
+        recognizer.warm_up()  # pooled backends start loading their model now
+    return recognizer
 
-def listen_for_wake_word():
-    print("\n🎧 Waiting for wake word: 'Hey Jarvis' ...")
-    while True:
-        audio = listen_audio(3)
-        text = transcribe(audio)
+def transcribe(audio, sample_rate=SAMPLE_RATE):
+    """
+    Convert numpy audio to text; "" if nothing was understood.
+    Raises RecognitionError if the recognizer itself failed.
+    """
+    return get_recognizer().recognize(audio.reshape(-1), sample_rate)
+
+def _heard(blocks, recognize, idle_timeout=None):
+    """Text of each speech segment, recording per-stage timings"""
+    timings = {}
+    source = mic_blocks() if blocks is None else blocks
+    for segment in speech_segments(source, idle_timeout=idle_timeout, timings=timings):
+        start = time.perf_counter()
+        try:
+            text = recognize(segment)
+        except RecognitionError as e:
+            print(f"⚠️ Speech recognizer failed: {e}")
+            text = ""
+        timings["decode"] = time.perf_counter() - start
+        for stage in STAGES:
+            stage_times[stage].append(timings.get(stage, 0.0))
+        yield text
 
+def stage_summary() -> dict:
+    """{stage: (p50 ms, max ms)} over recent utterances"""
+    return {stage: (statistics.median(t) * 1000, max(t) * 1000)
+            for stage, t in stage_times.items() if t}
+
+def listen_for_wake_word(blocks=None, recognize=transcribe):
+    """
+    Wait for a wake word. Only speech segments found by the VAD are sent
+    to `recognize`; `blocks` defaults to the microphone (pass
+    audio_stream.wav_blocks(path) to run from a recording).
+    Returns False if the audio runs out first.
+    """
+    print("\n🎧 Waiting for wake word: 'Hey Jarvis' ...")
+    for text in _heard(blocks, recognize):
         if text:
             print(f"🗣 Heard: {text}")
 
         if any(word in text for word in WAKE_WORDS):
             print("✅ Wake word detected!")
             return True
+    return False
 
-def listen_continuous():
-    """Listen continuously until stop phrase or silence timeout"""
+def listen_continuous(blocks=None, recognize=transcribe, idle_timeout=IDLE_TIMEOUT):
+    """Listen continuously until stop phrase or `idle_timeout` seconds of silence"""
     print("\n🎤 Continuous mode ON — speak freely... (say 'stop listening' to exit)")
-    silence_frames = 0
-
-    while True:
-        audio = listen_audio(4)
-        text = transcribe(audio)
 
+    for text in _heard(blocks, recognize, idle_timeout):
         if not text:
-            silence_frames += 1
-            if silence_frames >= 2:   # ~8 sec silence
-                print("😴 Silence detected — stopping continuous mode.")
-                return None
-            continue
+            continue  # noise, or nothing the recognizer understood
 
         print(f"👉 Command: {text}")
 
@@ -58,3 +89,6 @@ def listen_continuous():
             return None
 
         yield text   # <-- sends text back to main.py
+
+    print("😴 Silence detected — stopping continuous mode.")
+    return None